@@ -0,0 +1,254 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.db.session import get_db
+from backend.api.deps import get_current_user
+from backend.models.user import User
+from backend.schemas.event_calendar import FeedTokenResponse
+from backend.core.cache import fragment_cache, fragment_key
+from backend.core.ics import (
+    CALENDAR_FOOTER,
+    ICS_MEDIA_TYPE,
+    calendar_header,
+    render_event,
+)
+from backend.crud.calendar_changes import get_last_change_time
+from backend.crud.event_calendar import stream_feed_events
+from backend.crud.user import get_user_by_feed_token, rotate_feed_token
+from backend.crud.versions import get_versions, scopes_for_user, team_scope
+import hashlib
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+# Фиды больше этого размера отдаются потоково без сохранения в кэш
+# (общий объём кэша фрагментов ограничен FRAGMENT_CACHE_MAX_BYTES).
+FEED_CACHE_MAX_BYTES = 1_000_000
+
+# Размер порции потокового ответа (в символах).
+FEED_CHUNK_SIZE = 16_384
+
+
+async def _render_feed(
+    name: str, events: AsyncIterator[dict], cache_key: str
+) -> AsyncIterator[str]:
+    """
+    Потоково отрисовать фид и сохранить его в кэш, если он не слишком большой.
+
+    Args:
+        name (str): Название календаря.
+        events (AsyncIterator[dict]): События из stream_feed_events().
+        cache_key (str): Ключ фида в кэше фрагментов.
+
+    Yields:
+        str: Части документа iCalendar размером около FEED_CHUNK_SIZE.
+    """
+
+    cached: list[str] | None = []
+    cached_size = 0
+    chunk = [calendar_header(name)]
+    chunk_size = len(chunk[0])
+
+    async for event in events:
+        part = render_event(event)
+        chunk.append(part)
+        chunk_size += len(part)
+        if chunk_size >= FEED_CHUNK_SIZE:
+            data = "".join(chunk)
+            if cached is not None:
+                cached_size += len(data)
+                if cached_size <= FEED_CACHE_MAX_BYTES:
+                    cached.append(data)
+                else:
+                    cached = None
+            yield data
+            chunk, chunk_size = [], 0
+
+    chunk.append(CALENDAR_FOOTER)
+    data = "".join(chunk)
+    yield data
+    if cached is not None and cached_size + len(data) <= FEED_CACHE_MAX_BYTES:
+        fragment_cache.set(cache_key, "".join(cached) + data)
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """
+    Проверить условные заголовки запроса фида.
+
+    If-None-Match имеет приоритет над If-Modified-Since (RFC 9110, 13.2.2)
+    и сравнивается слабо: сжатый ответ получает ETag с префиксом W/.
+    """
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        return etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+async def _feed_response(
+    request: Request,
+    db: AsyncSession,
+    name: str,
+    cache_key: str,
+    team_id: int | None,
+    events: AsyncIterator[dict],
+) -> Response:
+    """
+    Ответ с фидом: 304 по ETag/Last-Modified, готовый фид из кэша или поток.
+
+    Args:
+        request (Request): Объект запроса FastAPI.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        name (str): Название календаря.
+        cache_key (str): Ключ фида; содержит версии изменений, поэтому
+            меняется после любой записи в задачи и встречи команды.
+        team_id (int | None): Команда, по журналу которой определяется Last-Modified.
+        events (AsyncIterator[dict]): События фида (читаются только при промахе кэша).
+
+    Returns:
+        Response: Ответ с типом text/calendar или 304 Not Modified.
+    """
+
+    headers = {
+        "ETag": f'W/"{hashlib.sha1(cache_key.encode()).hexdigest()}"',
+        "Cache-Control": "private, no-cache",
+    }
+    last_modified = None
+    if team_id is not None:
+        last_modified = await get_last_change_time(db, team_id)
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if _not_modified(request, headers["ETag"], last_modified):
+        await events.aclose()
+        return Response(status_code=304, headers=headers)
+
+    cached = fragment_cache.get(cache_key)
+    if cached is not None:
+        await events.aclose()
+        return Response(cached, media_type=ICS_MEDIA_TYPE, headers=headers)
+
+    return StreamingResponse(
+        _render_feed(name, events, cache_key),
+        media_type=ICS_MEDIA_TYPE,
+        headers=headers,
+    )
+
+
+@router.post("/feed-token", response_model=FeedTokenResponse)
+async def create_feed_token(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Выпустить новую ссылку на календарный фид текущего пользователя.
+
+    Предыдущая ссылка перестаёт работать.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        current_user (User): Текущий пользователь, полученный из JWT‑токена.
+
+    Returns:
+        FeedTokenResponse: Токен и пути фидов пользователя и его команды.
+    """
+
+    token = await rotate_feed_token(db, current_user)
+    return {
+        "token": token,
+        "user_feed": f"/api/calendar/{current_user.id}.ics?token={token}",
+        "team_feed": (
+            f"/api/calendar/team/{current_user.team_id}.ics?token={token}"
+            if current_user.team_id is not None
+            else None
+        ),
+    }
+
+
+@router.get("/{user_id}.ics", response_class=Response)
+async def get_user_feed(
+    user_id: int,
+    token: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Календарный фид пользователя (iCalendar) для внешних приложений.
+
+    Args:
+        user_id (int): Идентификатор пользователя.
+        token (str): Токен фида (см. POST /calendar/feed-token).
+        request (Request): Объект запроса FastAPI.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+
+    Returns:
+        Response: Документ text/calendar (потоково или из кэша) либо 304.
+
+    Raises:
+        HTTPException: 404, если токен недействителен или выдан другому пользователю.
+    """
+
+    user = await get_user_by_feed_token(db, token)
+    if user is None or user.id != user_id:
+        raise HTTPException(status_code=404, detail="Feed not found")
+
+    versions = await get_versions(db, scopes_for_user(user.id, user.team_id))
+    return await _feed_response(
+        request,
+        db,
+        name=user.full_name or user.email,
+        cache_key=fragment_key("ics_user", versions, user.id),
+        team_id=user.team_id,
+        events=stream_feed_events(db, user_id=user.id),
+    )
+
+
+@router.get("/team/{team_id}.ics", response_class=Response)
+async def get_team_feed(
+    team_id: int,
+    token: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Календарный фид команды: задачи и встречи всех её участников.
+
+    Args:
+        team_id (int): Идентификатор команды.
+        token (str): Токен фида любого участника команды.
+        request (Request): Объект запроса FastAPI.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+
+    Returns:
+        Response: Документ text/calendar (потоково или из кэша) либо 304.
+
+    Raises:
+        HTTPException: 404, если токен недействителен или его владелец не в команде.
+    """
+
+    user = await get_user_by_feed_token(db, token)
+    if user is None or user.team_id != team_id:
+        raise HTTPException(status_code=404, detail="Feed not found")
+
+    versions = await get_versions(db, [team_scope(team_id)])
+    return await _feed_response(
+        request,
+        db,
+        name=f"Team {team_id}",
+        cache_key=fragment_key("ics_team", versions, team_id),
+        team_id=team_id,
+        events=stream_feed_events(db, team_id=team_id),
+    )
@@ -1,4 +1,5 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from starlette.requests import HTTPConnection
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,6 +8,9 @@ from backend.models.user import User
 from backend.schemas.auth import TokenData
 from backend.core.config import settings
 from sqlalchemy.future import select
+from pydantic import BaseModel
+from backend.crud.versions import get_versions, scopes_for_user
+import hashlib
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -29,24 +33,182 @@ async def get_current_user(
                        либо пользователь с таким идентификатором отсутствует в базе.
     """
 
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    user = await get_user_from_token(db, token)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def get_user_from_token(db: AsyncSession, token: str | None) -> User | None:
+    """
+    Найти пользователя по JWT‑токену.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        token (str | None): JWT‑токен.
+
+    Returns:
+        User | None: Пользователь или None, если токен недействителен,
+        не содержит user_id или пользователь не найден.
+    """
+
+    if not token:
+        return None
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         user_id: int = payload.get("user_id")
         if user_id is None:
-            raise credentials_exception
+            return None
         token_data = TokenData(user_id=user_id)
     except JWTError:
-        raise credentials_exception
+        return None
 
     result = await db.execute(select(User).where(User.id == token_data.user_id))
-    user = result.scalars().first()
+    return result.scalars().first()
+
+
+def connection_token(connection: HTTPConnection) -> str | None:
+    """
+    JWT‑токен соединения: заголовок Authorization, cookie access_token
+    или параметр ?token= (EventSource и WebSocket в браузере не умеют
+    передавать заголовки).
+
+    Args:
+        connection (HTTPConnection): HTTP‑запрос или WebSocket.
+
+    Returns:
+        str | None: Токен без префикса "Bearer " или None.
+    """
+
+    value = (
+        connection.headers.get("authorization")
+        or connection.cookies.get("access_token")
+        or connection.query_params.get("token")
+    )
+    if not value:
+        return None
+    scheme, _, credentials = value.partition(" ")
+    return credentials if scheme.lower() == "bearer" and credentials else value
+
+
+async def get_stream_user(
+    connection: HTTPConnection, db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Текущий пользователь долгоживущего соединения (поток событий).
+
+    Raises:
+        HTTPException: 401, если токен не передан или недействителен.
+    """
+
+    user = await get_user_from_token(db, connection_token(connection))
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
+
+
+def sparse_fields(model: type[BaseModel]):
+    """
+    Создаёт зависимость, разбирающую параметр ?fields= для указанной схемы ответа.
+
+    Args:
+        model (type[BaseModel]): Схема ответа, поля которой можно запрашивать.
+
+    Returns:
+        Callable: Зависимость FastAPI, возвращающая набор запрошенных полей
+                  (всегда включая "id") или None, если параметр не передан.
+    """
+
+    allowed = set(model.model_fields)
+
+    def parse_fields(
+        fields: str | None = Query(
+            None,
+            description="Список полей через запятую, например id,title,status,deadline",
+        )
+    ) -> set[str] | None:
+        """
+        Args:
+            fields (str | None): Значение параметра ?fields=.
+
+        Returns:
+            set[str] | None: Набор запрошенных полей или None.
+
+        Raises:
+            HTTPException: 400, если запрошено поле, которого нет в схеме ответа.
+        """
+
+        if not fields:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - allowed
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        return requested | {"id"}
+
+    return parse_fields
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> dict[str, str]:
+    """
+    Вычисляет ETag ответа по версиям изменений пользователя и его команды
+    и отвечает 304, если клиент уже получил этот вариант.
+
+    ETag строится из пути, параметров запроса, пользователя и версий
+    (см. backend.crud.versions), поэтому проверка стоит один запрос по
+    первичному ключу и выполняется до запроса списка и сериализации ответа.
+
+    Args:
+        request (Request): Входящий запрос (путь, параметры, If-None-Match).
+        response (Response): Ответ эндпоинта, в который добавляются заголовки.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        dict[str, str]: Заголовки кэширования (ETag, Cache-Control) — для эндпоинтов,
+                        которые сами формируют Response.
+
+    Raises:
+        HTTPException: 304 Not Modified, если ETag совпадает с If-None-Match.
+    """
+
+    scopes = scopes_for_user(current_user.id, current_user.team_id)
+    versions = await get_versions(db, scopes)
+
+    fingerprint = "|".join(
+        [
+            request.url.path,
+            "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items())),
+            f"{current_user.id}:{current_user.team_id}",
+            *(f"{scope}={versions[scope]}" for scope in scopes),
+        ]
+    )
+    etag = f'W/"{hashlib.sha1(fingerprint.encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in candidates or etag.removeprefix("W/") in candidates:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return headers
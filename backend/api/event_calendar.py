@@ -1,18 +1,132 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
+from typing import Literal
 from backend.db.session import get_db
-from backend.api.deps import get_current_user
-from backend.models.user import User
-from backend.schemas.event_calendar import DayEventsResponse, MonthEventsResponse
-from backend.crud.event_calendar import get_events_for_day, get_events_for_month
+from backend.api.deps import get_current_user, sparse_fields, conditional_get
+from backend.models.user import User, UserRole
+from backend.schemas.event_calendar import (
+    CalendarEvent,
+    CalendarSyncResponse,
+    DayEventsResponse,
+    MonthEventsResponse,
+    RangeDaysResponse,
+    RangeEventsResponse,
+    TeamMonthEventsResponse,
+)
+from backend.schemas.fields import dump_fields
+from backend.core.calendar_layout import day_keys, month_grid, week_start
+from backend.crud.event_calendar import (
+    bucket_events,
+    get_calendar_changes,
+    get_events_between,
+    get_events_for_day,
+    get_events_for_month,
+    get_team_events_for_month,
+)
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
 
+# Максимальная длина диапазона для /calendar/range (в днях).
+MAX_RANGE_DAYS = 93
+
+
+def _parse_date(value: str) -> date:
+    """
+    Разобрать дату из параметра запроса.
+
+    Raises:
+        HTTPException: Если дата указана в неверном формате.
+    """
+
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
+        )
+
+
+def _parse_sync_token(token: str, team_id: int | None) -> int | None:
+    """
+    Разобрать sync_token вида "<team_id>.<номер изменения>".
+
+    Returns:
+        int | None: Номер последнего известного клиенту изменения или None,
+        если токен выдан для другой команды (нужна полная синхронизация).
+
+    Raises:
+        HTTPException: Если токен имеет неверный формат.
+    """
+
+    try:
+        token_team_id, since = (int(part) for part in token.split("."))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    if token_team_id != (team_id or 0):
+        return None
+    return since
+
+
+async def _range_response(
+    db: AsyncSession,
+    user_id: int,
+    first_day: date,
+    days: int,
+    mode: str,
+    fields: set[str] | None,
+    cache_headers: dict[str, str],
+):
+    """
+    Собрать ответ со списком событий за days дней, начиная с first_day.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        user_id (int): Идентификатор пользователя.
+        first_day (date): Первый день диапазона.
+        days (int): Количество дней в диапазоне.
+        mode (str): "flat" — один список событий, "day" — события по дням.
+        fields (set[str] | None): Поля CalendarEvent из параметра ?fields=.
+        cache_headers (dict[str, str]): Заголовки ETag/Cache-Control.
+
+    Returns:
+        dict | JSONResponse: Тело RangeEventsResponse или RangeDaysResponse.
+    """
+
+    events = await get_events_between(
+        db,
+        user_id,
+        datetime.combine(first_day, time.min),
+        datetime.combine(first_day + timedelta(days=days), time.min),
+        fields,
+    )
+    body = {
+        "start": first_day.isoformat(),
+        "end": (first_day + timedelta(days=days - 1)).isoformat(),
+    }
+
+    def dump(items: list) -> list:
+        if fields is None:
+            return items
+        return [dump_fields(CalendarEvent, e, fields) for e in items]
+
+    if mode == "day":
+        keys = day_keys(first_day, days)
+        buckets = bucket_events(events, first_day, keys)
+        body["days"] = {key: dump(buckets.get(key, [])) for key in keys}
+    else:
+        body["events"] = dump(events)
+
+    if fields is not None:
+        return JSONResponse(body, headers=cache_headers)
+    return body
+
 
 @router.get("/day", response_model=DayEventsResponse)
 async def get_calendar_day(
     day: str | None = None,
+    fields: set[str] | None = Depends(sparse_fields(CalendarEvent)),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -22,6 +136,7 @@ async def get_calendar_day(
     Args:
         day (str | None): Дата в формате ISO (YYYY-MM-DD).
                           Если не указана, используется текущая дата.
+        fields (set[str] | None): Поля CalendarEvent из параметра ?fields=.
         db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
         current_user (User): Текущий пользователь, полученный из JWT‑токена.
 
@@ -34,17 +149,16 @@ async def get_calendar_day(
         HTTPException: Если дата указана в неверном формате.
     """
 
-    if day:
-        try:
-            target_date = datetime.fromisoformat(day).date()
-        except ValueError:
-            raise HTTPException(
-                status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
-            )
-    else:
-        target_date = date.today()
+    target_date = _parse_date(day) if day else date.today()
 
-    events = await get_events_for_day(db, current_user.id, target_date)
+    events = await get_events_for_day(db, current_user.id, target_date, fields)
+    if fields is not None:
+        return JSONResponse(
+            {
+                "date": target_date.isoformat(),
+                "events": [dump_fields(CalendarEvent, e, fields) for e in events],
+            }
+        )
     return {"date": target_date.isoformat(), "events": events}
 
 
@@ -52,15 +166,22 @@ async def get_calendar_day(
 async def get_calendar_month(
     year: int | None = None,
     month: int | None = None,
+    fields: set[str] | None = Depends(sparse_fields(CalendarEvent)),
+    cache_headers: dict[str, str] = Depends(conditional_get),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Получить события текущего пользователя за указанный месяц календаря.
 
+    Поддерживает условный GET: при совпадении If-None-Match с текущим ETag
+    возвращается 304 без запроса событий.
+
     Args:
         year (int | None): Год. Если не указан, используется текущий год.
         month (int | None): Месяц (1–12). Если не указан, используется текущий месяц.
+        fields (set[str] | None): Поля CalendarEvent из параметра ?fields=.
+        cache_headers (dict[str, str]): Заголовки ETag/Cache-Control (см. conditional_get).
         db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
         current_user (User): Текущий пользователь, полученный из JWT‑токена.
 
@@ -83,6 +204,219 @@ async def get_calendar_month(
         raise HTTPException(status_code=400, detail="Month must be 1-12")
 
     events_by_day = await get_events_for_month(
-        db, current_user.id, target_year, target_month
+        db, current_user.id, target_year, target_month, fields
+    )
+    if fields is not None:
+        events_by_day = {
+            day: [dump_fields(CalendarEvent, e, fields) for e in events]
+            for day, events in events_by_day.items()
+        }
+        return JSONResponse(
+            {
+                "year": target_year,
+                "month": target_month,
+                "days": month_grid(target_year, target_month).days(events_by_day),
+            },
+            headers=cache_headers,
+        )
+    return {
+        "year": target_year,
+        "month": target_month,
+        "days": month_grid(target_year, target_month).days(events_by_day),
+    }
+
+
+@router.get("/range", response_model=RangeEventsResponse | RangeDaysResponse)
+async def get_calendar_range(
+    start: str,
+    end: str,
+    mode: Literal["flat", "day"] = "flat",
+    fields: set[str] | None = Depends(sparse_fields(CalendarEvent)),
+    cache_headers: dict[str, str] = Depends(conditional_get),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Получить события текущего пользователя за произвольный диапазон дат.
+
+    События выбираются одним запросом и возвращаются в порядке времени начала.
+
+    Args:
+        start (str): Первый день диапазона (YYYY-MM-DD).
+        end (str): Последний день диапазона включительно (YYYY-MM-DD).
+        mode (str): "flat" — список events, "day" — словарь days по всем дням диапазона.
+        fields (set[str] | None): Поля CalendarEvent из параметра ?fields=.
+        cache_headers (dict[str, str]): Заголовки ETag/Cache-Control (см. conditional_get).
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        current_user (User): Текущий пользователь, полученный из JWT‑токена.
+
+    Returns:
+        RangeEventsResponse | RangeDaysResponse: Границы диапазона и события.
+
+    Raises:
+        HTTPException: Если даты указаны в неверном формате, end раньше start
+                       или диапазон длиннее MAX_RANGE_DAYS дней.
+    """
+
+    first_day = _parse_date(start)
+    last_day = _parse_date(end)
+    days = (last_day - first_day).days + 1
+    if days < 1:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if days > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Range must not exceed {MAX_RANGE_DAYS} days"
+        )
+
+    return await _range_response(
+        db, current_user.id, first_day, days, mode, fields, cache_headers
+    )
+
+
+@router.get("/week", response_model=RangeEventsResponse | RangeDaysResponse)
+async def get_calendar_week(
+    day: str | None = None,
+    mode: Literal["flat", "day"] = "day",
+    fields: set[str] | None = Depends(sparse_fields(CalendarEvent)),
+    cache_headers: dict[str, str] = Depends(conditional_get),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Получить события текущего пользователя за неделю (с понедельника по воскресенье).
+
+    Args:
+        day (str | None): Любой день недели (YYYY-MM-DD).
+                          Если не указан, используется текущая неделя.
+        mode (str): "day" (по умолчанию) — события по дням, "flat" — одним списком.
+        fields (set[str] | None): Поля CalendarEvent из параметра ?fields=.
+        cache_headers (dict[str, str]): Заголовки ETag/Cache-Control (см. conditional_get).
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        current_user (User): Текущий пользователь, полученный из JWT‑токена.
+
+    Returns:
+        RangeEventsResponse | RangeDaysResponse: Границы недели и события.
+
+    Raises:
+        HTTPException: Если дата указана в неверном формате.
+    """
+
+    target_date = _parse_date(day) if day else date.today()
+    return await _range_response(
+        db, current_user.id, week_start(target_date), 7, mode, fields, cache_headers
+    )
+
+
+@router.get("/sync", response_model=CalendarSyncResponse)
+async def sync_calendar(
+    sync_token: str | None = None,
+    fields: set[str] | None = Depends(sparse_fields(CalendarEvent)),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Инкрементальная синхронизация календаря текущего пользователя.
+
+    Первый запрос (без sync_token) возвращает все события и токен. Запрос
+    с токеном возвращает только события, созданные или изменённые после его
+    выдачи, и tombstones удалённых событий; в ответе — новый токен.
+
+    Args:
+        sync_token (str | None): Токен из предыдущего ответа.
+        fields (set[str] | None): Поля CalendarEvent из параметра ?fields=.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        current_user (User): Текущий пользователь, полученный из JWT‑токена.
+
+    Returns:
+        CalendarSyncResponse: Объект с ключами:
+            - sync_token (str): токен для следующего запроса.
+            - full (bool): True, если это полная синхронизация (клиент
+              должен заменить все локальные события).
+            - events (list): созданные или изменённые события.
+            - deleted (list): удалённые события {"type", "id"}.
+
+    Raises:
+        HTTPException: Если токен имеет неверный формат.
+    """
+
+    team_id = current_user.team_id
+    since = _parse_sync_token(sync_token, team_id) if sync_token else None
+    cursor, full, events, deleted = await get_calendar_changes(
+        db, current_user.id, team_id, since, fields
+    )
+    body = {
+        "sync_token": f"{team_id or 0}.{cursor}",
+        "full": full,
+        "events": events,
+        "deleted": deleted,
+    }
+    if fields is not None:
+        body["events"] = [dump_fields(CalendarEvent, e, fields) for e in events]
+        return JSONResponse(body)
+    return body
+
+
+@router.get("/team/month", response_model=TeamMonthEventsResponse)
+async def get_team_calendar_month(
+    year: int | None = None,
+    month: int | None = None,
+    member_id: list[int] | None = Query(None),
+    fields: set[str] | None = Depends(sparse_fields(CalendarEvent)),
+    cache_headers: dict[str, str] = Depends(conditional_get),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Получить события всех участников команды за месяц (только для admin/manager).
+
+    Общие встречи нескольких участников возвращаются один раз.
+
+    Args:
+        year (int | None): Год. Если не указан, используется текущий год.
+        month (int | None): Месяц (1–12). Если не указан, используется текущий месяц.
+        member_id (list[int] | None): Показать события только этих участников
+                                      (параметр можно повторять).
+        fields (set[str] | None): Поля CalendarEvent из параметра ?fields=.
+        cache_headers (dict[str, str]): Заголовки ETag/Cache-Control (см. conditional_get).
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        current_user (User): Текущий пользователь, полученный из JWT‑токена.
+
+    Returns:
+        TeamMonthEventsResponse: Как MonthEventsResponse, плюс team_id и member_ids.
+
+    Raises:
+        HTTPException: 400, если пользователь не в команде или месяц вне 1–12;
+                       403, если пользователь не admin/manager.
+    """
+
+    if current_user.team_id is None:
+        raise HTTPException(status_code=400, detail="You are not in a team")
+    if current_user.role not in (UserRole.ADMIN, UserRole.MANAGER):
+        raise HTTPException(
+            status_code=403, detail="Only admin or manager can view team calendar"
+        )
+
+    now = datetime.now()
+    target_year = year or now.year
+    target_month = month or now.month
+    if not (1 <= target_month <= 12):
+        raise HTTPException(status_code=400, detail="Month must be 1-12")
+
+    events_by_day = await get_team_events_for_month(
+        db, current_user.team_id, target_year, target_month, member_id, fields
     )
-    return {"year": target_year, "month": target_month, "days": events_by_day}
+    if fields is not None:
+        events_by_day = {
+            day: [dump_fields(CalendarEvent, e, fields) for e in events]
+            for day, events in events_by_day.items()
+        }
+    body = {
+        "team_id": current_user.team_id,
+        "member_ids": member_id,
+        "year": target_year,
+        "month": target_month,
+        "days": month_grid(target_year, target_month).days(events_by_day),
+    }
+    if fields is not None:
+        return JSONResponse(body, headers=cache_headers)
+    return body
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Request, Depends, HTTPException, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import APIRouter, Request, Depends, HTTPException, Form, Query
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.crud.user import delete_user, update_user_profile
 from backend.db.session import get_db
@@ -10,19 +10,88 @@ from backend.crud.task import (
     update_task,
 )
 from backend.crud.meeting import get_user_meetings, create_meeting
-from backend.models.user import User
-from backend.crud.event_calendar import get_events_for_month
-from datetime import date, datetime
-from calendar import monthrange
+from backend.models.user import User, UserRole
+from backend.crud.event_calendar import get_events_for_month, get_team_events_for_month
+from datetime import date, datetime, timedelta
+from backend.core.calendar_layout import WEEKDAY_NAMES, month_grid
 from typing import List
 from backend.crud.team import get_team_members, join_team_by_code, get_team_by_id
+from backend.crud.team_invite import create_team_invite
+from backend.crud.member_search import search_team_members
 from backend.crud.evaluation import create_evaluation
+from backend.crud.versions import get_versions, scopes_for_user
+from backend.core.cache import fragment_cache, fragment_key
 from backend.schemas.task import TaskCreate
 from backend.schemas.meeting import MeetingCreate
 from backend.schemas.evaluation import EvaluationCreate
 
 html_router = APIRouter()
 
+# Срок действия приглашений, создаваемых с дашборда.
+HTML_INVITE_TTL = timedelta(days=7)
+
+# Сколько участников команды формы создания задачи и встречи показывают сразу;
+# остальных находят поиском (GET /team/members/search).
+FORM_MEMBERS_LIMIT = 50
+
+# Сколько ближайших встреч показывают дашборд и страница /meetings.
+DASHBOARD_MEETINGS_LIMIT = 10
+MEETINGS_PAGE_LIMIT = 100
+
+
+def _upcoming_key_part() -> str:
+    """
+    Часть ключа фрагментов со списком ближайших встреч: список зависит
+    от текущего времени, поэтому такой фрагмент живёт не дольше минуты.
+    """
+
+    return datetime.now().strftime("%Y-%m-%dT%H:%M")
+
+
+async def _form_members(db: AsyncSession, user: User) -> tuple[list[User], bool]:
+    """
+    Участники команды для выбора в форме: первые FORM_MEMBERS_LIMIT по id
+    и сам пользователь.
+
+    Returns:
+        tuple[list[User], bool]: Участники и True, если показаны не все.
+    """
+
+    members = await get_team_members(db, user.team_id, limit=FORM_MEMBERS_LIMIT + 1)
+    truncated = len(members) > FORM_MEMBERS_LIMIT
+    members = members[:FORM_MEMBERS_LIMIT]
+    if all(member.id != user.id for member in members):
+        members.append(user)
+    return members, truncated
+
+
+async def _cached_fragments(
+    db: AsyncSession, user: User, **fragments: tuple
+) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Вычислить ключи кэшируемых фрагментов страницы и получить уже готовые из кэша.
+
+    Ключи зависят от версий изменений пользователя и его команды, поэтому
+    любая запись через CRUD-слой делает старые фрагменты недоступными.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных.
+        user (User): Текущий пользователь.
+        **fragments (tuple): Имя фрагмента → дополнительные параметры ключа.
+
+    Returns:
+        tuple[dict[str, str], dict[str, str]]: Ключи фрагментов {имя: ключ}
+        и найденные в кэше фрагменты {ключ: html}. Передаются в шаблон как
+        fragment_keys и fragments для тега {% cache %}.
+    """
+
+    versions = await get_versions(db, scopes_for_user(user.id, user.team_id))
+    keys = {
+        name: fragment_key(name, versions, user.id, *parts)
+        for name, parts in fragments.items()
+    }
+    return keys, fragment_cache.get_many(keys.values())
+
 
 @html_router.get("/", response_class=HTMLResponse)
 async def root(request: Request):
@@ -38,7 +107,9 @@ async def dashboard(request: Request, db: AsyncSession = Depends(get_db)):
     Отображает главную панель управления с задачами и встречами пользователя.
 
     Проверяет аутентификацию пользователя. Если пользователь состоит в команде,
-    загружает его задачи и встречи из базы данных.
+    загружает его задачи и ближайшие встречи (не больше DASHBOARD_MEETINGS_LIMIT)
+    из базы данных. Списки задач и встреч кэшируются как фрагменты и не
+    запрашиваются, если фрагмент уже в кэше.
 
     Args:
         request (Request): Объект запроса FastAPI.
@@ -51,15 +122,94 @@ async def dashboard(request: Request, db: AsyncSession = Depends(get_db)):
     """
     if not request.state.user:
         return RedirectResponse(url="/login")
+    return await _render_dashboard(request, db)
+
+
+@html_router.post("/team/invites", response_class=HTMLResponse)
+async def handle_create_invite(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Создаёт приглашение в команду (срок — неделя, без ограничения числа использований).
+
+    Код показывается на дашборде один раз: в базе хранится только его хэш.
+
+    Args:
+        request (Request): Объект запроса FastAPI.
+        db (AsyncSession): Асинхронная сессия базы данных.
+
+    Returns:
+        TemplateResponse: Дашборд с новым кодом приглашения. Если пользователь
+                         не администратор команды — RedirectResponse на dashboard
+                         с ошибкой.
+    """
+    if not request.state.user:
+        return RedirectResponse(url="/login")
+    user = request.state.user
+    if user.team_id is None or user.role != UserRole.ADMIN:
+        return RedirectResponse(
+            url="/dashboard?error=Only+admin+can+create+invites", status_code=303
+        )
+
+    _, code = await create_team_invite(
+        db, user.team_id, user.id, expires_in=HTML_INVITE_TTL
+    )
+    return await _render_dashboard(request, db, invite_code=code)
+
+
+@html_router.get("/team/members/search")
+async def search_members_for_form(
+    request: Request,
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Подсказки участников команды для форм создания задачи и встречи.
+
+    Тот же поиск, что и GET /api/teams/me/members/search, но с авторизацией
+    по cookie HTML-сессии.
+
+    Args:
+        request (Request): Объект запроса FastAPI.
+        prefix (str): Начало email, имени или любого их слова.
+        limit (int): Максимальное число подсказок (1–50).
+        db (AsyncSession): Асинхронная сессия базы данных.
+
+    Returns:
+        JSONResponse: Список найденных участников (UserOut); 401 без авторизации,
+                      пустой список, если пользователь не в команде.
+    """
+    user = request.state.user
+    if not user:
+        return JSONResponse({"detail": "Not authenticated"}, status_code=401)
+    if user.team_id is None:
+        return JSONResponse([])
+    members = await search_team_members(db, user.team_id, prefix, limit)
+    return JSONResponse(members)
+
+
+async def _render_dashboard(
+    request: Request, db: AsyncSession, invite_code: str | None = None
+) -> HTMLResponse:
+    """Собрать страницу дашборда; invite_code — только что созданный код приглашения."""
 
     user = request.state.user
     tasks = []
     meetings = []
     team = None
+    fragment_keys, fragments = await _cached_fragments(
+        db,
+        user,
+        dashboard_tasks=(user.role,),
+        dashboard_meetings=(_upcoming_key_part(),),
+    )
 
     if user.team_id is not None:
-        tasks = await get_tasks_for_user(db, user.id, user.team_id)
-        meetings = await get_user_meetings(db, user.id)
+        if fragment_keys["dashboard_tasks"] not in fragments:
+            tasks = await get_tasks_for_user(db, user.id, user.team_id)
+        if fragment_keys["dashboard_meetings"] not in fragments:
+            meetings = await get_user_meetings(
+                db, user.id, when="upcoming", limit=DASHBOARD_MEETINGS_LIMIT
+            )
         team = await get_team_by_id(db, user.team_id)
 
     return request.app.state.templates.TemplateResponse(
@@ -70,6 +220,9 @@ async def dashboard(request: Request, db: AsyncSession = Depends(get_db)):
             "tasks": tasks,
             "meetings": meetings,
             "team": team,
+            "invite_code": invite_code,
+            "fragment_keys": fragment_keys,
+            "fragments": fragments,
         },
     )
 
@@ -100,8 +253,10 @@ async def calendar_view(
 
     Notes:
         - Календарь всегда начинается с понедельника.
-        - Пустые ячейки в начале и конце месяца отображаются без дней.
-        - События загружаются функцией get_events_for_month().
+        - Ячейки соседних месяцев отображаются без дней.
+        - Сетка месяца берётся из кэша month_grid(), события по дням
+          загружаются функцией get_events_for_month() и накладываются на неё в шаблоне.
+        - Сетка месяца кэшируется как фрагмент; при попадании в кэш события не запрашиваются.
     """
     if not request.state.user:
         return RedirectResponse(url="/login")
@@ -110,38 +265,16 @@ async def calendar_view(
     target_year = year or today.year
     target_month = month or today.month
 
-    events_by_day = await get_events_for_month(
-        db, user_id=request.state.user.id, year=target_year, month=target_month
+    fragment_keys, fragments = await _cached_fragments(
+        db,
+        request.state.user,
+        calendar_grid=(target_year, target_month, today.isoformat()),
     )
-
-    first_weekday, num_days = monthrange(target_year, target_month)
-    weeks = []
-    day = 1
-
-    for week_idx in range(6):
-        week = []
-        for weekday in range(7):
-            if week_idx == 0 and weekday < first_weekday:
-                week.append({"day": None, "date_str": None, "events": []})
-            elif day <= num_days:
-                date_str = f"{target_year}-{target_month:02d}-{day:02d}"
-                events = events_by_day.get(date_str, [])
-                week.append(
-                    {
-                        "day": day,
-                        "date_str": date_str,
-                        "events": events,
-                        "is_today": date_str == today.isoformat(),
-                    }
-                )
-                day += 1
-            else:
-                week.append({"day": None, "date_str": None, "events": []})
-        weeks.append(week)
-        if day > num_days:
-            break
-
-    weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    events_by_day = {}
+    if fragment_keys["calendar_grid"] not in fragments:
+        events_by_day = await get_events_for_month(
+            db, user_id=request.state.user.id, year=target_year, month=target_month
+        )
 
     return request.app.state.templates.TemplateResponse(
         "calendar.html",
@@ -149,9 +282,88 @@ async def calendar_view(
             "request": request,
             "year": target_year,
             "month": target_month,
-            "weeks": weeks,
-            "weekdays": weekdays,
-            "today": today,
+            "grid": month_grid(target_year, target_month),
+            "events_by_day": events_by_day,
+            "weekdays": WEEKDAY_NAMES,
+            "today": today.isoformat(),
+            "fragment_keys": fragment_keys,
+            "fragments": fragments,
+        },
+    )
+
+
+@html_router.get("/calendar/team", response_class=HTMLResponse)
+async def team_calendar_view(
+    request: Request,
+    year: int = None,
+    month: int = None,
+    member_id: List[int] = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Отображает календарь команды: события всех участников на указанный месяц.
+
+    Доступен администратору и менеджерам. Общие встречи показываются один раз,
+    список участников можно сузить фильтром.
+
+    Args:
+        request (Request): Объект запроса FastAPI.
+        year (int, optional): Год для отображения. По умолчанию текущий год.
+        month (int, optional): Месяц для отображения. По умолчанию текущий месяц.
+        member_id (List[int], optional): Показать события только этих участников.
+        db (AsyncSession): Асинхронная сессия базы данных.
+
+    Returns:
+        TemplateResponse: HTML-страница календаря команды (calendar_team.html).
+                         При отсутствии аутентификации — RedirectResponse на /login,
+                         без прав или команды — редирект на /calendar.
+    """
+    if not request.state.user:
+        return RedirectResponse(url="/login")
+
+    user = request.state.user
+    if user.team_id is None or user.role not in ("admin", "manager"):
+        return RedirectResponse(
+            url="/calendar?error=Only+admin+or+manager+can+view+team+calendar",
+            status_code=303,
+        )
+
+    today = date.today()
+    target_year = year or today.year
+    target_month = month or today.month
+    selected_members = sorted(set(member_id)) if member_id else None
+
+    fragment_keys, fragments = await _cached_fragments(
+        db,
+        user,
+        team_calendar_grid=(
+            target_year,
+            target_month,
+            today.isoformat(),
+            ",".join(map(str, selected_members or ())),
+        ),
+    )
+    events_by_day = {}
+    if fragment_keys["team_calendar_grid"] not in fragments:
+        events_by_day = await get_team_events_for_month(
+            db, user.team_id, target_year, target_month, selected_members
+        )
+    members = await get_team_members(db, user.team_id)
+
+    return request.app.state.templates.TemplateResponse(
+        "calendar_team.html",
+        {
+            "request": request,
+            "year": target_year,
+            "month": target_month,
+            "grid": month_grid(target_year, target_month),
+            "events_by_day": events_by_day,
+            "weekdays": WEEKDAY_NAMES,
+            "today": today.isoformat(),
+            "members": members,
+            "selected_members": selected_members or [],
+            "fragment_keys": fragment_keys,
+            "fragments": fragments,
         },
     )
 
@@ -178,11 +390,21 @@ async def tasks_view(request: Request, db: AsyncSession = Depends(get_db)):
 
     user: User = request.state.user
     tasks = []
-    if user.team_id is not None:
+    fragment_keys, fragments = await _cached_fragments(
+        db, user, task_list=(user.role,)
+    )
+    if user.team_id is not None and fragment_keys["task_list"] not in fragments:
         tasks = await get_tasks_for_user(db, user.id, user.team_id)
 
     return request.app.state.templates.TemplateResponse(
-        "tasks.html", {"request": request, "user": user, "tasks": tasks}
+        "tasks.html",
+        {
+            "request": request,
+            "user": user,
+            "tasks": tasks,
+            "fragment_keys": fragment_keys,
+            "fragments": fragments,
+        },
     )
 
 
@@ -206,12 +428,17 @@ async def create_task_form(request: Request, db: AsyncSession = Depends(get_db))
     if not request.state.user:
         return RedirectResponse(url="/login")
     user = request.state.user
-    team_members = []
+    team_members, members_truncated = [], False
     if user.team_id:
-        team_members = await get_team_members(db, user.team_id)
+        team_members, members_truncated = await _form_members(db, user)
     return request.app.state.templates.TemplateResponse(
         "task_create.html",
-        {"request": request, "team_members": team_members, "user": user},
+        {
+            "request": request,
+            "team_members": team_members,
+            "members_truncated": members_truncated,
+            "user": user,
+        },
     )
 
 
@@ -380,7 +607,8 @@ async def meetings_view(request: Request, db: AsyncSession = Depends(get_db)):
     Отображает страницу со списком встреч пользователя.
 
     Проверяет аутентификацию пользователя. Если пользователь состоит в команде,
-    загружает его встречи из базы данных.
+    загружает из базы данных его ещё не закончившиеся встречи (не больше
+    MEETINGS_PAGE_LIMIT, по возрастанию начала).
 
     Args:
         request (Request): Объект запроса FastAPI.
@@ -396,10 +624,23 @@ async def meetings_view(request: Request, db: AsyncSession = Depends(get_db)):
 
     user: User = request.state.user
     meetings = []
-    if user.team_id is not None:
-        meetings = await get_user_meetings(db, user.id)
+    fragment_keys, fragments = await _cached_fragments(
+        db, user, meeting_list=(_upcoming_key_part(),)
+    )
+    if user.team_id is not None and fragment_keys["meeting_list"] not in fragments:
+        meetings = await get_user_meetings(
+            db, user.id, when="upcoming", limit=MEETINGS_PAGE_LIMIT
+        )
     return request.app.state.templates.TemplateResponse(
-        "meetings.html", {"request": request, "user": user, "meetings": meetings}
+        "meetings.html",
+        {
+            "request": request,
+            "user": user,
+            "meetings": meetings,
+            "meetings_limit": MEETINGS_PAGE_LIMIT,
+            "fragment_keys": fragment_keys,
+            "fragments": fragments,
+        },
     )
 
 
@@ -423,12 +664,17 @@ async def create_meeting_form(request: Request, db: AsyncSession = Depends(get_d
     if not request.state.user:
         return RedirectResponse(url="/login")
     user = request.state.user
-    team_members = []
+    team_members, members_truncated = [], False
     if user.team_id:
-        team_members = await get_team_members(db, user.team_id)
+        team_members, members_truncated = await _form_members(db, user)
     return request.app.state.templates.TemplateResponse(
         "meeting_create.html",
-        {"request": request, "team_members": team_members, "user": user},
+        {
+            "request": request,
+            "team_members": team_members,
+            "members_truncated": members_truncated,
+            "user": user,
+        },
     )
 
 
@@ -439,6 +685,7 @@ async def handle_create_meeting(
     start_time: str = Form(...),
     end_time: str = Form(...),
     participant_ids: List[str] = Form(...),
+    repeat: str = Form(""),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -450,6 +697,7 @@ async def handle_create_meeting(
         start_time (str): Время начала в ISO формате (обязательное поле)
         end_time (str): Время окончания в ISO формате (обязательное поле)
         participant_ids (List[str]): Список ID участников (обязательное поле)
+        repeat (str): Частота повторения (DAILY, WEEKLY, MONTHLY) или пустая строка
         db (AsyncSession): Асинхронная сессия базы данных
 
     Returns:
@@ -476,6 +724,7 @@ async def handle_create_meeting(
             start_time=start,
             end_time=end,
             participant_ids=[int(x) for x in participant_ids],
+            rrule=f"FREQ={repeat}" if repeat else None,
         )
         await create_meeting(db, meeting_in, user.id, user.team_id)
         return RedirectResponse(
@@ -1,9 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Literal
 from backend.db.session import get_db
-from backend.schemas.meeting import MeetingCreate, MeetingOut
-from backend.crud.meeting import create_meeting, get_user_meetings, delete_meeting
-from backend.api.deps import get_current_user
+from backend.schemas.meeting import (
+    MeetingCancelRange,
+    MeetingCancelResult,
+    MeetingCreate,
+    MeetingExceptionCreate,
+    MeetingExceptionOut,
+    MeetingOut,
+)
+from backend.crud.meeting import (
+    cancel_meetings_in_range,
+    create_meeting,
+    get_user_meetings,
+    delete_meeting,
+    set_meeting_exception,
+)
+from backend.schemas.fields import dump_fields
+from backend.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from backend.api.deps import get_current_user, sparse_fields, conditional_get
 from backend.models.user import User
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
@@ -18,8 +36,11 @@ async def create_new_meeting(
     """
     Создать новую встречу в команде.
 
+    Если указано правило повторения (rrule, например "FREQ=WEEKLY;BYDAY=MO,WE"),
+    создаётся серия; start_time и end_time задают её первое повторение.
+
     Args:
-        meeting_in (MeetingCreate): Входные данные для создания встречи (заголовок, время, участники).
+        meeting_in (MeetingCreate): Входные данные для создания встречи (заголовок, время, участники, rrule).
         db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
         current_user (User): Текущий пользователь, полученный из JWT‑токена.
 
@@ -49,25 +70,118 @@ async def create_new_meeting(
 
 @router.get("/", response_model=list[MeetingOut])
 async def list_my_meetings(
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    when: Literal["all", "upcoming", "past"] = "all",
+    limit: int | None = Query(None, ge=1, le=200),
+    cursor: str | None = None,
+    fields: set[str] | None = Depends(sparse_fields(MeetingOut)),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
     """
-    Получить список всех встреч текущего пользователя.
+    Получить список встреч текущего пользователя.
+
+    Поддерживает условный GET: при совпадении If-None-Match с текущим ETag
+    возвращается 304 без запроса списка встреч. Списки upcoming/past зависят
+    от текущего времени, поэтому для них ETag не выдаётся и 304 не отвечается
+    (в том числе на If-None-Match: *).
+
+    Постраничный вывод (keyset): при указании limit и наличии следующей
+    страницы её курсор возвращается в заголовке X-Next-Cursor.
 
     Args:
+        request (Request): Входящий запрос (If-None-Match).
+        response (Response): Ответ, в который добавляются заголовки.
+        when (str): "all", "upcoming" (ещё не закончившиеся) или "past" (закончившиеся,
+                    от новых к старым).
+        limit (int | None): Размер страницы (1–200). Если не указан — все встречи.
+        cursor (str | None): Курсор из X-Next-Cursor предыдущей страницы.
+        fields (set[str] | None): Поля MeetingOut из параметра ?fields=.
+                                  Если указан, ответ содержит только эти поля.
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
         current_user (User): Текущий пользователь.
 
     Returns:
         list[MeetingOut]: Список встреч, где пользователь является участником или создателем.
+
+    Raises:
+        HTTPException: 400, если курсор недействителен.
     """
 
-    meetings = await get_user_meetings(db, current_user.id)
-    for m in meetings:
-        await db.refresh(m, ["creator", "participants"])
+    if when == "all":
+        headers = await conditional_get(request, response, db, current_user)
+    else:
+        headers = {"Cache-Control": "private, no-store"}
+        response.headers.update(headers)
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, datetime, int)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    meetings = await get_user_meetings(
+        db,
+        current_user.id,
+        fields,
+        when=when,
+        limit=limit + 1 if limit is not None else None,
+        after=after,
+    )
+
+    headers = dict(headers)
+    if limit is not None and len(meetings) > limit:
+        meetings = meetings[:limit]
+        last = meetings[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.start_time, last.id)
+        response.headers[NEXT_CURSOR_HEADER] = headers[NEXT_CURSOR_HEADER]
+
+    if fields is not None:
+        return JSONResponse(
+            [dump_fields(MeetingOut, m, fields) for m in meetings],
+            headers=headers,
+        )
     return meetings
 
 
+@router.post("/cancel-range", response_model=MeetingCancelResult)
+async def cancel_meetings_range(
+    period: MeetingCancelRange,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Отменить все свои встречи, целиком лежащие в интервале [start, end).
+
+    Отменяются встречи, созданные текущим пользователем; серия отменяется,
+    только если все её повторения попадают в интервал.
+
+    Args:
+        period (MeetingCancelRange): Интервал (start, end).
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        MeetingCancelResult: Идентификаторы отменённых встреч.
+
+    Raises:
+        HTTPException:
+            - 400: Если пользователь не состоит в команде или end <= start.
+    """
+
+    if current_user.team_id is None:
+        raise HTTPException(status_code=400, detail="You must be in a team")
+    if period.end <= period.start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+    cancelled = await cancel_meetings_in_range(
+        db, current_user.id, current_user.team_id, period.start, period.end
+    )
+    return {"cancelled": cancelled}
+
+
 @router.delete("/{meeting_id}")
 async def cancel_meeting(
     meeting_id: int,
@@ -103,3 +217,46 @@ async def cancel_meeting(
         )
 
     return {"message": "Meeting cancelled"}
+
+
+@router.post("/{meeting_id}/exceptions", response_model=MeetingExceptionOut)
+async def change_meeting_occurrence(
+    meeting_id: int,
+    exception_in: MeetingExceptionCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Отменить или перенести одно повторение серии встреч.
+
+    Args:
+        meeting_id (int): Идентификатор серии.
+        exception_in (MeetingExceptionCreate): Исходное начало повторения
+            (occurrence_start) и отмена (cancelled) или новые title/start_time/end_time.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        MeetingExceptionOut: Сохранённое исключение из серии.
+
+    Raises:
+        HTTPException:
+            - 400: Если пользователь не в команде, встреча не повторяется
+                   или повторения с таким началом нет.
+            - 404: Если встреча не найдена или у пользователя нет прав на её изменение.
+    """
+
+    if current_user.team_id is None:
+        raise HTTPException(status_code=400, detail="You must be in a team")
+
+    try:
+        exception = await set_meeting_exception(
+            db, meeting_id, exception_in, current_user.id, current_user.team_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if exception is None:
+        raise HTTPException(
+            status_code=404, detail="Meeting not found or access denied"
+        )
+    return exception
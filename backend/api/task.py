@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.db.session import get_db
 from backend.schemas.task import (
+    TaskBulkCreate,
+    TaskBulkResult,
+    TaskBulkUpdate,
     TaskCreate,
+    TaskImportResult,
     TaskUpdate,
     TaskOut,
     CommentCreate,
@@ -10,19 +16,29 @@ from backend.schemas.task import (
 )
 from backend.crud.task import (
     create_task,
+    create_tasks_bulk,
+    update_tasks_bulk,
     get_task_by_id,
     get_tasks_for_user,
+    search_tasks,
     update_task,
     delete_task,
     create_comment,
     get_comments_for_task,
 )
-from backend.api.deps import get_current_user
+from backend.crud.task_import import IMPORT_BATCH_SIZE, ImportProgress, import_tasks
+from backend.core.record_stream import CONTENT_TYPE_FORMATS, RECORD_FORMATS, iter_records
+from backend.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from backend.schemas.fields import dump_fields
+from backend.api.deps import get_current_user, sparse_fields, conditional_get
 from backend.models.user import User, UserRole
 from backend.models.task import TaskStatus
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# Максимальное число задач в одном запросе /tasks/bulk.
+BULK_MAX_TASKS = 1000
+
 
 def validate_role_for_task_management(current_user: User):
     """
@@ -81,33 +97,280 @@ async def create_new_task(
     return task
 
 
+def _bulk_result(results: list[dict]) -> dict:
+    """Собрать тело TaskBulkResult из результатов по элементам."""
+
+    failed = sum(1 for item in results if "error" in item)
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+def _validate_bulk_request(current_user: User, size: int) -> None:
+    """
+    Проверить права и размер пакетного запроса к задачам.
+
+    Raises:
+        HTTPException: 403 — роль не позволяет управлять задачами;
+                       400 — пользователь не в команде или задач больше BULK_MAX_TASKS.
+    """
+
+    validate_role_for_task_management(current_user)
+    if current_user.team_id is None:
+        raise HTTPException(status_code=400, detail="You must be in a team")
+    if size > BULK_MAX_TASKS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {BULK_MAX_TASKS} tasks per request"
+        )
+
+
+@router.post("/bulk", response_model=TaskBulkResult)
+async def create_tasks_in_bulk(
+    bulk_in: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Создать много задач одним запросом (например, при импорте спринта).
+
+    Все корректные задачи создаются в одной транзакции; задачи с ошибками
+    пропускаются и перечисляются в results.
+
+    Args:
+        bulk_in (TaskBulkCreate): Список задач (не больше BULK_MAX_TASKS).
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        TaskBulkResult: Количество созданных и пропущенных задач и результат
+        по каждой задаче ({"index", "id"} или {"index", "error"}).
+
+    Raises:
+        HTTPException:
+            - 400: Если пользователь не состоит в команде или задач слишком много.
+            - 403: Если роль пользователя не позволяет управлять задачами.
+    """
+
+    _validate_bulk_request(current_user, len(bulk_in.tasks))
+    results = await create_tasks_bulk(
+        db, bulk_in.tasks, current_user.id, current_user.team_id
+    )
+    return _bulk_result(results)
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def update_tasks_in_bulk(
+    bulk_in: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Обновить много задач команды одним запросом (например, сменить статус).
+
+    Args:
+        bulk_in (TaskBulkUpdate): Список изменений {"id", ...поля TaskUpdate}.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        TaskBulkResult: Количество обновлённых и пропущенных задач и результат
+        по каждому элементу (ошибки: задача не найдена, повтор, неверный статус).
+
+    Raises:
+        HTTPException:
+            - 400: Если пользователь не состоит в команде или задач слишком много.
+            - 403: Если роль пользователя не позволяет управлять задачами.
+    """
+
+    _validate_bulk_request(current_user, len(bulk_in.tasks))
+    results = await update_tasks_bulk(db, bulk_in.tasks, current_user.team_id)
+    return _bulk_result(results)
+
+
+def _import_format(request: Request, record_format: str | None) -> str:
+    """
+    Определить формат импортируемого файла по параметру или Content-Type.
+
+    Raises:
+        HTTPException: 400, если формат не указан или не поддерживается.
+    """
+
+    if record_format is None:
+        content_type = request.headers.get("content-type", "")
+        record_format = CONTENT_TYPE_FORMATS.get(content_type.split(";")[0].strip().lower())
+    if record_format not in RECORD_FORMATS:
+        raise HTTPException(
+            status_code=400, detail=f"Format must be one of {', '.join(RECORD_FORMATS)}"
+        )
+    return record_format
+
+
+@router.post("/import", response_model=TaskImportResult)
+async def import_tasks_from_file(
+    request: Request,
+    record_format: str | None = Query(None, alias="format"),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=BULK_MAX_TASKS),
+    resume_from: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Импортировать задачи в команду из CSV или NDJSON в теле запроса.
+
+    Тело читается и разбирается потоково, задачи вставляются пакетами по
+    batch_size, каждый пакет фиксируется отдельно. Исполнитель задаётся
+    колонкой assignee_email, assignee_id или assignee (email либо id).
+    Если загрузка прервалась, её можно повторить с resume_from=rows из
+    последнего ответа — уже импортированные записи будут пропущены.
+
+    Args:
+        request (Request): Запрос; тело — файл CSV (с заголовком) или NDJSON.
+        record_format (str | None): Параметр ?format=csv|ndjson; по умолчанию
+            определяется по Content-Type.
+        batch_size (int): Размер пакета.
+        resume_from (int): Контрольная точка предыдущей попытки.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        TaskImportResult: Число обработанных записей (контрольная точка),
+        импортированных и ошибочных задач, первые ошибки по строкам.
+        Если файл повреждён, ответ 400 с тем же телом, completed=false и
+        описанием ошибки в detail.
+
+    Raises:
+        HTTPException:
+            - 400: Если пользователь не в команде или формат не поддерживается.
+            - 403: Если роль пользователя не позволяет управлять задачами.
+    """
+
+    _validate_bulk_request(current_user, 0)
+    records = iter_records(request.stream(), _import_format(request, record_format))
+    progress = ImportProgress()
+    try:
+        await import_tasks(
+            db,
+            records,
+            current_user.team_id,
+            current_user.id,
+            batch_size=batch_size,
+            resume_from=resume_from,
+            progress=progress,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            {**asdict(progress), "completed": False, "detail": str(e)},
+            status_code=400,
+        )
+    return {**asdict(progress), "completed": True}
+
+
 @router.get("/", response_model=list[TaskOut])
 async def list_my_tasks(
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
+    fields: set[str] | None = Depends(sparse_fields(TaskOut)),
+    cache_headers: dict[str, str] = Depends(conditional_get),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
     """
     Получить список всех задач текущего пользователя.
 
+    Поддерживает условный GET: при совпадении If-None-Match с текущим ETag
+    возвращается 304 без запроса списка задач.
+
     Args:
+        fields (set[str] | None): Поля TaskOut из параметра ?fields=.
+                                  Если указан, ответ содержит только эти поля.
+        cache_headers (dict[str, str]): Заголовки ETag/Cache-Control (см. conditional_get).
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
         current_user (User): Текущий пользователь.
 
     Returns:
-        list[TaskOut]: Список задач с комментариями.
+        list[TaskOut]: Список задач с комментариями (или только запрошенные поля).
     """
 
     if current_user.team_id is None:
         return []
-    tasks = await get_tasks_for_user(db, current_user.id, current_user.team_id)
+    tasks = await get_tasks_for_user(
+        db, current_user.id, current_user.team_id, fields
+    )
+    if fields is not None:
+        return JSONResponse(
+            [dump_fields(TaskOut, task, fields) for task in tasks],
+            headers=cache_headers,
+        )
     for task in tasks:
         await db.refresh(task, ["creator", "assignee"])
         task.comments = await get_comments_for_task(db, task.id)
     return tasks
 
 
+@router.get("/search", response_model=list[TaskOut])
+async def search_team_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=200),
+    cursor: str | None = None,
+    fields: set[str] | None = Depends(sparse_fields(TaskOut)),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Полнотекстовый поиск задач команды по заголовку, описанию и комментариям.
+
+    Задачи упорядочены по релевантности; все слова запроса обязательны,
+    последнее может быть началом слова. Курсор следующей страницы
+    возвращается в заголовке X-Next-Cursor.
+
+    Args:
+        response (Response): Ответ, в который добавляется заголовок курсора.
+        q (str): Поисковый запрос.
+        limit (int): Размер страницы (1–200).
+        cursor (str | None): Курсор из X-Next-Cursor предыдущей страницы.
+        fields (set[str] | None): Поля TaskOut из параметра ?fields=.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        list[TaskOut]: Найденные задачи команды пользователя.
+
+    Raises:
+        HTTPException: 400, если в запросе нет слов или курсор недействителен.
+    """
+
+    if current_user.team_id is None:
+        return []
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, float, int)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        found = await search_tasks(
+            db, current_user.team_id, q, fields, limit=limit + 1, after=after
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {}
+    if len(found) > limit:
+        found = found[:limit]
+        last_task, last_rank = found[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last_rank, last_task.id)
+        response.headers.update(headers)
+
+    tasks = [task for task, _ in found]
+    if fields is not None:
+        return JSONResponse(
+            [dump_fields(TaskOut, task, fields) for task in tasks], headers=headers
+        )
+    return tasks
+
+
 @router.get("/{task_id}", response_model=TaskOut)
 async def get_task(
     task_id: int,
+    fields: set[str] | None = Depends(sparse_fields(TaskOut)),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -116,20 +379,23 @@ async def get_task(
 
     Args:
         task_id (int): Идентификатор задачи.
+        fields (set[str] | None): Поля TaskOut из параметра ?fields=.
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
         current_user (User): Текущий пользователь.
 
     Returns:
-        TaskOut: Объект задачи с комментариями.
+        TaskOut: Объект задачи с комментариями (или только запрошенные поля).
 
     Raises:
         HTTPException:
             - 404: Если задача не найдена или принадлежит другой команде.
     """
 
-    task = await get_task_by_id(db, task_id)
+    task = await get_task_by_id(db, task_id, fields)
     if not task or task.team_id != current_user.team_id:
         raise HTTPException(status_code=404, detail="Task not found")
+    if fields is not None:
+        return JSONResponse(dump_fields(TaskOut, task, fields))
 
     await db.refresh(task, ["creator", "assignee"])
     task.comments = await get_comments_for_task(db, task.id)
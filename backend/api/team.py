@@ -1,20 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
 from backend.db.session import get_db
-from backend.schemas.team import TeamCreate, TeamOut, TeamMemberUpdate
+from backend.schemas.user import UserOut
+from backend.schemas.team import (
+    BusyHeatmapResponse,
+    TeamBulkMembers,
+    TeamBulkMembersResult,
+    TeamCreate,
+    TeamInviteCreate,
+    TeamInviteCreated,
+    TeamInviteOut,
+    TeamJoin,
+    TeamOut,
+    TeamMemberUpdate,
+    TeamSummary,
+)
 from backend.crud.team import (
     create_team,
     get_team_by_id,
     add_user_to_team,
     remove_user_from_team,
     set_user_role_in_team,
+    add_users_to_team_bulk,
+    set_roles_in_team_bulk,
     get_team_members,
+    get_role_counts,
+    get_busy_heatmap,
+    join_team_by_code,
+)
+from backend.crud.team_invite import (
+    create_team_invite,
+    get_team_invites,
+    revoke_team_invite,
 )
-from backend.api.deps import get_current_user
+from backend.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from backend.crud.member_search import search_team_members
+from backend.crud.team_export import export_columns, stream_team_export
+from backend.core.record_stream import EXPORT_MEDIA_TYPES, render_records
+from backend.api.deps import (
+    conditional_get,
+    connection_token,
+    get_current_user,
+    get_stream_user,
+    get_user_from_token,
+)
+from backend.core.config import settings
+from backend.core.events import Subscription, event_bus
 from backend.models.user import User, UserRole
+import asyncio
+import json
+import re
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
+# Ограничения карты занятости: длина периода и минимальный интервал сетки.
+HEATMAP_MAX_DAYS = 93
+HEATMAP_MIN_BUCKET = timedelta(minutes=5)
+
+# Максимальное число пользователей в одном запросе /members/bulk.
+BULK_MAX_MEMBERS = 5000
+
+# Максимальный срок действия приглашения в команду (в часах).
+INVITE_MAX_HOURS = 24 * 90
+
+BUCKET_UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+
+def _parse_bucket(value: str) -> timedelta:
+    """
+    Разобрать длину интервала сетки вида "30m", "1h" или "1d".
+
+    Raises:
+        HTTPException: 400, если формат неверный или интервал меньше HEATMAP_MIN_BUCKET.
+    """
+
+    match = re.fullmatch(r"(\d+)([mhd])", value.strip())
+    if not match:
+        raise HTTPException(
+            status_code=400, detail="Invalid bucket. Use e.g. 15m, 30m, 1h, 1d"
+        )
+    bucket = timedelta(**{BUCKET_UNITS[match.group(2)]: int(match.group(1))})
+    if bucket < HEATMAP_MIN_BUCKET:
+        raise HTTPException(status_code=400, detail="Bucket must be at least 5m")
+    return bucket
+
 
 @router.post("/", response_model=TeamOut)
 async def create_new_team(
@@ -50,19 +130,28 @@ async def create_new_team(
     return TeamOut(id=team.id, name=team.name, admin_id=team.admin_id, members=members)
 
 
-@router.get("/me", response_model=TeamOut)
+@router.get("/me", response_model=TeamSummary)
 async def get_my_team(
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
+    cache_headers: dict[str, str] = Depends(conditional_get),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
     """
     Получить информацию о команде текущего пользователя.
 
+    Участники в ответ не входят (см. GET /teams/me/members) — только их
+    количество по ролям, посчитанное одним запросом.
+
+    Поддерживает условный GET: при совпадении If-None-Match с текущим ETag
+    возвращается 304 без запросов к команде.
+
     Args:
+        cache_headers (dict[str, str]): Заголовки ETag/Cache-Control (см. conditional_get).
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
         current_user (User): Текущий пользователь.
 
     Returns:
-        TeamOut: Объект команды с её участниками.
+        TeamSummary: Команда, число участников и их количество по ролям.
 
     Raises:
         HTTPException:
@@ -76,8 +165,203 @@ async def get_my_team(
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
-    members = await get_team_members(db, team.id)
-    return TeamOut(id=team.id, name=team.name, admin_id=team.admin_id, members=members)
+    role_counts = await get_role_counts(db, team.id)
+    return TeamSummary(
+        id=team.id,
+        name=team.name,
+        admin_id=team.admin_id,
+        member_count=sum(role_counts.values()),
+        role_counts=role_counts,
+    )
+
+
+@router.get("/me/members", response_model=list[UserOut])
+async def list_my_team_members(
+    response: Response,
+    role: UserRole | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    cache_headers: dict[str, str] = Depends(conditional_get),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Постраничный список участников команды текущего пользователя.
+
+    Участники упорядочены по id; курсор следующей страницы возвращается
+    в заголовке X-Next-Cursor (на последней странице его нет).
+
+    Args:
+        response (Response): Ответ, в который добавляется заголовок курсора.
+        role (UserRole | None): Только участники с этой ролью.
+        limit (int): Размер страницы (1–200).
+        cursor (str | None): Курсор из X-Next-Cursor предыдущей страницы.
+        cache_headers (dict[str, str]): Заголовки ETag/Cache-Control (см. conditional_get).
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        list[UserOut]: Участники команды.
+
+    Raises:
+        HTTPException:
+            - 400: Если курсор недействителен.
+            - 404: Если пользователь не состоит в команде.
+    """
+
+    if current_user.team_id is None:
+        raise HTTPException(status_code=404, detail="You are not in a team")
+    after_id = None
+    if cursor:
+        try:
+            (after_id,) = decode_cursor(cursor, int)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    members = await get_team_members(
+        db, current_user.team_id, role=role, limit=limit + 1, after_id=after_id
+    )
+    if len(members) > limit:
+        members = members[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(members[-1].id)
+    return members
+
+
+@router.get("/me/members/search", response_model=list[UserOut])
+async def search_my_team_members(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Подсказки участников своей команды по началу email, имени или фамилии.
+
+    Для выпадающих списков выбора исполнителя и участников встречи:
+    поиск идёт по индексу в памяти, без перебора участников в БД.
+
+    Args:
+        prefix (str): Начало email, имени или любого их слова.
+        limit (int): Максимальное число подсказок (1–50).
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        list[UserOut]: Найденные участники команды.
+
+    Raises:
+        HTTPException: 404, если пользователь не состоит в команде.
+    """
+
+    if current_user.team_id is None:
+        raise HTTPException(status_code=404, detail="You are not in a team")
+    return await search_team_members(db, current_user.team_id, prefix, limit)
+
+
+async def _sse_events(subscription: Subscription):
+    """
+    Кадры Server-Sent Events для подписки; комментарий-keepalive, если
+    событий нет EVENT_KEEPALIVE_SECONDS. При закрытии потока отписывается.
+    """
+
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            team_event = await subscription.get(settings.EVENT_KEEPALIVE_SECONDS)
+            if team_event is None:
+                if subscription.closed:
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {team_event['type']}\ndata: {json.dumps(team_event)}\n\n"
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get("/me/events", response_class=StreamingResponse)
+async def stream_team_events(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_stream_user),
+):
+    """
+    Поток изменений своей команды (Server-Sent Events) вместо опроса /api/tasks/.
+
+    События: task и meeting ({"id", "deleted"}), comment и evaluation
+    ({"id", "task_id"}); публикуются после фиксации изменения. Если клиент
+    не успевает читать, старые события отбрасываются и приходит событие
+    overflow ({"dropped": n}) — клиенту стоит перечитать данные целиком.
+
+    Токен передаётся заголовком Authorization, cookie access_token
+    или параметром ?token= (EventSource не умеет передавать заголовки).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        StreamingResponse: Поток text/event-stream.
+
+    Raises:
+        HTTPException: 401 без токена; 404, если пользователь не состоит в команде.
+    """
+
+    if current_user.team_id is None:
+        raise HTTPException(status_code=404, detail="You are not in a team")
+    # Вернуть соединение с БД в пул: поток может длиться часами.
+    await db.commit()
+    return StreamingResponse(
+        _sse_events(event_bus.subscribe(current_user.team_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/me/events/ws")
+async def team_events_websocket(websocket: WebSocket, db: AsyncSession = Depends(get_db)):
+    """
+    Поток изменений своей команды через WebSocket: каждое событие — JSON-сообщение
+    (те же события, что и в /teams/me/events).
+
+    Токен передаётся параметром ?token=, cookie access_token или заголовком
+    Authorization; без действительного токена соединение закрывается с кодом 1008.
+
+    Args:
+        websocket (WebSocket): Соединение.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+    """
+
+    user = await get_user_from_token(db, connection_token(websocket))
+    # Вернуть соединение с БД в пул: поток может длиться часами.
+    await db.commit()
+    if user is None or user.team_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = event_bus.subscribe(user.team_id)
+    # Клиент ничего не отправляет; чтение нужно, чтобы заметить отключение.
+    receiving = asyncio.create_task(websocket.receive_text())
+    try:
+        while True:
+            getting = asyncio.create_task(subscription.get())
+            done, _ = await asyncio.wait(
+                {receiving, getting}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if receiving in done:
+                getting.cancel()
+                receiving.result()
+                receiving = asyncio.create_task(websocket.receive_text())
+                continue
+            team_event = getting.result()
+            if team_event is None:
+                await websocket.close()
+                return
+            await websocket.send_json(team_event)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiving.cancel()
+        event_bus.unsubscribe(subscription)
 
 
 @router.post("/{team_id}/add-member")
@@ -157,6 +441,104 @@ async def set_member_role(
     return {"message": f"Role set to {role_update.role}"}
 
 
+def _validate_bulk_members(
+    team_id: int, bulk_in: TeamBulkMembers, current_user: User
+) -> UserRole:
+    """
+    Проверить права и содержимое пакетного запроса к участникам команды.
+
+    Returns:
+        UserRole: Роль из запроса.
+
+    Raises:
+        HTTPException: 403 — пользователь не администратор команды;
+                       400 — недопустимая роль или слишком много пользователей.
+    """
+
+    if current_user.team_id != team_id or current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admin can manage members")
+    if bulk_in.role not in (UserRole.MANAGER, UserRole.MEMBER):
+        raise HTTPException(status_code=400, detail="Invalid role")
+    if len(bulk_in.users) > BULK_MAX_MEMBERS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {BULK_MAX_MEMBERS} users per request"
+        )
+    return UserRole(bulk_in.role)
+
+
+def _bulk_members_result(results: list[dict]) -> dict:
+    """Собрать тело TeamBulkMembersResult из результатов по элементам."""
+
+    failed = sum(1 for item in results if "error" in item)
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+@router.post("/{team_id}/members/bulk", response_model=TeamBulkMembersResult)
+async def add_members_in_bulk(
+    team_id: int,
+    bulk_in: TeamBulkMembers,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Добавить в команду много пользователей одним запросом (онбординг отдела).
+
+    Пользователи задаются id или email; все найденные и свободные добавляются
+    в одной транзакции, остальные перечисляются в results с причиной.
+
+    Args:
+        team_id (int): Идентификатор команды.
+        bulk_in (TeamBulkMembers): Пользователи (не больше BULK_MAX_MEMBERS) и их роль.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        TeamBulkMembersResult: Количество добавленных и пропущенных пользователей
+        и результат по каждому (ошибки: не найден, повтор, уже в команде,
+        состоит в другой команде).
+
+    Raises:
+        HTTPException:
+            - 400: Если роль недопустима или пользователей слишком много.
+            - 403: Если текущий пользователь не является администратором команды.
+    """
+
+    role = _validate_bulk_members(team_id, bulk_in, current_user)
+    results = await add_users_to_team_bulk(db, team_id, bulk_in.users, role)
+    return _bulk_members_result(results)
+
+
+@router.patch("/{team_id}/members/bulk", response_model=TeamBulkMembersResult)
+async def set_member_roles_in_bulk(
+    team_id: int,
+    bulk_in: TeamBulkMembers,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Установить роль многим участникам команды одним запросом.
+
+    Args:
+        team_id (int): Идентификатор команды.
+        bulk_in (TeamBulkMembers): Участники (id или email) и новая роль.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        TeamBulkMembersResult: Результат по каждому участнику (ошибки: не найден,
+        повтор, не состоит в команде).
+
+    Raises:
+        HTTPException:
+            - 400: Если роль недопустима или пользователей слишком много.
+            - 403: Если текущий пользователь не является администратором команды.
+    """
+
+    role = _validate_bulk_members(team_id, bulk_in, current_user)
+    results = await set_roles_in_team_bulk(db, team_id, bulk_in.users, role)
+    return _bulk_members_result(results)
+
+
 @router.delete("/{team_id}/remove-member/{user_id}")
 async def remove_member(
     team_id: int,
@@ -194,3 +576,236 @@ async def remove_member(
         raise HTTPException(status_code=404, detail="User not found or not in team")
 
     return {"message": "Member removed"}
+
+
+@router.post("/join")
+async def join_team(
+    join_in: TeamJoin,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Присоединиться к команде по коду приглашения.
+
+    Args:
+        join_in (TeamJoin): Код приглашения.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        dict: {"message": "Joined team"}.
+
+    Raises:
+        HTTPException:
+            - 400: Если пользователь уже в команде или приглашение недействительно
+              (не найдено, отозвано, истекло или исчерпано).
+    """
+
+    if current_user.team_id is not None:
+        raise HTTPException(status_code=400, detail="User already in a team")
+
+    success = await join_team_by_code(db, current_user.id, join_in.code.strip())
+    if not success:
+        raise HTTPException(status_code=400, detail="Invalid or expired invite code")
+    return {"message": "Joined team"}
+
+
+@router.post("/{team_id}/invites", response_model=TeamInviteCreated)
+async def create_invite(
+    team_id: int,
+    invite_in: TeamInviteCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Создать приглашение в команду.
+
+    Код возвращается только в этом ответе: в базе хранится его хэш.
+
+    Args:
+        team_id (int): Идентификатор команды.
+        invite_in (TeamInviteCreate): Срок действия в часах (по умолчанию неделя,
+            null — бессрочно) и число использований (null — без ограничения).
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        TeamInviteCreated: Приглашение и его код.
+
+    Raises:
+        HTTPException:
+            - 400: Если срок или число использований вне допустимых пределов.
+            - 403: Если текущий пользователь не является администратором команды.
+    """
+
+    if current_user.team_id != team_id or current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admin can manage invites")
+    hours = invite_in.expires_in_hours
+    if hours is not None and not 1 <= hours <= INVITE_MAX_HOURS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"expires_in_hours must be between 1 and {INVITE_MAX_HOURS}",
+        )
+    if invite_in.max_uses is not None and invite_in.max_uses < 1:
+        raise HTTPException(status_code=400, detail="max_uses must be positive")
+
+    invite, code = await create_team_invite(
+        db,
+        team_id,
+        current_user.id,
+        expires_in=timedelta(hours=hours) if hours is not None else None,
+        max_uses=invite_in.max_uses,
+    )
+    return TeamInviteCreated(
+        **TeamInviteOut.model_validate(invite).model_dump(), code=code
+    )
+
+
+@router.get("/{team_id}/invites", response_model=list[TeamInviteOut])
+async def list_invites(
+    team_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Список приглашений команды (без кодов), включая отозванные и истёкшие.
+
+    Raises:
+        HTTPException: 403, если текущий пользователь не является администратором команды.
+    """
+
+    if current_user.team_id != team_id or current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admin can manage invites")
+    return await get_team_invites(db, team_id)
+
+
+@router.delete("/{team_id}/invites/{invite_id}")
+async def revoke_invite(
+    team_id: int,
+    invite_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Отозвать приглашение: по его коду больше нельзя присоединиться.
+
+    Raises:
+        HTTPException:
+            - 403: Если текущий пользователь не является администратором команды.
+            - 404: Если приглашение не найдено или уже отозвано.
+    """
+
+    if current_user.team_id != team_id or current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admin can manage invites")
+    if not await revoke_team_invite(db, team_id, invite_id):
+        raise HTTPException(status_code=404, detail="Invite not found")
+    return {"message": "Invite revoked"}
+
+
+@router.get("/{team_id}/busy-heatmap", response_model=BusyHeatmapResponse)
+async def get_team_busy_heatmap(
+    team_id: int,
+    start: datetime,
+    end: datetime,
+    bucket: str = "30m",
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Карта занятости команды: сколько участников заняты встречами в каждом интервале.
+
+    Args:
+        team_id (int): Идентификатор команды.
+        start (datetime): Начало периода (ISO, например 2026-03-02T00:00:00).
+        end (datetime): Конец периода (не включительно).
+        bucket (str): Длина интервала сетки: "15m", "30m", "1h", "1d" и т.п.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        BusyHeatmapResponse: Количество участников и counts — число занятых
+        участников для каждого интервала, начиная со start.
+
+    Raises:
+        HTTPException:
+            - 403: Если пользователь не admin/manager этой команды.
+            - 400: Если период пустой, длиннее HEATMAP_MAX_DAYS дней
+                   или интервал сетки указан неверно.
+    """
+
+    if current_user.team_id != team_id or current_user.role not in (
+        UserRole.ADMIN,
+        UserRole.MANAGER,
+    ):
+        raise HTTPException(
+            status_code=403, detail="Only admin or manager can view team heatmap"
+        )
+
+    step = _parse_bucket(bucket)
+    # Время встреч хранится без часового пояса.
+    start, end = start.replace(tzinfo=None), end.replace(tzinfo=None)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end - start > timedelta(days=HEATMAP_MAX_DAYS):
+        raise HTTPException(
+            status_code=400, detail=f"Period must not exceed {HEATMAP_MAX_DAYS} days"
+        )
+
+    member_count, counts = await get_busy_heatmap(db, team_id, start, end, step)
+    return {
+        "team_id": team_id,
+        "start": start,
+        "end": end,
+        "bucket_minutes": int(step.total_seconds() // 60),
+        "member_count": member_count,
+        "counts": counts,
+    }
+
+
+@router.get("/{team_id}/export", response_class=StreamingResponse)
+async def export_team_data(
+    team_id: int,
+    record_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Полная выгрузка задач, комментариев, оценок и встреч команды (для аудита).
+
+    Записи читаются из БД через серверный курсор в одном снимке и отдаются
+    потоком, поэтому память не зависит от объёма данных. При Accept-Encoding:
+    gzip ответ сжимается на лету CompressionMiddleware.
+
+    Args:
+        team_id (int): Идентификатор команды.
+        record_format (str): Параметр ?format=ndjson (по умолчанию) или csv.
+            В CSV у записей всех типов общий набор колонок, первая — type.
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        current_user (User): Текущий пользователь.
+
+    Returns:
+        StreamingResponse: Файл team-<id>.<format> с записями {"type", ...поля}.
+
+    Raises:
+        HTTPException: 403, если пользователь не admin/manager этой команды.
+    """
+
+    if current_user.team_id != team_id or current_user.role not in (
+        UserRole.ADMIN,
+        UserRole.MANAGER,
+    ):
+        raise HTTPException(
+            status_code=403, detail="Only admin or manager can export team data"
+        )
+
+    records = stream_team_export(db, team_id)
+    return StreamingResponse(
+        render_records(records, record_format, export_columns()),
+        media_type=EXPORT_MEDIA_TYPES[record_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="team-{team_id}.{record_format}"'
+            ),
+            "Cache-Control": "no-store",
+        },
+    )
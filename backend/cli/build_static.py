@@ -0,0 +1,35 @@
+"""
+Сборка статических файлов: хэшированные имена и предварительное сжатие.
+
+Запуск:
+
+    python -m backend.cli.build_static [--static-dir backend/static] [--min-size 256]
+"""
+
+import argparse
+import os
+from backend.core.static import BUILD_DIR, build_static
+
+DEFAULT_STATIC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build and precompress static assets")
+    parser.add_argument("--static-dir", default=DEFAULT_STATIC_DIR)
+    parser.add_argument(
+        "--min-size",
+        type=int,
+        default=256,
+        help="files smaller than this are not precompressed",
+    )
+    args = parser.parse_args()
+
+    manifest = build_static(args.static_dir, minimum_size=args.min_size)
+    for source, hashed in manifest.items():
+        print(f"{source} -> {BUILD_DIR}/{hashed}")
+
+
+if __name__ == "__main__":
+    main()
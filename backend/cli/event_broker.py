@@ -0,0 +1,26 @@
+"""
+Брокер событий команд между воркерами приложения (EVENT_TRANSPORT=unix).
+
+Запуск:
+
+    python -m backend.cli.event_broker [--socket ./data/events.sock]
+"""
+
+import argparse
+import asyncio
+from backend.core.config import settings
+from backend.core.event_transports import EventBroker
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Relay team events between workers")
+    parser.add_argument("--socket", default=settings.EVENT_BROKER_SOCKET)
+    args = parser.parse_args()
+    try:
+        asyncio.run(EventBroker(args.socket).serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
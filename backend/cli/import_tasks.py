@@ -0,0 +1,119 @@
+"""
+Импорт задач из CSV или NDJSON в команду пользователя.
+
+Запуск:
+
+    python -m backend.cli.import_tasks tasks.csv --creator-email manager@example.com
+        [--format csv|ndjson] [--batch-size 500] [--checkpoint tasks.csv.checkpoint]
+
+Файл читается потоково. После каждого зафиксированного пакета номер последней
+обработанной записи сохраняется в файл контрольной точки; повторный запуск
+продолжает импорт с неё. После успешного импорта контрольная точка удаляется.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections.abc import AsyncIterator
+from backend.core.record_stream import RECORD_FORMATS, iter_records
+from backend.crud.task_import import IMPORT_BATCH_SIZE, ImportProgress, import_tasks
+from backend.crud.user import get_user_by_email
+from backend.db.session import AsyncSessionLocal
+
+# Размер порции чтения файла (в байтах).
+READ_CHUNK_SIZE = 65_536
+
+
+async def _read_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+def _load_checkpoint(path: str) -> int:
+    try:
+        with open(path) as file:
+            return int(json.load(file)["rows"])
+    except FileNotFoundError:
+        return 0
+
+
+def _save_checkpoint(path: str, progress: ImportProgress) -> None:
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump({"rows": progress.rows}, file)
+    os.replace(temporary, path)
+
+
+async def run(args: argparse.Namespace) -> int:
+    record_format = args.format or os.path.splitext(args.file)[1].lstrip(".").lower()
+    if record_format == "jsonl":
+        record_format = "ndjson"
+    if record_format not in RECORD_FORMATS:
+        print(f"Unknown format, use --format {'|'.join(RECORD_FORMATS)}", file=sys.stderr)
+        return 2
+
+    checkpoint = args.checkpoint or args.file + ".checkpoint"
+    resume_from = _load_checkpoint(checkpoint)
+    if resume_from:
+        print(f"Resuming after record {resume_from}", file=sys.stderr)
+
+    def report(progress: ImportProgress) -> None:
+        _save_checkpoint(checkpoint, progress)
+        print(
+            f"records {progress.rows}: imported {progress.imported}, "
+            f"failed {progress.failed}",
+            file=sys.stderr,
+        )
+
+    async with AsyncSessionLocal() as db:
+        creator = await get_user_by_email(db, args.creator_email)
+        if creator is None or creator.team_id is None:
+            print("Creator not found or not in a team", file=sys.stderr)
+            return 2
+
+        progress = ImportProgress()
+        try:
+            await import_tasks(
+                db,
+                iter_records(_read_chunks(args.file), record_format),
+                creator.team_id,
+                creator.id,
+                batch_size=args.batch_size,
+                resume_from=resume_from,
+                on_batch=report,
+                progress=progress,
+            )
+        except ValueError as e:
+            print(f"Stopped after record {progress.rows}: {e}", file=sys.stderr)
+            return 1
+
+    for error in progress.errors:
+        print(f"record {error['row']}: {error['error']}", file=sys.stderr)
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    print(f"Imported {progress.imported} tasks, {progress.failed} failed")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import tasks from CSV or NDJSON")
+    parser.add_argument("file")
+    parser.add_argument(
+        "--creator-email",
+        required=True,
+        help="tasks are created by this user in their team",
+    )
+    parser.add_argument("--format", choices=RECORD_FORMATS)
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument(
+        "--checkpoint", help="checkpoint file (default: FILE.checkpoint)"
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Отдельный процесс обработки фоновых заданий.
+
+Запуск:
+
+    python -m backend.cli.run_jobs [--concurrency 4] [--once]
+
+Используется, когда обработчик в процессах веб-сервера отключён
+(JOBS_ENABLED=false). С --once выполняет готовые задания и завершается.
+Останавливается по SIGINT/SIGTERM, дожидаясь выполняющихся заданий.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+from backend.core.config import settings
+from backend.jobs import JobRunner
+
+
+async def run(args: argparse.Namespace) -> int:
+    runner = JobRunner(concurrency=args.concurrency)
+    if args.once:
+        done = await runner.run_pending()
+        print(f"Ran {done} jobs", file=sys.stderr)
+        return 0
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    await runner.start()
+    await stop.wait()
+    await runner.stop()
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background jobs")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_CONCURRENCY)
+    parser.add_argument(
+        "--once", action="store_true", help="run ready jobs and exit"
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from backend.core.config import settings
+
+
+class MemoryLRUStore:
+    """
+    Хранилище в памяти процесса с вытеснением давно не использованных записей (LRU).
+
+    Ограничено и числом записей, и их суммарным размером: крупные фрагменты
+    (например, календарные фиды) не могут занять память без предела.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int | None = None):
+        """
+        Args:
+            max_entries (int): Максимальное количество записей.
+            max_bytes (int | None): Максимальный суммарный размер записей
+                в байтах UTF-8 (None — без ограничения).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._total = 0
+
+    def get(self, key: str) -> str | None:
+        """Получить фрагмент по ключу (None, если его нет)."""
+
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """Получить несколько фрагментов: {ключ: html} только для найденных."""
+
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Сохранить фрагмент, вытеснив самые старые записи сверх лимитов.
+
+        Фрагмент больше max_bytes не сохраняется.
+        """
+
+        size = len(value.encode())
+        self._delete(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._data[key] = value
+        self._sizes[key] = size
+        self._total += size
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self._total > self.max_bytes
+        ):
+            self._delete(next(iter(self._data)))
+
+    def delete_matching(self, fragment: str) -> None:
+        """Удалить записи, ключ которых содержит подстроку fragment."""
+
+        for key in [key for key in self._data if fragment in key]:
+            self._delete(key)
+
+    def _delete(self, key: str) -> None:
+        if self._data.pop(key, None) is not None:
+            self._total -= self._sizes.pop(key)
+
+
+class SQLiteStore:
+    """
+    Хранилище в локальном файле SQLite, общее для всех воркеров на одной машине.
+
+    Файл открывается в режиме WAL, поэтому чтения из разных процессов не блокируют
+    друг друга. Вытеснение — по времени последнего обращения (LRU), с
+    ограничением числа записей и их суммарного размера.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1024, max_bytes: int | None = None):
+        """
+        Args:
+            path (str): Путь к файлу базы кэша.
+            max_entries (int): Максимальное количество записей.
+            max_bytes (int | None): Максимальный суммарный размер записей
+                в байтах UTF-8 (None — без ограничения).
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fragments ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_fragments_accessed_at ON fragments (accessed_at)"
+        )
+
+    def get(self, key: str) -> str | None:
+        """Получить фрагмент по ключу (None, если его нет)."""
+
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """Получить несколько фрагментов одним запросом и обновить время обращения."""
+
+        keys = list(keys)
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        rows = self._conn.execute(
+            f"SELECT key, value FROM fragments WHERE key IN ({placeholders})", keys
+        ).fetchall()
+        if rows:
+            self._conn.execute(
+                f"UPDATE fragments SET accessed_at = ? WHERE key IN ({placeholders})",
+                [time.time(), *keys],
+            )
+        return dict(rows)
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Сохранить фрагмент, вытеснив самые старые записи сверх лимитов.
+
+        Фрагмент больше max_bytes не сохраняется.
+        """
+
+        if self.max_bytes is not None and len(value.encode()) > self.max_bytes:
+            self._conn.execute("DELETE FROM fragments WHERE key = ?", (key,))
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO fragments (key, value, accessed_at) VALUES (?, ?, ?)",
+            (key, value, time.time()),
+        )
+        self._conn.execute(
+            "DELETE FROM fragments WHERE key IN ("
+            "SELECT key FROM fragments ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        if self.max_bytes is not None:
+            self._conn.execute(
+                "DELETE FROM fragments WHERE key IN (SELECT key FROM ("
+                "SELECT key, sum(length(CAST(value AS BLOB))) OVER ("
+                "ORDER BY accessed_at DESC, key) AS total FROM fragments) "
+                "WHERE total > ?)",
+                (self.max_bytes,),
+            )
+
+    def delete_matching(self, fragment: str) -> None:
+        """Удалить записи, ключ которых содержит подстроку fragment."""
+
+        self._conn.execute("DELETE FROM fragments WHERE instr(key, ?) > 0", (fragment,))
+
+
+class FragmentCache:
+    """
+    Кэш отрендеренных фрагментов HTML.
+
+    Ключ фрагмента содержит версии изменений (см. backend.crud.versions), от которых
+    зависит его содержимое, поэтому после записи в БД старый ключ больше не
+    запрашивается. invalidate() дополнительно удаляет такие записи из хранилища.
+    """
+
+    def __init__(self, store):
+        """
+        Args:
+            store (MemoryLRUStore | SQLiteStore): Хранилище фрагментов.
+        """
+        self.store = store
+
+    def get(self, key: str) -> str | None:
+        """Получить фрагмент по ключу (None, если его нет)."""
+
+        return self.store.get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """Получить несколько фрагментов: {ключ: html} только для найденных."""
+
+        return self.store.get_many(keys)
+
+    def set(self, key: str, value: str) -> None:
+        """Сохранить отрендеренный фрагмент."""
+
+        self.store.set(key, value)
+
+    def invalidate(self, scope: str) -> None:
+        """
+        Удалить все фрагменты, зависящие от области изменений.
+
+        Args:
+            scope (str): Ключ области (например, "team:5").
+        """
+
+        self.store.delete_matching(f"|{scope}=")
+
+
+def fragment_key(name: str, versions: dict[str, int], *parts) -> str:
+    """
+    Построить ключ фрагмента.
+
+    Args:
+        name (str): Имя фрагмента (например, "meeting_list").
+        versions (dict[str, int]): Версии областей, от которых зависит фрагмент.
+        *parts: Прочие параметры, влияющие на содержимое (пользователь, месяц и т.п.).
+
+    Returns:
+        str: Ключ вида "meeting_list|3|team:5=12|user:3=4".
+    """
+
+    scoped = [f"{scope}={version}" for scope, version in sorted(versions.items())]
+    return "|".join([name, *map(str, parts), *scoped])
+
+
+def create_store():
+    """
+    Создать хранилище фрагментов по настройкам FRAGMENT_CACHE_*.
+
+    Returns:
+        MemoryLRUStore | SQLiteStore: Хранилище фрагментов.
+
+    Raises:
+        ValueError: Если указан неизвестный тип хранилища.
+    """
+
+    if settings.FRAGMENT_CACHE_BACKEND == "memory":
+        return MemoryLRUStore(
+            settings.FRAGMENT_CACHE_MAX_ENTRIES, settings.FRAGMENT_CACHE_MAX_BYTES
+        )
+    if settings.FRAGMENT_CACHE_BACKEND == "sqlite":
+        return SQLiteStore(
+            settings.FRAGMENT_CACHE_PATH,
+            settings.FRAGMENT_CACHE_MAX_ENTRIES,
+            settings.FRAGMENT_CACHE_MAX_BYTES,
+        )
+    raise ValueError(f"Unknown fragment cache backend: {settings.FRAGMENT_CACHE_BACKEND}")
+
+
+fragment_cache = FragmentCache(create_store())
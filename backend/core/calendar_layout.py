@@ -0,0 +1,139 @@
+from calendar import Calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+
+# Календарь всегда начинается с понедельника.
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+_calendar = Calendar(firstweekday=0)
+
+
+@dataclass(frozen=True, slots=True)
+class DayCell:
+    """Ячейка сетки месяца."""
+
+    date: date
+    key: str
+    day: int
+    in_month: bool
+
+
+@dataclass(frozen=True, slots=True)
+class WeekRow:
+    """Строка сетки месяца: неделя с понедельника по воскресенье."""
+
+    iso_year: int
+    number: int
+    cells: tuple[DayCell, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class MonthGrid:
+    """
+    Неизменяемый "скелет" месяца: недели, ячейки и ISO-ключи дней.
+
+    Общий для всех запросов; события по дням накладываются на него
+    при выдаче (см. days), а не копируются в ячейки.
+    """
+
+    year: int
+    month: int
+    start: date
+    end: date
+    weeks: tuple[WeekRow, ...]
+    keys: tuple[str, ...]
+
+    def key_for(self, day: date) -> str:
+        """
+        Получить ISO-ключ дня месяца без форматирования строки.
+
+        Args:
+            day (date): Дата внутри месяца.
+
+        Returns:
+            str: Ключ вида "YYYY-MM-DD" (тот же объект строки, что в сетке).
+        """
+
+        return self.keys[day.day - 1]
+
+    def days(self, buckets: dict[str, list]) -> dict[str, list]:
+        """
+        Разложить события по всем дням месяца.
+
+        Args:
+            buckets (dict[str, list]): События, сгруппированные по ISO-ключу дня.
+
+        Returns:
+            dict[str, list]: Все дни месяца по порядку; у дней без событий —
+            общий пустой кортеж.
+        """
+
+        return {key: buckets.get(key, ()) for key in self.keys}
+
+
+@lru_cache(maxsize=256)
+def month_grid(year: int, month: int) -> MonthGrid:
+    """
+    Построить (и закэшировать) сетку месяца.
+
+    Args:
+        year (int): Год.
+        month (int): Месяц (1–12).
+
+    Returns:
+        MonthGrid: Сетка из 4–6 недель. Ячейки соседних месяцев помечены
+        in_month=False; номера недель — по ISO 8601.
+
+    Raises:
+        ValueError: Если месяц вне диапазона 1–12.
+    """
+
+    if not (1 <= month <= 12):
+        raise ValueError("Month must be 1-12")
+
+    weeks = []
+    keys = []
+    for week in _calendar.monthdatescalendar(year, month):
+        cells = []
+        for day in week:
+            in_month = day.month == month
+            key = day.isoformat()
+            if in_month:
+                keys.append(key)
+            cells.append(DayCell(date=day, key=key, day=day.day, in_month=in_month))
+        iso_year, number, _ = week[0].isocalendar()
+        weeks.append(WeekRow(iso_year=iso_year, number=number, cells=tuple(cells)))
+
+    start = date(year, month, 1)
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return MonthGrid(
+        year=year,
+        month=month,
+        start=start,
+        end=end,
+        weeks=tuple(weeks),
+        keys=tuple(keys),
+    )
+
+
+@lru_cache(maxsize=256)
+def day_keys(start: date, days: int) -> tuple[str, ...]:
+    """
+    Получить (и закэшировать) ISO-ключи дней подряд, начиная с start.
+
+    Args:
+        start (date): Первый день.
+        days (int): Количество дней.
+
+    Returns:
+        tuple[str, ...]: Ключи вида "YYYY-MM-DD".
+    """
+
+    return tuple((start + timedelta(days=offset)).isoformat() for offset in range(days))
+
+
+def week_start(day: date) -> date:
+    """Получить понедельник недели, в которую попадает day."""
+
+    return day - timedelta(days=day.weekday())
@@ -6,6 +6,29 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    TEMPLATE_CACHE_DIR: str | None = None
+    TEMPLATE_AUTO_RELOAD: bool = False
+    FRAGMENT_CACHE_BACKEND: str = "memory"
+    FRAGMENT_CACHE_PATH: str = "./data/fragment_cache.sqlite3"
+    FRAGMENT_CACHE_MAX_ENTRIES: int = 1024
+    FRAGMENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    JOBS_ENABLED: bool = True
+    JOB_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL: float = 5.0
+    JOB_SHUTDOWN_TIMEOUT: float = 10.0
+    REMINDERS_ENABLED: bool = True
+    REMINDER_TASK_LEAD_MINUTES: int = 1440
+    REMINDER_MEETING_LEAD_MINUTES: int = 15
+    REMINDER_SINK: str = "log"
+    REMINDER_WEBHOOK_URL: str | None = None
+    REMINDER_SMTP_HOST: str = "localhost"
+    REMINDER_SMTP_PORT: int = 1025
+    REMINDER_SMTP_SENDER: str = "reminders@localhost"
+    EVENT_TRANSPORT: str = "local"
+    EVENT_BROKER_SOCKET: str = "./data/events.sock"
+    EVENT_QUEUE_SIZE: int = 100
+    EVENT_KEEPALIVE_SECONDS: float = 15.0
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,211 @@
+import abc
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import uuid
+from collections import deque
+from backend.core.config import settings
+from backend.core.events import EventBus, EventTransport
+
+logger = logging.getLogger(__name__)
+
+# Сколько исходящих событий транспорт держит, пока нет соединения
+# (при переполнении отбрасываются самые старые).
+OUTBOX_SIZE = 10_000
+
+# Пауза перед повторным подключением (в секундах).
+RECONNECT_DELAY = 1.0
+
+# Предел буфера записи брокера на одного получателя: события для процесса,
+# который не успевает читать, отбрасываются, а не копятся в памяти брокера.
+BROKER_WRITE_BUFFER_LIMIT = 1 << 20
+
+# Канал LISTEN/NOTIFY PostgreSQL.
+POSTGRES_CHANNEL = "team_events"
+
+
+class _QueuedTransport(abc.ABC):
+    """Общая часть транспортов: очередь исходящих событий и цикл переподключения."""
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self._bus: EventBus | None = None
+        self._outbox: deque[str] = deque(maxlen=OUTBOX_SIZE)
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def start(self, bus: EventBus) -> None:
+        self._bus = bus
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, team_id: int, event: dict) -> None:
+        message = {"origin": self.origin, "team_id": team_id, "event": event}
+        self._outbox.append(json.dumps(message, separators=(",", ":")))
+        self._ready.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def _receive(self, message: str) -> None:
+        """Передать подписчикам процесса событие, пришедшее от другого процесса."""
+
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        if data.get("origin") != self.origin:
+            self._bus.deliver(data["team_id"], data["event"])
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._connection()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("%s disconnected: %s", type(self).__name__, e)
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    @abc.abstractmethod
+    async def _connection(self) -> None:
+        """Одно подключение: обмен событиями до разрыва соединения (исключения)."""
+
+
+class UnixSocketTransport(_QueuedTransport):
+    """
+    Обмен событиями через локальный брокер (python -m backend.cli.event_broker):
+    процесс отправляет свои события в Unix-сокет и получает события остальных.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+    async def _connection(self) -> None:
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        try:
+            tasks = {
+                asyncio.create_task(self._read(reader)),
+                asyncio.create_task(self._write(writer)),
+            }
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in done:
+                task.result()
+        finally:
+            writer.close()
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        async for line in reader:
+            self._receive(line.decode())
+        raise ConnectionError("broker closed the connection")
+
+    async def _write(self, writer: asyncio.StreamWriter) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self._outbox:
+                writer.write(self._outbox.popleft().encode() + b"\n")
+            await writer.drain()
+
+
+class PostgresNotifyTransport(_QueuedTransport):
+    """Обмен событиями через LISTEN/NOTIFY PostgreSQL (отдельное соединение asyncpg)."""
+
+    def __init__(self, dsn: str, channel: str = POSTGRES_CHANNEL):
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+
+    async def _connection(self) -> None:
+        import asyncpg
+
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            await connection.add_listener(
+                self.channel, lambda *args: self._receive(args[-1])
+            )
+            while not connection.is_closed():
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._ready.wait(), RECONNECT_DELAY * 5)
+                self._ready.clear()
+                while self._outbox:
+                    await connection.execute(
+                        "SELECT pg_notify($1, $2)", self.channel, self._outbox[0]
+                    )
+                    self._outbox.popleft()
+            raise ConnectionError("connection closed")
+        finally:
+            await connection.close()
+
+
+class EventBroker:
+    """
+    Брокер событий для UnixSocketTransport: каждая строка, полученная от
+    одного процесса, пересылается всем остальным подключённым процессам.
+
+    Брокер не ждёт медленных получателей: если буфер записи получателя
+    больше BROKER_WRITE_BUFFER_LIMIT, события для него отбрасываются.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def serve(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        server = await asyncio.start_unix_server(self._handle, self.path)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers.add(writer)
+        try:
+            async for line in reader:
+                for other in list(self._writers):
+                    if other is writer or other.is_closing():
+                        continue
+                    if other.transport.get_write_buffer_size() > BROKER_WRITE_BUFFER_LIMIT:
+                        continue
+                    other.write(line)
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+def create_event_transport() -> EventTransport | None:
+    """
+    Транспорт событий между процессами из настроек (EVENT_TRANSPORT).
+
+    Returns:
+        EventTransport | None: None для local — события только внутри процесса.
+
+    Raises:
+        ValueError: Если транспорт неизвестен.
+    """
+
+    if settings.EVENT_TRANSPORT == "local":
+        return None
+    if settings.EVENT_TRANSPORT == "unix":
+        return UnixSocketTransport(settings.EVENT_BROKER_SOCKET)
+    if settings.EVENT_TRANSPORT == "postgres":
+        return PostgresNotifyTransport(
+            settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
+        )
+    raise ValueError(f"Unknown event transport {settings.EVENT_TRANSPORT!r}")
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Protocol
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Ключ в session.info: события, которые публикуются после commit.
+EVENTS_KEY = "team_events"
+
+
+class Subscription:
+    """
+    Очередь событий одного подписчика (клиента потока событий команды).
+
+    Очередь ограничена: если клиент читает медленнее, чем приходят события,
+    самые старые отбрасываются, а перед следующим событием клиент получает
+    {"type": "overflow", "dropped": n} — сигнал перечитать данные целиком.
+    """
+
+    def __init__(self, team_id: int, maxsize: int):
+        self.team_id = team_id
+        self.dropped = 0
+        self._events: deque[dict] = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def put(self, event: dict) -> None:
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+        self._ready.set()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """
+        Следующее событие.
+
+        Returns:
+            dict | None: Событие или None, если за timeout секунд событий
+            не было или подписка закрыта.
+        """
+
+        while not self._events and not self._closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            return {"type": "overflow", "dropped": dropped}
+        if not self._events:
+            return None
+        return self._events.popleft()
+
+
+class EventTransport(Protocol):
+    """
+    Доставка событий между процессами приложения.
+
+    send вызывается для каждого события, опубликованного в этом процессе;
+    события других процессов транспорт передаёт в bus.deliver.
+    """
+
+    async def start(self, bus: "EventBus") -> None: ...
+
+    def send(self, team_id: int, event: dict) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class EventBus:
+    """
+    Шина событий команд внутри процесса: публикация и подписка по team_id.
+
+    Публикация не блокируется медленными подписчиками (см. Subscription).
+    С транспортом (см. backend.core.event_transports) события доходят и до
+    подписчиков других процессов.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.transport: EventTransport | None = None
+        self._subscriptions: dict[int, set[Subscription]] = {}
+
+    def subscribe(self, team_id: int) -> Subscription:
+        subscription = Subscription(team_id, self.queue_size)
+        self._subscriptions.setdefault(team_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+        subscribers = self._subscriptions.get(subscription.team_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[subscription.team_id]
+
+    def subscriber_count(self, team_id: int) -> int:
+        return len(self._subscriptions.get(team_id, ()))
+
+    def publish(self, team_id: int, event: dict) -> None:
+        """Разослать событие подписчикам команды в этом и (через транспорт) других процессах."""
+
+        self.deliver(team_id, event)
+        if self.transport is not None:
+            self.transport.send(team_id, event)
+
+    def deliver(self, team_id: int, event: dict) -> None:
+        """Разослать событие подписчикам команды в этом процессе."""
+
+        for subscription in self._subscriptions.get(team_id, ()):
+            subscription.put(event)
+
+    async def start(self, transport: EventTransport | None) -> None:
+        """Подключить транспорт между процессами (None — только этот процесс)."""
+
+        self.transport = transport
+        if transport is not None:
+            await transport.start(self)
+
+    async def stop(self) -> None:
+        """Отключить транспорт и закрыть все подписки."""
+
+        transport, self.transport = self.transport, None
+        if transport is not None:
+            await transport.stop()
+        for subscribers in list(self._subscriptions.values()):
+            for subscription in list(subscribers):
+                self.unsubscribe(subscription)
+
+
+def record_team_event(session, team_id: int | None, event: dict) -> None:
+    """
+    Запомнить событие команды для публикации после commit (без commit).
+
+    Вызывается CRUD-функциями в транзакции изменения: событие уходит
+    подписчикам, только если изменение зафиксировано.
+
+    Args:
+        session: Сессия SQLAlchemy (AsyncSession или Session).
+        team_id (int | None): Команда, которой адресовано событие.
+        event (dict): Событие, например {"type": "task", "id": 5, "deleted": False}.
+    """
+
+    if team_id is not None:
+        session.info.setdefault(EVENTS_KEY, []).append((team_id, event))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    for team_id, team_event in session.info.pop(EVENTS_KEY, ()):
+        event_bus.publish(team_id, team_event)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(EVENTS_KEY, None)
+
+
+event_bus = EventBus(settings.EVENT_QUEUE_SIZE)
@@ -0,0 +1,126 @@
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+PRODID = "-//management_system//Calendar feed//RU"
+
+# Максимальная длина строки iCalendar в октетах (RFC 5545, 3.1).
+MAX_LINE_OCTETS = 75
+
+
+def escape_text(value: str) -> str:
+    """Экранировать значение типа TEXT (RFC 5545, 3.3.11)."""
+
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """
+    Свернуть строку до 75 октетов (RFC 5545, 3.1), не разрывая символы UTF-8.
+
+    Args:
+        line (str): Строка свойства без завершающего CRLF.
+
+    Returns:
+        str: Строка (возможно, из нескольких физических строк) с CRLF в конце.
+    """
+
+    if len(line.encode()) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+
+    parts = []
+    current = ""
+    size = 0
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        char_size = len(char.encode())
+        if size + char_size > limit:
+            parts.append(current)
+            current, size = "", 0
+            limit = MAX_LINE_OCTETS - 1  # продолжение начинается с пробела
+        current += char
+        size += char_size
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_local(value: datetime) -> str:
+    """Дата-время без часового пояса ("плавающее" время, как хранится в БД)."""
+
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def format_utc(value: datetime) -> str:
+    """Дата-время в UTC; значения без часового пояса считаются UTC."""
+
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name: str) -> str:
+    """
+    Начало календаря (VCALENDAR) с названием для клиентских приложений.
+
+    Args:
+        name (str): Название календаря.
+
+    Returns:
+        str: Строки заголовка с CRLF.
+    """
+
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ]
+    return "".join(fold_line(line) for line in lines)
+
+
+CALENDAR_FOOTER = "END:VCALENDAR\r\n"
+
+
+def render_event(event: Mapping, domain: str = "management-system") -> str:
+    """
+    Отрисовать событие календаря как VEVENT.
+
+    Args:
+        event (Mapping): Событие с полями id, type, start, title и
+            необязательными end, updated_at, rrule, exdates, recurrence_id
+            (см. crud.event_calendar). Серия отрисовывается с RRULE и EXDATE,
+            перенесённое повторение — с тем же UID и RECURRENCE-ID.
+        domain (str): Домен для глобально уникального UID.
+
+    Returns:
+        str: Компонент VEVENT с CRLF.
+    """
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event['type']}-{event['id']}@{domain}",
+        f"DTSTART:{format_local(event['start'])}",
+    ]
+    if event["type"] == "meeting" and event.get("end"):
+        lines.append(f"DTEND:{format_local(event['end'])}")
+    if event.get("recurrence_id"):
+        lines.append(f"RECURRENCE-ID:{format_local(event['recurrence_id'])}")
+    elif event.get("rrule"):
+        lines.append(f"RRULE:{event['rrule']}")
+        lines.extend(
+            f"EXDATE:{format_local(exdate)}" for exdate in event.get("exdates") or ()
+        )
+    updated_at = event.get("updated_at") or datetime.now(timezone.utc)
+    lines.append(f"DTSTAMP:{format_utc(updated_at)}")
+    lines.append(f"LAST-MODIFIED:{format_utc(updated_at)}")
+    lines.append(f"SUMMARY:{escape_text(event['title'])}")
+    lines.append("END:VEVENT")
+    return "".join(fold_line(line) for line in lines)
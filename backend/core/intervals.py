@@ -0,0 +1,85 @@
+from bisect import bisect_left
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+Interval = tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """
+    Объединить пересекающиеся и смежные интервалы.
+
+    Args:
+        intervals (Iterable[Interval]): Полуинтервалы [start, end) в любом порядке.
+
+    Returns:
+        list[Interval]: Непересекающиеся интервалы, отсортированные по началу.
+    """
+
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def overlaps_any(merged: list[Interval], start: datetime, end: datetime) -> bool:
+    """
+    Проверить, пересекает ли [start, end) хотя бы один интервал (за O(log n)).
+
+    Args:
+        merged (list[Interval]): Результат merge_intervals().
+        start (datetime): Начало проверяемого интервала.
+        end (datetime): Конец проверяемого интервала.
+
+    Returns:
+        bool: True, если есть пересечение.
+    """
+
+    # Интервалы, начинающиеся раньше end, — merged[:index]; из них самый
+    # поздний конец у последнего, так как интервалы не пересекаются.
+    index = bisect_left(merged, (end,))
+    return index > 0 and merged[index - 1][1] > start
+
+
+def busy_histogram(
+    intervals_by_member: Iterable[Iterable[Interval]],
+    start: datetime,
+    bucket: timedelta,
+    buckets: int,
+) -> list[int]:
+    """
+    Посчитать, сколько участников заняты в каждом интервале сетки.
+
+    Участник считается занятым в интервале сетки, если хотя бы одна его
+    встреча пересекает этот интервал. Подсчёт выполняется разностным
+    массивом: на каждый отрезок занятости — две записи, затем один проход
+    префиксных сумм (itertools.accumulate), без перебора интервалов сетки
+    для каждой встречи.
+
+    Args:
+        intervals_by_member (Iterable[Iterable[Interval]]): Встречи каждого
+            участника (в любом порядке, пересечения допускаются).
+        start (datetime): Начало сетки.
+        bucket (timedelta): Длина интервала сетки.
+        buckets (int): Количество интервалов сетки.
+
+    Returns:
+        list[int]: Количество занятых участников для каждого интервала сетки.
+    """
+
+    diff = [0] * (buckets + 1)
+    for intervals in intervals_by_member:
+        covered = 0  # интервалы сетки [0, covered) уже учтены для участника
+        for busy_start, busy_end in merge_intervals(intervals):
+            first = max(covered, (busy_start - start) // bucket)
+            last = min(buckets, -((start - busy_end) // bucket))
+            if first < last:
+                diff[first] += 1
+                diff[last] -= 1
+                covered = last
+    return list(accumulate(diff[:buckets]))
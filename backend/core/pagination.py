@@ -0,0 +1,55 @@
+import base64
+import json
+from datetime import datetime
+
+# Заголовок ответа с курсором следующей страницы (keyset-пагинация).
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    """
+    Закодировать ключ последней записи страницы в непрозрачный курсор.
+
+    Args:
+        *values: Значения ключа сортировки (str, int, datetime или None).
+
+    Returns:
+        str: Курсор (base64url без выравнивания).
+    """
+
+    data = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """
+    Разобрать курсор, выданный encode_cursor().
+
+    Args:
+        cursor (str): Курсор из параметра запроса.
+        *types (type): Ожидаемые типы значений ключа (str, int или datetime).
+
+    Returns:
+        tuple: Значения ключа сортировки.
+
+    Raises:
+        ValueError: Если курсор повреждён или не соответствует типам.
+    """
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(data, list) or len(data) != len(types):
+        raise ValueError("Invalid cursor")
+
+    values = []
+    for value, expected in zip(data, types):
+        if expected is datetime and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError("Invalid cursor")
+        values.append(value)
+    return tuple(values)
@@ -0,0 +1,115 @@
+import re
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from typing import Any
+
+# Разделители слов в имени и email: "ivan.petrov@example.com" находится
+# и по "ivan", и по "petrov", и по "example".
+WORD_SEPARATORS = re.compile(r"[\s._@+-]+")
+
+
+def index_keys(*texts: str | None) -> set[str]:
+    """
+    Ключи поиска для строк: каждая строка целиком и каждое её слово (casefold).
+
+    Args:
+        *texts (str | None): Строки (email, полное имя); None пропускаются.
+
+    Returns:
+        set[str]: Непустые ключи.
+    """
+
+    keys = set()
+    for text in texts:
+        if not text:
+            continue
+        text = text.casefold().strip()
+        keys.add(text)
+        keys.update(WORD_SEPARATORS.split(text))
+    keys.discard("")
+    return keys
+
+
+class PrefixIndex:
+    """
+    Индекс для поиска по префиксу: отсортированный массив пар (ключ, id).
+
+    Поиск — bisect до первого ключа не меньше префикса и проход вперёд,
+    пока ключи начинаются с префикса: O(log n + k). Добавление и удаление
+    элемента — insort/bisect по его ключам, без перестроения индекса.
+    """
+
+    def __init__(self):
+        self._entries: list[tuple[str, int]] = []
+        self._keys: dict[int, set[str]] = {}
+        self._items: dict[int, Any] = {}
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[int, Any, set[str]]]) -> "PrefixIndex":
+        """
+        Построить индекс одной сортировкой.
+
+        Args:
+            items (Iterable[tuple[int, Any, set[str]]]): Тройки (id, значение, ключи).
+
+        Returns:
+            PrefixIndex: Заполненный индекс.
+        """
+
+        index = cls()
+        for item_id, item, keys in items:
+            index._items[item_id] = item
+            index._keys[item_id] = keys
+            index._entries.extend((key, item_id) for key in keys)
+        index._entries.sort()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._items
+
+    def add(self, item_id: int, item: Any, keys: set[str]) -> None:
+        """Добавить элемент или заменить существующий с тем же id."""
+
+        self.remove(item_id)
+        self._items[item_id] = item
+        self._keys[item_id] = keys
+        for key in keys:
+            insort(self._entries, (key, item_id))
+
+    def remove(self, item_id: int) -> None:
+        """Удалить элемент (если он есть)."""
+
+        keys = self._keys.pop(item_id, None)
+        if keys is None:
+            return
+        del self._items[item_id]
+        for key in keys:
+            position = bisect_left(self._entries, (key, item_id))
+            del self._entries[position]
+
+    def search(self, prefix: str, limit: int) -> list[Any]:
+        """
+        Найти элементы, у которых какой-либо ключ начинается с prefix.
+
+        Args:
+            prefix (str): Префикс (сравнивается после casefold).
+            limit (int): Максимальное число результатов.
+
+        Returns:
+            list[Any]: Значения элементов в порядке совпавших ключей, без повторов.
+        """
+
+        prefix = prefix.casefold().strip()
+        found: dict[int, Any] = {}
+        entries = self._entries
+        position = bisect_left(entries, (prefix,))
+        while position < len(entries) and len(found) < limit:
+            key, item_id = entries[position]
+            if not key.startswith(prefix):
+                break
+            found.setdefault(item_id, self._items[item_id])
+            position += 1
+        return list(found.values())
@@ -0,0 +1,207 @@
+import codecs
+import csv
+import enum
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import date
+
+# Самая длинная допустимая запись (в символах): защищает память от файла
+# без переводов строк.
+MAX_RECORD_CHARS = 1_000_000
+
+RECORD_FORMATS = ("csv", "ndjson")
+
+# Типы содержимого, по которым определяется формат загружаемого файла.
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+# Типы содержимого выгрузки по форматам.
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Размер порции потоковой выгрузки (в символах).
+EXPORT_CHUNK_SIZE = 65_536
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Декодировать поток байтов UTF-8 и разбить его на строки.
+
+    В памяти держится только текущий фрагмент и незавершённая строка.
+
+    Args:
+        chunks (AsyncIterable[bytes]): Фрагменты файла (тело запроса, файл).
+
+    Yields:
+        str: Строки вместе с символами перевода строки (последняя — без него).
+
+    Raises:
+        ValueError: Если строка длиннее MAX_RECORD_CHARS.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        text = tail + decoder.decode(chunk)
+        lines = text.splitlines(keepends=True)
+        tail = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        if len(tail) > MAX_RECORD_CHARS:
+            raise ValueError(f"Record longer than {MAX_RECORD_CHARS} characters")
+        for line in lines:
+            yield line
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def iter_csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[dict]:
+    """
+    Потоково разобрать CSV с заголовком в записи.
+
+    Поле в кавычках может содержать переводы строк: строки копятся, пока
+    число кавычек в записи не станет чётным.
+
+    Args:
+        chunks (AsyncIterable[bytes]): Фрагменты файла.
+
+    Yields:
+        dict: Запись {имя колонки: значение}; пустые строки пропускаются.
+
+    Raises:
+        ValueError: Если запись слишком длинная или CSV повреждён.
+    """
+
+    header = None
+    pending: list[str] = []
+    quotes = 0
+    async for line in iter_lines(chunks):
+        pending.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            if sum(map(len, pending)) > MAX_RECORD_CHARS:
+                raise ValueError(f"Record longer than {MAX_RECORD_CHARS} characters")
+            continue
+
+        try:
+            row = next(csv.reader(["".join(pending)]), [])
+        except csv.Error as e:
+            raise ValueError(f"Invalid CSV: {e}")
+        pending, quotes = [], 0
+        if not any(row):
+            continue
+        if header is None:
+            header = [name.strip() for name in row]
+            continue
+        yield dict(zip(header, row))
+
+    if pending:
+        raise ValueError("Invalid CSV: unterminated quoted field")
+
+
+async def iter_ndjson_records(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[dict | None]:
+    """
+    Потоково разобрать NDJSON (один JSON-объект на строку).
+
+    Args:
+        chunks (AsyncIterable[bytes]): Фрагменты файла.
+
+    Yields:
+        dict | None: Запись или None для строки, которая не является JSON-объектом
+        (такая строка считается ошибочной записью, разбор продолжается).
+        Пустые строки пропускаются.
+    """
+
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+
+def iter_records(
+    chunks: AsyncIterable[bytes], record_format: str
+) -> AsyncIterator[dict | None]:
+    """
+    Потоково разобрать записи файла в формате csv или ndjson.
+
+    Args:
+        chunks (AsyncIterable[bytes]): Фрагменты файла.
+        record_format (str): "csv" или "ndjson".
+
+    Returns:
+        AsyncIterator[dict | None]: Записи (None — запись, которую не удалось разобрать).
+
+    Raises:
+        ValueError: Если формат не поддерживается.
+    """
+
+    if record_format == "csv":
+        return iter_csv_records(chunks)
+    if record_format == "ndjson":
+        return iter_ndjson_records(chunks)
+    raise ValueError(f"Format must be one of {', '.join(RECORD_FORMATS)}")
+
+
+def _plain(value):
+    """Значение поля в виде, пригодном для JSON и CSV."""
+
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _render_record(record: dict, record_format: str, columns: list[str]) -> str:
+    """Одна строка выгрузки (с переводом строки в конце)."""
+
+    if record_format == "ndjson":
+        plain = {name: _plain(value) for name, value in record.items()}
+        return json.dumps(plain, ensure_ascii=False) + "\n"
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow([_plain(record.get(name)) for name in columns])
+    return buffer.getvalue()
+
+
+async def render_records(
+    records: AsyncIterable[dict], record_format: str, columns: list[str]
+) -> AsyncIterator[str]:
+    """
+    Потоково записать записи в формате csv или ndjson.
+
+    Args:
+        records (AsyncIterable[dict]): Записи.
+        record_format (str): "csv" или "ndjson".
+        columns (list[str]): Колонки CSV (заголовок и порядок полей);
+            для ndjson не используются — каждая запись выдаётся со своими полями.
+
+    Yields:
+        str: Части документа размером около EXPORT_CHUNK_SIZE.
+    """
+
+    chunk = []
+    chunk_size = 0
+    if record_format == "csv":
+        chunk.append(_render_record(dict(zip(columns, columns)), "csv", columns))
+    async for record in records:
+        line = _render_record(record, record_format, columns)
+        chunk.append(line)
+        chunk_size += len(line)
+        if chunk_size >= EXPORT_CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk, chunk_size = [], 0
+    if chunk:
+        yield "".join(chunk)
@@ -0,0 +1,252 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice, takewhile
+
+# Поддерживаемое подмножество RRULE (RFC 5545, 3.3.10):
+# FREQ=DAILY|WEEKLY|MONTHLY, INTERVAL, COUNT, UNTIL, BYDAY (только для WEEKLY).
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Ограничения разворачивания: серия с COUNT не длиннее MAX_COUNT,
+# за один вызов expand() — не больше MAX_OCCURRENCES повторений.
+MAX_COUNT = 1000
+MAX_OCCURRENCES = 1000
+
+# Сколько периодов подряд без повторений допускается (например, 31-е число
+# в коротких месяцах), прежде чем считать серию исчерпанной.
+MAX_EMPTY_PERIODS = 48
+
+
+@dataclass(frozen=True, slots=True)
+class RecurrenceRule:
+    """Разобранное правило повторения."""
+
+    freq: str
+    interval: int = 1
+    count: int | None = None
+    until: datetime | None = None
+    byday: tuple[int, ...] = ()
+
+    def __str__(self) -> str:
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%dT%H%M%S')}")
+        if self.byday:
+            parts.append("BYDAY=" + ",".join(WEEKDAY_CODES[day] for day in self.byday))
+        return ";".join(parts)
+
+
+def _parse_until(value: str) -> datetime:
+    """Разобрать UNTIL в формате YYYYMMDD или YYYYMMDDTHHMMSS[Z]."""
+
+    if len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d").replace(hour=23, minute=59, second=59)
+    if value.endswith("Z"):
+        parsed = datetime.strptime(value, "%Y%m%dT%H%M%SZ")
+        return parsed.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    return datetime.strptime(value, "%Y%m%dT%H%M%S")
+
+
+@lru_cache(maxsize=1024)
+def parse_rrule(value: str) -> RecurrenceRule:
+    """
+    Разобрать правило повторения.
+
+    Args:
+        value (str): Правило, например "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10"
+                     (префикс "RRULE:" допускается).
+
+    Returns:
+        RecurrenceRule: Разобранное правило.
+
+    Raises:
+        ValueError: Если правило не входит в поддерживаемое подмножество.
+    """
+
+    if value.upper().startswith("RRULE:"):
+        value = value[6:]
+    params = {}
+    for part in value.split(";"):
+        name, sep, param = part.partition("=")
+        if not sep or not param:
+            raise ValueError(f"Invalid RRULE part: {part!r}")
+        params[name.strip().upper()] = param.strip().upper()
+
+    unknown = set(params) - {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY"}
+    if unknown:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(unknown))}")
+
+    freq = params.get("FREQ")
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    if "COUNT" in params and "UNTIL" in params:
+        raise ValueError("COUNT and UNTIL cannot be used together")
+
+    try:
+        interval = int(params.get("INTERVAL", 1))
+        count = int(params["COUNT"]) if "COUNT" in params else None
+        until = _parse_until(params["UNTIL"]) if "UNTIL" in params else None
+    except ValueError:
+        raise ValueError("Invalid INTERVAL, COUNT or UNTIL value")
+    if interval < 1:
+        raise ValueError("INTERVAL must be positive")
+    if count is not None and not (1 <= count <= MAX_COUNT):
+        raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}")
+
+    byday = ()
+    if "BYDAY" in params:
+        if freq != "WEEKLY":
+            raise ValueError("BYDAY is supported only with FREQ=WEEKLY")
+        try:
+            byday = tuple(sorted({WEEKDAY_CODES.index(d) for d in params["BYDAY"].split(",")}))
+        except ValueError:
+            raise ValueError("BYDAY must list weekday codes MO..SU")
+
+    return RecurrenceRule(freq=freq, interval=interval, count=count, until=until, byday=byday)
+
+
+def _add_months(value: datetime, months: int) -> tuple[int, int]:
+    """Год и месяц через months месяцев после value."""
+
+    index = value.year * 12 + value.month - 1 + months
+    return index // 12, index % 12 + 1
+
+
+def _first_period(rule: RecurrenceRule, dtstart: datetime, after: datetime) -> int:
+    """Номер периода, с которого можно начинать перебор, чтобы не пропустить after."""
+
+    if rule.count is not None or after <= dtstart:
+        return 0
+    if rule.freq == "DAILY":
+        elapsed = (after - dtstart).days
+        return max(0, elapsed // rule.interval - 1)
+    if rule.freq == "WEEKLY":
+        elapsed = (after - dtstart).days // 7
+        return max(0, elapsed // rule.interval - 1)
+    months = (after.year - dtstart.year) * 12 + after.month - dtstart.month
+    return max(0, months // rule.interval - 1)
+
+
+def _period_candidates(
+    rule: RecurrenceRule, dtstart: datetime, period: int
+) -> list[datetime]:
+    """Кандидаты в повторения внутри одного периода (в порядке времени)."""
+
+    if rule.freq == "DAILY":
+        return [dtstart + timedelta(days=period * rule.interval)]
+    if rule.freq == "WEEKLY":
+        week_start = dtstart - timedelta(days=dtstart.weekday())
+        week_start += timedelta(weeks=period * rule.interval)
+        days = rule.byday or (dtstart.weekday(),)
+        return [week_start + timedelta(days=day) for day in days]
+    year, month = _add_months(dtstart, period * rule.interval)
+    try:
+        return [dtstart.replace(year=year, month=month)]
+    except ValueError:  # в этом месяце нет такого числа — повторение пропускается
+        return []
+
+
+def iter_occurrences(
+    rule: RecurrenceRule, dtstart: datetime, after: datetime | None = None
+) -> Iterator[datetime]:
+    """
+    Лениво перебрать начала повторений серии по возрастанию.
+
+    Args:
+        rule (RecurrenceRule): Правило повторения.
+        dtstart (datetime): Начало первого повторения.
+        after (datetime | None): Подсказка: повторения раньше этого момента не нужны.
+            Для правил без COUNT целые периоды до него пропускаются без перебора;
+            отдельные более ранние повторения всё же могут быть выданы.
+
+    Yields:
+        datetime: Начала повторений (первое — dtstart).
+    """
+
+    produced = 0
+    empty_periods = 0
+    period = _first_period(rule, dtstart, after) if after is not None else 0
+    while empty_periods < MAX_EMPTY_PERIODS:
+        candidates = [c for c in _period_candidates(rule, dtstart, period) if c >= dtstart]
+        empty_periods = 0 if candidates else empty_periods + 1
+        for candidate in candidates:
+            if rule.until is not None and candidate > rule.until:
+                return
+            yield candidate
+            produced += 1
+            if rule.count is not None and produced >= rule.count:
+                return
+        period += 1
+
+
+@lru_cache(maxsize=4096)
+def expand(
+    rrule: str, dtstart: datetime, window_start: datetime, window_end: datetime
+) -> tuple[datetime, ...]:
+    """
+    Развернуть (и закэшировать) повторения серии, начинающиеся в [window_start, window_end).
+
+    Args:
+        rrule (str): Правило повторения.
+        dtstart (datetime): Начало первого повторения.
+        window_start (datetime): Начало окна (включительно).
+        window_end (datetime): Конец окна (не включительно).
+
+    Returns:
+        tuple[datetime, ...]: Не больше MAX_OCCURRENCES начал повторений по возрастанию.
+    """
+
+    rule = parse_rrule(rrule)
+    starts = takewhile(
+        lambda start: start < window_end,
+        iter_occurrences(rule, dtstart, after=window_start),
+    )
+    in_window = (start for start in starts if start >= window_start)
+    return tuple(islice(in_window, MAX_OCCURRENCES))
+
+
+def is_occurrence(rrule: str, dtstart: datetime, moment: datetime) -> bool:
+    """
+    Проверить, начинается ли в moment одно из повторений серии.
+
+    Args:
+        rrule (str): Правило повторения.
+        dtstart (datetime): Начало первого повторения.
+        moment (datetime): Проверяемый момент.
+
+    Returns:
+        bool: True, если moment — начало повторения.
+    """
+
+    return moment in expand(rrule, dtstart, moment, moment + timedelta(microseconds=1))
+
+
+def series_end(rrule: str, dtstart: datetime, duration: timedelta) -> datetime | None:
+    """
+    Верхняя граница окончания последнего повторения серии.
+
+    Args:
+        rrule (str): Правило повторения.
+        dtstart (datetime): Начало первого повторения.
+        duration (timedelta): Длительность одного повторения.
+
+    Returns:
+        datetime | None: Момент, после которого повторений нет,
+        или None для бесконечной серии.
+    """
+
+    rule = parse_rrule(rrule)
+    if rule.until is not None:
+        return rule.until + duration
+    if rule.count is not None:
+        last = dtstart
+        for last in iter_occurrences(rule, dtstart):
+            pass
+        return last + duration
+    return None
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import smtplib
+from email.message import EmailMessage
+from functools import lru_cache
+from typing import Protocol
+import httpx
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Таймаут доставки одного напоминания (в секундах).
+SINK_TIMEOUT = 10.0
+
+ITEM_LABELS = {"task": "Task deadline", "meeting": "Meeting starts"}
+
+
+class ReminderSink(Protocol):
+    """
+    Способ доставки напоминаний.
+
+    reminder — словарь {"type": "task" | "meeting", "id", "title",
+    "at": дедлайн или начало встречи (ISO 8601), "recipients": [email, ...]}.
+    Исключение из send означает, что доставка не удалась и будет повторена.
+    """
+
+    async def send(self, reminder: dict) -> None: ...
+
+
+def reminder_text(reminder: dict) -> tuple[str, str]:
+    """Тема и текст напоминания."""
+
+    label = ITEM_LABELS.get(reminder["type"], "Event")
+    return (
+        f"Reminder: {reminder['title']}",
+        f"{label}: {reminder['at'].replace('T', ' ')}\n{reminder['title']}\n",
+    )
+
+
+class LogReminderSink:
+    """Запись напоминаний в журнал приложения (для разработки)."""
+
+    async def send(self, reminder: dict) -> None:
+        subject, _ = reminder_text(reminder)
+        logger.info(
+            "%s (%s %s at %s) -> %s",
+            subject,
+            reminder["type"],
+            reminder["id"],
+            reminder["at"],
+            ", ".join(reminder["recipients"]),
+        )
+
+
+class WebhookReminderSink:
+    """POST напоминания в формате JSON на заданный URL."""
+
+    def __init__(self, url: str, timeout: float = SINK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    async def send(self, reminder: dict) -> None:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.post(self.url, json=reminder)
+            response.raise_for_status()
+
+
+class SMTPReminderSink:
+    """
+    Письмо каждому получателю через SMTP-сервер без авторизации
+    (локальный релей или отладочный сервер, например python -m aiosmtpd -n).
+    """
+
+    def __init__(self, host: str, port: int, sender: str, timeout: float = SINK_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.timeout = timeout
+
+    async def send(self, reminder: dict) -> None:
+        if reminder["recipients"]:
+            await asyncio.to_thread(self._send, reminder)
+
+    def _send(self, reminder: dict) -> None:
+        subject, body = reminder_text(reminder)
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(reminder["recipients"])
+        message["Subject"] = subject
+        message.set_content(body)
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(message)
+
+
+@lru_cache(maxsize=1)
+def get_reminder_sink() -> ReminderSink:
+    """
+    Способ доставки из настроек (REMINDER_SINK: log, webhook или smtp).
+
+    Raises:
+        ValueError: Если способ неизвестен или для webhook не задан REMINDER_WEBHOOK_URL.
+    """
+
+    if settings.REMINDER_SINK == "log":
+        return LogReminderSink()
+    if settings.REMINDER_SINK == "webhook":
+        if not settings.REMINDER_WEBHOOK_URL:
+            raise ValueError("REMINDER_WEBHOOK_URL is required for the webhook sink")
+        return WebhookReminderSink(settings.REMINDER_WEBHOOK_URL)
+    if settings.REMINDER_SINK == "smtp":
+        return SMTPReminderSink(
+            settings.REMINDER_SMTP_HOST,
+            settings.REMINDER_SMTP_PORT,
+            settings.REMINDER_SMTP_SENDER,
+        )
+    raise ValueError(f"Unknown reminder sink {settings.REMINDER_SINK!r}")
@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta
+import hashlib
+import secrets
 from jose import jwt
 from passlib.context import CryptContext
 from backend.core.config import settings
@@ -54,3 +56,32 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     )
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def generate_token() -> str:
+    """
+    Генерирует случайный непредсказуемый токен (для ссылок на фиды и т.п.).
+
+    Returns:
+        str: URL-безопасный токен (256 бит случайных данных).
+    """
+
+    return secrets.token_urlsafe(32)
+
+
+def hash_token(token: str) -> str:
+    """
+    Хэширует токен для хранения в базе.
+
+    В отличие от паролей, токены длинные и случайные, поэтому достаточно
+    быстрого SHA-256: перебор по словарю к ним неприменим, а поиск по хэшу
+    выполняется обычным индексом.
+
+    Args:
+        token (str): Токен в открытом виде.
+
+    Returns:
+        str: Hex-строка SHA-256.
+    """
+
+    return hashlib.sha256(token.encode()).hexdigest()
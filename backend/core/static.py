@@ -0,0 +1,187 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import stat
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+from backend.middleware.compression import (
+    DEFAULT_COMPRESSIBLE_TYPES,
+    accepted_encodings,
+    brotli,
+)
+
+# Подкаталог внутри static, куда build_static складывает собранные файлы.
+BUILD_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Имя файла с хэшем содержимого: base.3f2a9c81d0e4.css
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.[^./]+(\.(br|gz))?$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Предварительно сжатые варианты в порядке предпочтения.
+PRECOMPRESSED_VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _is_compressible(path: str) -> bool:
+    """Проверить, относится ли файл к типам, которые имеет смысл сжимать."""
+
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type in DEFAULT_COMPRESSIBLE_TYPES
+
+
+def build_static(static_dir: str, minimum_size: int = 256) -> dict[str, str]:
+    """
+    Собрать статические файлы: хэшированные имена и предварительно сжатые варианты.
+
+    Для каждого исходного файла в static_dir создаётся копия с хэшем содержимого
+    в имени (static/dist/css/base.<hash>.css), а для сжимаемых типов — также
+    .gz и .br (если установлен brotli) рядом с ней. Соответствие исходных путей
+    собранным записывается в static/dist/manifest.json.
+
+    Args:
+        static_dir (str): Каталог с исходными статическими файлами.
+        minimum_size (int): Файлы меньше этого размера не сжимаются.
+
+    Returns:
+        dict[str, str]: Манифест {"css/base.css": "css/base.<hash>.css"}.
+    """
+
+    dist_dir = os.path.join(static_dir, BUILD_DIR)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+
+    manifest = {}
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist_dir)
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            rel_path = os.path.relpath(source, static_dir).replace(os.sep, "/")
+            with open(source, "rb") as f:
+                data = f.read()
+
+            stem, ext = os.path.splitext(rel_path)
+            hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+            target = os.path.join(dist_dir, *hashed.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(data)
+
+            if _is_compressible(rel_path) and len(data) >= minimum_size:
+                variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+                if brotli is not None:
+                    variants[".br"] = brotli.compress(data, quality=11)
+                for suffix, compressed in variants.items():
+                    if len(compressed) < len(data):
+                        with open(target + suffix, "wb") as f:
+                            f.write(compressed)
+
+            manifest[rel_path] = hashed
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+class StaticManifest:
+    """
+    Манифест собранной статики для построения URL в шаблонах.
+
+    Перечитывает manifest.json только при изменении файла. Если сборка не
+    выполнялась, URL указывают на исходные файлы.
+    """
+
+    def __init__(self, static_dir: str, url_prefix: str = "/static"):
+        """
+        Args:
+            static_dir (str): Каталог статических файлов.
+            url_prefix (str): Путь, по которому смонтирован StaticFiles.
+        """
+        self.path = os.path.join(static_dir, BUILD_DIR, MANIFEST_NAME)
+        self.url_prefix = url_prefix
+        self._mtime = None
+        self._entries: dict[str, str] = {}
+
+    def _entries_for_current_build(self) -> dict[str, str]:
+        """Вернуть записи манифеста, перечитав файл, если он изменился."""
+
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            self._mtime, self._entries = None, {}
+            return self._entries
+        if mtime != self._mtime:
+            with open(self.path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+            self._mtime = mtime
+        return self._entries
+
+    def url(self, path: str) -> str:
+        """
+        Получить URL статического файла (используется в шаблонах как static_url).
+
+        Args:
+            path (str): Путь относительно каталога static, например "css/base.css".
+
+        Returns:
+            str: URL хэшированной копии, если она собрана, иначе URL исходного файла.
+        """
+
+        hashed = self._entries_for_current_build().get(path)
+        if hashed:
+            return f"{self.url_prefix}/{BUILD_DIR}/{hashed}"
+        return f"{self.url_prefix}/{path}"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles, отдающий предварительно сжатые варианты (.br/.gz) файлов.
+
+    1. Если клиент принимает br/gzip и рядом с файлом лежит сжатый вариант,
+       отдаёт его с Content-Encoding и исходным Content-Type
+    2. Файлы с хэшем содержимого в имени отдаются с долгоживущим
+       Cache-Control: immutable
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """
+        Args:
+            path (str): Путь к файлу относительно каталога статики.
+            scope (Scope): ASGI scope запроса.
+
+        Returns:
+            Response: Ответ с файлом (или его сжатым вариантом).
+        """
+
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        response = None
+        if scope["method"] in ("GET", "HEAD") and _is_compressible(path):
+            for encoding, suffix in PRECOMPRESSED_VARIANTS:
+                if encoding not in encodings:
+                    continue
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, path + suffix
+                )
+                if stat_result and stat.S_ISREG(stat_result.st_mode):
+                    response = self.file_response(full_path, stat_result, scope)
+                    if response.status_code == 200:
+                        content_type = mimetypes.guess_type(path)[0]
+                        if content_type.startswith("text/"):
+                            content_type += "; charset=utf-8"
+                        response.headers["content-type"] = content_type
+                        response.headers["content-encoding"] = encoding
+                    response.headers.add_vary_header("Accept-Encoding")
+                    break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if HASHED_NAME_RE.search(path):
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,101 @@
+import os
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+class FragmentCacheExtension(Extension):
+    """
+    Тег шаблонов {% cache key %}...{% endcache %}.
+
+    Если фрагмент с таким ключом уже есть (в переданном view словаре fragments
+    или в environment.fragment_cache), тело блока не рендерится. Если ключ равен
+    None или кэш не подключён, блок рендерится как обычно.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        key = parser.parse_expression()
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method("_cache_support", [key, nodes.ContextReference()])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _cache_support(self, key, context, caller):
+        cache = self.environment.fragment_cache
+        if cache is None or key is None:
+            return caller()
+
+        value = (context.get("fragments") or {}).get(key)
+        if value is None:
+            value = cache.get(key)
+        if value is None:
+            value = str(caller())
+            cache.set(key, value)
+        return Markup(value)
+
+
+def create_templates(
+    directory: str,
+    cache_dir: str | None = None,
+    auto_reload: bool = False,
+    fragment_cache=None,
+) -> Jinja2Templates:
+    """
+    Создать Jinja2Templates с файловым кэшем байткода.
+
+    Скомпилированные шаблоны сохраняются в cache_dir, поэтому остальные воркеры
+    и перезапуски приложения загружают готовый байткод вместо разбора исходников.
+
+    Args:
+        directory (str): Каталог с шаблонами.
+        cache_dir (str | None): Каталог кэша байткода. None — системный временный
+            каталог Jinja (общий для всех процессов одного пользователя).
+        auto_reload (bool): Проверять ли изменения шаблонов на диске при каждом
+            обращении. В production должен быть выключен.
+        fragment_cache (FragmentCache | None): Кэш для тега {% cache %}.
+            None — теги рендерятся без кэширования.
+
+    Returns:
+        Jinja2Templates: Объект шаблонов поверх настроенного окружения.
+    """
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    env = Environment(
+        loader=FileSystemLoader(directory),
+        autoescape=True,
+        auto_reload=auto_reload,
+        bytecode_cache=FileSystemBytecodeCache(cache_dir),
+        cache_size=-1,
+        extensions=[FragmentCacheExtension],
+    )
+    env.fragment_cache = fragment_cache
+    return Jinja2Templates(env=env)
+
+
+def precompile_templates(templates: Jinja2Templates) -> int:
+    """
+    Скомпилировать все шаблоны заранее (вызывается при старте приложения).
+
+    Шаблоны попадают в кэш окружения и в кэш байткода, и первый запрос
+    к каждой странице не тратит время на компиляцию.
+
+    Args:
+        templates (Jinja2Templates): Объект шаблонов приложения.
+
+    Returns:
+        int: Количество скомпилированных шаблонов.
+    """
+
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.env.get_template(name)
+    return len(names)
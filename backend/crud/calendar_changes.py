@@ -0,0 +1,184 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, insert, or_
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from backend.models.calendar_change import CalendarChange
+from backend.core.events import record_team_event
+
+# Максимальная длительность транзакции, записывающей изменения календаря.
+# В PostgreSQL номер записи журнала выдаётся последовательностью до commit:
+# изменение с меньшим номером может зафиксироваться позже, чем больший номер
+# уже ушёл клиенту как курсор синхронизации. Поэтому синхронизация
+# перечитывает изменения, начатые за это время до изменения-курсора.
+SYNC_RESCAN_WINDOW = timedelta(minutes=5)
+
+
+def sync_rescan_window(db: AsyncSession) -> timedelta | None:
+    """
+    Окно повторного чтения журнала для get_changed_items.
+
+    Returns:
+        timedelta | None: SYNC_RESCAN_WINDOW для PostgreSQL; None для SQLite —
+        пишущие транзакции в нём выполняются по одной, и номера журнала
+        фиксируются по порядку.
+    """
+
+    if db.get_bind().dialect.name == "postgresql":
+        return SYNC_RESCAN_WINDOW
+    return None
+
+
+def record_calendar_change(
+    db: AsyncSession,
+    team_id: int,
+    item_type: str,
+    item_id: int,
+    deleted: bool = False,
+) -> None:
+    """
+    Записать изменение события календаря в журнал (без commit).
+
+    Вызывается CRUD-функциями в той же транзакции, что и само изменение,
+    поэтому журнал не расходится с данными. Подписчики потока событий команды
+    получают {"type": item_type, "id": item_id, "deleted": deleted} после commit.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды, к которой относится событие.
+        item_type (str): Тип события ("task" или "meeting").
+        item_id (int): Идентификатор задачи или встречи.
+        deleted (bool): True, если событие удалено.
+    """
+
+    db.add(
+        CalendarChange(
+            team_id=team_id, item_type=item_type, item_id=item_id, deleted=deleted
+        )
+    )
+    record_team_event(
+        db, team_id, {"type": item_type, "id": item_id, "deleted": deleted}
+    )
+
+
+async def record_calendar_changes(
+    db: AsyncSession,
+    team_id: int,
+    item_type: str,
+    item_ids: Iterable[int],
+    deleted: bool = False,
+) -> None:
+    """
+    Записать изменения многих событий одной командой INSERT (без commit).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды, к которой относятся события.
+        item_type (str): Тип событий ("task" или "meeting").
+        item_ids (Iterable[int]): Идентификаторы задач или встреч.
+        deleted (bool): True, если события удалены.
+    """
+
+    rows = [
+        {"team_id": team_id, "item_type": item_type, "item_id": item_id, "deleted": deleted}
+        for item_id in item_ids
+    ]
+    if rows:
+        await db.execute(insert(CalendarChange), rows)
+    for row in rows:
+        record_team_event(
+            db, team_id, {"type": item_type, "id": row["item_id"], "deleted": deleted}
+        )
+
+
+async def get_last_change_id(db: AsyncSession, team_id: int) -> int:
+    """
+    Получить номер последнего изменения календаря команды.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+
+    Returns:
+        int: Идентификатор последней записи журнала (0, если записей нет).
+    """
+
+    last_id = await db.scalar(
+        select(func.max(CalendarChange.id)).where(CalendarChange.team_id == team_id)
+    )
+    return last_id or 0
+
+
+async def get_changed_items(
+    db: AsyncSession,
+    team_id: int,
+    after_id: int,
+    up_to_id: int,
+    rescan_window: timedelta | None = None,
+) -> dict[str, set[int]]:
+    """
+    Получить события команды, изменённые в интервале журнала (after_id, up_to_id].
+
+    С rescan_window в ответ попадают и изменения с номером не больше after_id,
+    начатые не раньше чем за rescan_window до изменения after_id (changed_at —
+    время начала транзакции): так не теряются изменения, зафиксированные после
+    выдачи курсора (см. SYNC_RESCAN_WINDOW). Клиент получит такие события
+    повторно и просто перезапишет их.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+        after_id (int): Последнее изменение, уже известное клиенту.
+        up_to_id (int): Последнее изменение, включаемое в ответ.
+        rescan_window (timedelta | None): Окно повторного чтения
+            (см. sync_rescan_window); None — без него.
+
+    Returns:
+        dict[str, set[int]]: Идентификаторы изменённых задач ("task")
+        и встреч ("meeting").
+    """
+
+    condition = CalendarChange.id > after_id
+    if rescan_window is not None:
+        cursor_time = await db.scalar(
+            select(CalendarChange.changed_at).where(CalendarChange.id == after_id)
+        )
+        if cursor_time is not None:
+            condition = or_(
+                condition, CalendarChange.changed_at >= cursor_time - rescan_window
+            )
+
+    result = await db.execute(
+        select(CalendarChange.item_type, CalendarChange.item_id)
+        .where(
+            CalendarChange.team_id == team_id,
+            condition,
+            CalendarChange.id <= up_to_id,
+        )
+        .distinct()
+    )
+    changed = {"task": set(), "meeting": set()}
+    for item_type, item_id in result:
+        changed[item_type].add(item_id)
+    return changed
+
+
+async def get_last_change_time(db: AsyncSession, team_id: int) -> datetime | None:
+    """
+    Получить время последнего изменения календаря команды.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+
+    Returns:
+        datetime | None: Время последней записи журнала (UTC) или None,
+        если изменений не было.
+    """
+
+    return await db.scalar(
+        select(CalendarChange.changed_at)
+        .where(CalendarChange.team_id == team_id)
+        .order_by(CalendarChange.id.desc())
+        .limit(1)
+    )
@@ -6,6 +6,8 @@ from backend.models.evaluation import Evaluation
 from backend.models.task import Task, TaskStatus
 from backend.models.user import User
 from backend.schemas.evaluation import EvaluationCreate, AverageRatingResponse
+from backend.core.events import record_team_event
+from backend.crud.versions import bump_versions, team_scope
 
 
 async def create_evaluation(
@@ -60,6 +62,13 @@ async def create_evaluation(
         evaluated_user_id=task.assignee_id,
     )
     db.add(evaluation)
+    await db.flush()
+    record_team_event(
+        db,
+        task.team_id,
+        {"type": "evaluation", "id": evaluation.id, "task_id": task.id},
+    )
+    await bump_versions(db, team_scope(task.team_id))
     await db.commit()
     await db.refresh(evaluation)
     return evaluation
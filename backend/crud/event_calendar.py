@@ -1,13 +1,562 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import Date
-from datetime import datetime, time, date
-from calendar import monthrange
+from sqlalchemy import cast, literal, null, or_, union_all
+from collections.abc import AsyncIterator, Collection
+from datetime import datetime, time, date, timedelta
+from backend.core.calendar_layout import month_grid
+from backend.crud.calendar_changes import (
+    get_changed_items,
+    get_last_change_id,
+    sync_rescan_window,
+)
+from backend.crud.meeting import get_meeting_exceptions, series_occurrences
 from backend.models.task import Task
 from backend.models.meeting import Meeting, meeting_participants
+from backend.models.user import User
 
+# Колонки задач и встреч, из которых собираются поля CalendarEvent.
+# Порядок общий для обеих таблиц — запросы объединяются через UNION ALL,
+# отсутствующие у встреч поля выбираются как NULL.
+TASK_EVENT_COLUMNS = {
+    "title": Task.title,
+    "end": Task.deadline,
+    "assignee_id": Task.assignee_id,
+    "creator_id": Task.creator_id,
+    "updated_at": Task.updated_at,
+}
+MEETING_EVENT_COLUMNS = {
+    "title": Meeting.title,
+    "end": Meeting.end_time,
+    "creator_id": Meeting.creator_id,
+    "updated_at": Meeting.updated_at,
+    "rrule": Meeting.rrule,
+}
+EVENT_COLUMNS = {**TASK_EVENT_COLUMNS, **MEETING_EVENT_COLUMNS}
 
-async def get_events_for_day(db: AsyncSession, user_id: int, target_date: date) -> list:
+# Поля событий, которые попадают в календарный фид (ICS).
+FEED_EVENT_FIELDS = frozenset({"title", "end", "updated_at", "rrule"})
+
+# Префиксы заголовков событий по типу.
+EVENT_TITLE_PREFIXES = {"task": "Задача: ", "meeting": "Встреча: "}
+
+
+def _event_columns(
+    event_type: str, id_column, start, columns: dict, fields: set[str] | None
+) -> list:
+    """
+    Выбрать колонки для запроса событий под запрошенный набор полей.
+
+    Args:
+        event_type (str): Тип события ("task" или "meeting").
+        id_column: Колонка первичного ключа (выбирается всегда).
+        start: Колонка начала события (выбирается всегда — нужна для сортировки).
+        columns (dict): Соответствие полей CalendarEvent колонкам модели.
+        fields (set[str] | None): Запрошенные поля или None для всех.
+
+    Returns:
+        list: Список помеченных (label) колонок для select(...); набор и порядок
+        колонок одинаков для задач и встреч.
+    """
+
+    selected = [
+        id_column.label("id"),
+        literal(event_type).label("type"),
+        start.label("start"),
+    ]
+    for name, column in EVENT_COLUMNS.items():
+        if fields is None or name in fields:
+            if name in columns:
+                selected.append(columns[name].label(name))
+            else:
+                selected.append(cast(null(), column.type).label(name))
+    return selected
+
+
+def _event(row) -> dict:
+    """Собрать словарь события из строки объединённого запроса."""
+
+    event = dict(row._mapping)
+    if "title" in event:
+        event["title"] = EVENT_TITLE_PREFIXES[event["type"]] + event["title"]
+    return event
+
+
+def _occurrence(
+    series: dict,
+    original: datetime,
+    start: datetime,
+    end: datetime,
+    exception=None,
+) -> dict:
+    """
+    Собрать событие одного повторения серии встреч.
+
+    Args:
+        series (dict): Событие серии (см. _event).
+        original (datetime): Исходное начало повторения (recurrence_id).
+        start (datetime): Начало повторения (с учётом переноса).
+        end (datetime): Окончание повторения.
+        exception (MeetingException | None): Исключение, переопределяющее повторение.
+
+    Returns:
+        dict: Событие с полями серии, собственным временем и recurrence_id.
+    """
+
+    event = {**series, "start": start, "recurrence_id": original}
+    event.pop("exdates", None)
+    if "end" in series:
+        event["end"] = end
+    if exception is not None and exception.title and "title" in series:
+        event["title"] = EVENT_TITLE_PREFIXES["meeting"] + exception.title
+    return event
+
+
+def _series_overrides(event: dict, exceptions: dict) -> list[dict]:
+    """
+    Применить исключения к событию серии так, как это делает iCalendar.
+
+    Отменённые повторения добавляются в exdates события серии, перенесённые
+    или переименованные возвращаются отдельными событиями с recurrence_id.
+
+    Args:
+        event (dict): Событие (изменяется, если это серия с исключениями).
+        exceptions (dict): Исключения по идентификатору встречи
+            (см. get_meeting_exceptions).
+
+    Returns:
+        list[dict]: События изменённых повторений.
+    """
+
+    if event["type"] != "meeting" or not event.get("rrule"):
+        return []
+    series_exceptions = exceptions.get(event["id"])
+    if not series_exceptions:
+        return []
+
+    event["exdates"] = sorted(
+        original
+        for original, exception in series_exceptions.items()
+        if exception.cancelled
+    )
+    duration = event["end"] - event["start"] if event.get("end") else None
+    overrides = []
+    for original, exception in sorted(series_exceptions.items()):
+        if exception.cancelled:
+            continue
+        start = exception.start_time or original
+        end = exception.end_time or (start + duration if duration else None)
+        overrides.append(_occurrence(event, original, start, end, exception))
+    return overrides
+
+
+async def _with_series_overrides(db: AsyncSession, events: list) -> list:
+    """Добавить к событиям исключения их серий (см. _series_overrides)."""
+
+    series_ids = [
+        event["id"] for event in events if event["type"] == "meeting" and event.get("rrule")
+    ]
+    if not series_ids:
+        return events
+    exceptions = await get_meeting_exceptions(db, series_ids)
+    result = []
+    for event in events:
+        overrides = _series_overrides(event, exceptions)
+        result.append(event)
+        result.extend(overrides)
+    return result
+
+
+def _single_meeting_filters(start: datetime, end: datetime) -> tuple:
+    """Условия для разовых встреч, начинающихся в [start, end)."""
+
+    return (
+        Meeting.rrule.is_(None),
+        Meeting.start_time >= start,
+        Meeting.start_time < end,
+    )
+
+
+def _series_filters(start: datetime, end: datetime) -> tuple:
+    """Условия для серий встреч, повторения которых могут начинаться в [start, end)."""
+
+    return (
+        Meeting.rrule.isnot(None),
+        Meeting.start_time < end,
+        or_(Meeting.series_end.is_(None), Meeting.series_end > start),
+    )
+
+
+async def _expand_series(
+    db: AsyncSession, series_query, start: datetime, end: datetime
+) -> list:
+    """
+    Развернуть серии встреч в повторения, начинающиеся в [start, end).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        series_query (Select): Запрос серий со всеми колонками событий
+            (см. _user_meetings_query и _team_meetings_query).
+        start (datetime): Начало окна.
+        end (datetime): Конец окна (не включительно).
+
+    Returns:
+        list: События повторений (без сортировки).
+    """
+
+    rows = (await db.execute(series_query)).all()
+    if not rows:
+        return []
+    exceptions = await get_meeting_exceptions(db, [row.id for row in rows])
+
+    events = []
+    for row in rows:
+        series = _event(row)
+        for original, occurrence_start, occurrence_end, exception in series_occurrences(
+            row.start, row.end, row.rrule, exceptions.get(row.id, {}), start, end
+        ):
+            events.append(
+                _occurrence(series, original, occurrence_start, occurrence_end, exception)
+            )
+    return events
+
+
+def _merge_events(events: list, occurrences: list) -> list:
+    """Объединить отсортированные события с повторениями серий в порядке _ordered_events."""
+
+    if not occurrences:
+        return events
+    return sorted(
+        events + occurrences, key=lambda event: (event["start"], event["type"], event["id"])
+    )
+
+
+def _ordered_events(tasks, meetings):
+    """Объединить запросы задач и встреч (UNION ALL) с сортировкой по времени начала."""
+
+    events = union_all(tasks, meetings).subquery()
+    return select(events).order_by(events.c.start, events.c.type, events.c.id)
+
+
+def _user_events_query(
+    user_id: int,
+    fields: set[str] | None,
+    task_filters: tuple = (),
+    meeting_filters: tuple = (),
+):
+    """
+    Построить запрос событий пользователя (UNION ALL задач и встреч).
+
+    Задачи попадают в календарь по дедлайну (если пользователь — создатель
+    или исполнитель), встречи — по участию.
+
+    Args:
+        user_id (int): Идентификатор пользователя.
+        fields (set[str] | None): Поля CalendarEvent (см. get_events_for_day).
+        task_filters (tuple): Дополнительные условия для задач.
+        meeting_filters (tuple): Дополнительные условия для встреч.
+
+    Returns:
+        Select: Запрос, отсортированный по времени начала.
+    """
+
+    tasks = select(
+        *_event_columns("task", Task.id, Task.deadline, TASK_EVENT_COLUMNS, fields)
+    ).where(
+        ((Task.assignee_id == user_id) | (Task.creator_id == user_id)),
+        Task.deadline.isnot(None),
+        *task_filters,
+    )
+    return _ordered_events(tasks, _user_meetings_query(user_id, fields, meeting_filters))
+
+
+def _user_meetings_query(
+    user_id: int, fields: set[str] | None, meeting_filters: tuple = ()
+):
+    """Запрос встреч пользователя с колонками событий (см. _user_events_query)."""
+
+    return (
+        select(
+            *_event_columns(
+                "meeting",
+                Meeting.id,
+                Meeting.start_time,
+                MEETING_EVENT_COLUMNS,
+                fields,
+            )
+        )
+        .join(meeting_participants)
+        .where(meeting_participants.c.user_id == user_id, *meeting_filters)
+    )
+
+
+def _team_events_query(
+    team_id: int,
+    fields: set[str] | None,
+    task_filters: tuple = (),
+    meeting_filters: tuple = (),
+    member_ids: Collection[int] | None = None,
+):
+    """
+    Построить запрос событий команды (UNION ALL задач и встреч).
+
+    Встреча попадает в календарь команды, если в ней участвует хотя бы один
+    член команды; условие проверяется через EXISTS, поэтому общая встреча
+    нескольких участников возвращается один раз.
+
+    Args:
+        team_id (int): Идентификатор команды.
+        fields (set[str] | None): Поля CalendarEvent (см. get_events_for_day).
+        task_filters (tuple): Дополнительные условия для задач.
+        meeting_filters (tuple): Дополнительные условия для встреч.
+        member_ids (Collection[int] | None): Только события этих участников
+            (задачи, где они создатели или исполнители, и встречи с их участием).
+
+    Returns:
+        Select: Запрос, отсортированный по времени начала.
+    """
+
+    if member_ids is not None:
+        task_filters = (
+            *task_filters,
+            Task.assignee_id.in_(member_ids) | Task.creator_id.in_(member_ids),
+        )
+
+    tasks = select(
+        *_event_columns("task", Task.id, Task.deadline, TASK_EVENT_COLUMNS, fields)
+    ).where(Task.team_id == team_id, Task.deadline.isnot(None), *task_filters)
+    meetings = _team_meetings_query(team_id, fields, meeting_filters, member_ids)
+    return _ordered_events(tasks, meetings)
+
+
+def _team_meetings_query(
+    team_id: int,
+    fields: set[str] | None,
+    meeting_filters: tuple = (),
+    member_ids: Collection[int] | None = None,
+):
+    """Запрос встреч команды с колонками событий (см. _team_events_query)."""
+
+    participant_filters = ()
+    if member_ids is not None:
+        participant_filters = (meeting_participants.c.user_id.in_(member_ids),)
+
+    team_participant = (
+        select(meeting_participants.c.meeting_id)
+        .join(User, User.id == meeting_participants.c.user_id)
+        .where(
+            meeting_participants.c.meeting_id == Meeting.id,
+            User.team_id == team_id,
+            *participant_filters,
+        )
+    )
+    return select(
+        *_event_columns(
+            "meeting", Meeting.id, Meeting.start_time, MEETING_EVENT_COLUMNS, fields
+        )
+    ).where(team_participant.exists(), *meeting_filters)
+
+
+async def _select_events(
+    db: AsyncSession,
+    user_id: int,
+    fields: set[str] | None,
+    task_filters: tuple = (),
+    meeting_filters: tuple = (),
+) -> list:
+    """
+    Выбрать события пользователя одним запросом (см. _user_events_query).
+
+    Returns:
+        list: Список словарей с событиями, отсортированный по времени начала.
+    """
+
+    result = await db.execute(
+        _user_events_query(user_id, fields, task_filters, meeting_filters)
+    )
+    return [_event(row) for row in result]
+
+
+async def stream_feed_events(
+    db: AsyncSession,
+    user_id: int | None = None,
+    team_id: int | None = None,
+    batch_size: int = 500,
+) -> AsyncIterator[dict]:
+    """
+    Потоково выдать события для календарного фида пользователя или команды.
+
+    Строки читаются через серверный курсор порциями по batch_size,
+    поэтому память не зависит от длины истории.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        user_id (int | None): Пользователь (фид его событий).
+        team_id (int | None): Команда (фид событий всех её участников),
+            если user_id не указан.
+        batch_size (int): Размер порции чтения из курсора.
+
+    Yields:
+        dict: Событие с полями id, type, start, title, end, updated_at
+              в порядке времени начала. Серии встреч выдаются целиком
+              (rrule, exdates), за каждой — её перенесённые повторения
+              с recurrence_id (см. _series_overrides).
+    """
+
+    if user_id is not None:
+        query = _user_events_query(user_id, FEED_EVENT_FIELDS)
+        series = _user_meetings_query(user_id, None, (Meeting.rrule.isnot(None),))
+    else:
+        query = _team_events_query(team_id, FEED_EVENT_FIELDS)
+        series = _team_meetings_query(team_id, None, (Meeting.rrule.isnot(None),))
+    # Исключения серий невелики и читаются заранее: во время чтения
+    # из серверного курсора сессия занята.
+    exceptions = await get_meeting_exceptions(db, series.with_only_columns(Meeting.id))
+
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for row in result:
+        event = _event(row)
+        overrides = _series_overrides(event, exceptions)
+        yield event
+        for override in overrides:
+            yield override
+
+
+async def get_events_between(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    fields: set[str] | None = None,
+) -> list:
+    """
+    Получить события пользователя, начинающиеся в полуинтервале [start, end).
+
+    Серии встреч разворачиваются в повторения внутри интервала
+    (с recurrence_id); отменённые повторения пропускаются.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        user_id (int): Идентификатор пользователя.
+        start (datetime): Начало интервала (включительно).
+        end (datetime): Конец интервала (не включительно).
+        fields (set[str] | None): Поля CalendarEvent (см. get_events_for_day).
+
+    Returns:
+        list: Список словарей с событиями, отсортированный по времени начала.
+    """
+
+    events = await _select_events(
+        db,
+        user_id,
+        fields,
+        task_filters=(Task.deadline >= start, Task.deadline < end),
+        meeting_filters=_single_meeting_filters(start, end),
+    )
+    occurrences = await _expand_series(
+        db, _user_meetings_query(user_id, None, _series_filters(start, end)), start, end
+    )
+    return _merge_events(events, occurrences)
+
+
+async def get_calendar_changes(
+    db: AsyncSession,
+    user_id: int,
+    team_id: int | None,
+    since: int | None,
+    fields: set[str] | None = None,
+) -> tuple[int, bool, list, list]:
+    """
+    Получить изменения календаря пользователя для инкрементальной синхронизации.
+
+    Серии встреч возвращаются целиком (rrule, exdates и перенесённые
+    повторения с recurrence_id), без разворачивания.
+
+    Номер последнего изменения фиксируется до выборки событий: изменения,
+    сделанные во время запроса, придут при следующей синхронизации
+    (возможно, повторно — клиент просто перезапишет событие). Изменения,
+    зафиксированные позже изменений с большими номерами, подбираются окном
+    повторного чтения журнала (см. calendar_changes.SYNC_RESCAN_WINDOW).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        user_id (int): Идентификатор пользователя.
+        team_id (int | None): Идентификатор команды пользователя.
+        since (int | None): Последнее изменение, известное клиенту.
+            None (или номер из будущего) — полная синхронизация.
+        fields (set[str] | None): Поля CalendarEvent (см. get_events_for_day).
+
+    Returns:
+        tuple[int, bool, list, list]:
+            - номер последнего изменения (для следующего sync_token);
+            - True, если выполнена полная синхронизация;
+            - созданные или изменённые события, видимые пользователю;
+            - удалённые события (tombstones) {"type": ..., "id": ...} —
+              в том числе события, которые перестали относиться к пользователю.
+    """
+
+    if team_id is None:
+        return 0, True, [], []
+
+    if fields is not None:
+        fields = fields | {"rrule"}
+
+    cursor = await get_last_change_id(db, team_id)
+    if since is None or since > cursor:
+        events = await _select_events(db, user_id, fields)
+        return cursor, True, await _with_series_overrides(db, events), []
+
+    changed = await get_changed_items(
+        db, team_id, since, cursor, sync_rescan_window(db)
+    )
+    if not changed["task"] and not changed["meeting"]:
+        return cursor, False, [], []
+
+    events = await _select_events(
+        db,
+        user_id,
+        fields,
+        task_filters=(Task.id.in_(changed["task"]),),
+        meeting_filters=(Meeting.id.in_(changed["meeting"]),),
+    )
+    present = {(event["type"], event["id"]) for event in events}
+    deleted = [
+        {"type": item_type, "id": item_id}
+        for item_type, item_ids in changed.items()
+        for item_id in sorted(item_ids)
+        if (item_type, item_id) not in present
+    ]
+    return cursor, False, await _with_series_overrides(db, events), deleted
+
+
+def bucket_events(
+    events: list, first_day: date, keys: tuple[str, ...]
+) -> dict[str, list]:
+    """
+    Сгруппировать отсортированные события по дням.
+
+    Args:
+        events (list): События (см. get_events_between).
+        first_day (date): Первый день диапазона.
+        keys (tuple[str, ...]): ISO-ключи дней диапазона, начиная с first_day
+            (см. calendar_layout.day_keys и MonthGrid.keys).
+
+    Returns:
+        dict[str, list]: События по ISO-ключу дня (только дни с событиями).
+    """
+
+    buckets = {}
+    for event in events:
+        key = keys[(event["start"].date() - first_day).days]
+        buckets.setdefault(key, []).append(event)
+    return buckets
+
+
+async def get_events_for_day(
+    db: AsyncSession,
+    user_id: int,
+    target_date: date,
+    fields: set[str] | None = None,
+) -> list:
     """
     Получить список событий (задачи и встречи) для конкретного пользователя за указанный день.
 
@@ -15,6 +564,8 @@ async def get_events_for_day(db: AsyncSession, user_id: int, target_date: date)
         db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
         user_id (int): Идентификатор пользователя, для которого ищем события.
         target_date (date): Целевая дата (год-месяц-день).
+        fields (set[str] | None): Поля CalendarEvent, которые нужно выбрать из БД.
+            None — все поля. Колонки id и start выбираются всегда.
 
     Returns:
         list: Список словарей с событиями. Каждый словарь содержит:
@@ -25,60 +576,23 @@ async def get_events_for_day(db: AsyncSession, user_id: int, target_date: date)
             - end (datetime): время окончания
             - assignee_id (int, optional): назначенный исполнитель (для задач)
             - creator_id (int): создатель события
+            - updated_at (datetime): время последнего изменения
+            - rrule (str, optional): правило повторения серии встреч
+            - recurrence_id (datetime, optional): исходное начало повторения серии
     """
 
-    events = []
-
-    task_result = await db.execute(
-        select(Task).where(
-            ((Task.assignee_id == user_id) | (Task.creator_id == user_id))
-            & (Task.deadline.isnot(None))
-            & (Task.deadline.cast(Date) == target_date)
-        )
-    )
-    for task in task_result.scalars():
-        events.append(
-            {
-                "id": task.id,
-                "title": f"Задача: {task.title}",
-                "type": "task",
-                "start": task.deadline,
-                "end": task.deadline,
-                "assignee_id": task.assignee_id,
-                "creator_id": task.creator_id,
-            }
-        )
-
     start_of_day = datetime.combine(target_date, time.min)
-    end_of_day = datetime.combine(target_date, time.max)
-
-    meeting_result = await db.execute(
-        select(Meeting)
-        .join(meeting_participants)
-        .where(
-            meeting_participants.c.user_id == user_id,
-            Meeting.start_time >= start_of_day,
-            Meeting.start_time <= end_of_day,
-        )
+    return await get_events_between(
+        db, user_id, start_of_day, start_of_day + timedelta(days=1), fields
     )
-    for meeting in meeting_result.scalars():
-        events.append(
-            {
-                "id": meeting.id,
-                "title": f"Встреча: {meeting.title}",
-                "type": "meeting",
-                "start": meeting.start_time,
-                "end": meeting.end_time,
-                "creator_id": meeting.creator_id,
-            }
-        )
-
-    events.sort(key=lambda e: e["start"])
-    return events
 
 
 async def get_events_for_month(
-    db: AsyncSession, user_id: int, year: int, month: int
+    db: AsyncSession,
+    user_id: int,
+    year: int,
+    month: int,
+    fields: set[str] | None = None,
 ) -> dict[str, list]:
     """
     Получить все события пользователя за указанный месяц.
@@ -88,18 +602,71 @@ async def get_events_for_month(
         user_id (int): Идентификатор пользователя.
         year (int): Год.
         month (int): Месяц (1–12).
+        fields (set[str] | None): Поля CalendarEvent (см. get_events_for_day).
 
     Returns:
         dict[str, list]: Словарь, где ключ — дата в формате ISO (YYYY-MM-DD),
         а значение — список событий за этот день (см. get_events_for_day).
+        Содержит только дни с событиями; полный список дней даёт
+        month_grid(year, month).days(...).
+    """
+
+    grid = month_grid(year, month)
+    events = await get_events_between(
+        db,
+        user_id,
+        datetime.combine(grid.start, time.min),
+        datetime.combine(grid.end, time.min),
+        fields,
+    )
+    return bucket_events(events, grid.start, grid.keys)
+
+
+async def get_team_events_for_month(
+    db: AsyncSession,
+    team_id: int,
+    year: int,
+    month: int,
+    member_ids: Collection[int] | None = None,
+    fields: set[str] | None = None,
+) -> dict[str, list]:
     """
+    Получить события всех участников команды за указанный месяц.
+
+    Задачи и разовые встречи выбираются одним запросом, серии встреч —
+    вторым и разворачиваются в повторения месяца; встреча нескольких
+    участников команды возвращается один раз.
 
-    _, last_day = monthrange(year, month)
-    events_by_day = {}
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        team_id (int): Идентификатор команды.
+        year (int): Год.
+        month (int): Месяц (1–12).
+        member_ids (Collection[int] | None): Фильтр по участникам команды.
+            None — все участники.
+        fields (set[str] | None): Поля CalendarEvent (см. get_events_for_day).
 
-    for day in range(1, last_day + 1):
-        target_date = date(year, month, day)
-        key = target_date.isoformat()
-        events_by_day[key] = await get_events_for_day(db, user_id, target_date)
+    Returns:
+        dict[str, list]: События по ISO-ключу дня (см. get_events_for_month).
+    """
 
-    return events_by_day
+    grid = month_grid(year, month)
+    start = datetime.combine(grid.start, time.min)
+    end = datetime.combine(grid.end, time.min)
+    result = await db.execute(
+        _team_events_query(
+            team_id,
+            fields,
+            task_filters=(Task.deadline >= start, Task.deadline < end),
+            meeting_filters=_single_meeting_filters(start, end),
+            member_ids=member_ids,
+        )
+    )
+    occurrences = await _expand_series(
+        db,
+        _team_meetings_query(team_id, None, _series_filters(start, end), member_ids),
+        start,
+        end,
+    )
+    events = _merge_events([_event(row) for row in result], occurrences)
+    return bucket_events(events, grid.start, grid.keys)
@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.models.job import Job, JobStatus
+
+# Сколько раз по умолчанию выполняется задание, прежде чем перейти в failed.
+JOB_MAX_ATTEMPTS = 5
+
+# Задержка перед первым повтором; каждая следующая вдвое больше.
+JOB_RETRY_DELAY = timedelta(seconds=10)
+
+# На какой срок задание закрепляется за процессом при взятии в работу.
+JOB_LEASE = timedelta(minutes=5)
+
+# Сколько хранятся выполненные задания.
+JOB_RETENTION = timedelta(days=7)
+
+# Ключ в session.info: в транзакции поставлены задания (см. backend.jobs).
+JOBS_ENQUEUED_KEY = "jobs_enqueued"
+
+
+def enqueue_job(
+    db: AsyncSession,
+    name: str,
+    payload: dict | None = None,
+    run_at: datetime | None = None,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+) -> Job:
+    """
+    Поставить фоновое задание в очередь в текущей транзакции.
+
+    Задание не фиксируется само: оно сохраняется тем же commit, что и
+    изменение, которое его вызвало, и не появится, если транзакция откатится.
+    После commit обработчики заданий в процессе будятся сразу, не дожидаясь
+    очередного опроса таблицы.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        name (str): Имя обработчика (см. backend.jobs.job_handler).
+        payload (dict | None): Аргументы обработчика (JSON-сериализуемые).
+        run_at (datetime | None): Не раньше какого времени выполнить (None — сразу).
+        max_attempts (int): Сколько раз пытаться выполнить задание.
+
+    Returns:
+        Job: Добавленное в сессию задание.
+    """
+
+    job = Job(
+        name=name,
+        payload=payload or {},
+        status=JobStatus.QUEUED,
+        attempts=0,
+        max_attempts=max_attempts,
+        run_at=run_at or datetime.now(),
+    )
+    db.add(job)
+    db.info[JOBS_ENQUEUED_KEY] = True
+    return job
+
+
+async def claim_jobs(db: AsyncSession, limit: int, lease: timedelta = JOB_LEASE) -> list:
+    """
+    Взять в работу до limit готовых к выполнению заданий.
+
+    Одним UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING:
+    задание не достанется двум процессам, а в PostgreSQL процессы не ждут
+    друг друга на строках, которые уже забрал кто-то другой. Берутся задания
+    из очереди, у которых наступил run_at, и зависшие running с истёкшим
+    locked_until. Изменение фиксируется.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        limit (int): Максимальное число заданий.
+        lease (timedelta): Срок, на который задание закрепляется за процессом.
+
+    Returns:
+        list: Строки с полями id, name, payload, attempts, max_attempts.
+    """
+
+    now = datetime.now()
+    ready = (
+        select(Job.id)
+        .where(
+            or_(
+                and_(Job.status == JobStatus.QUEUED, Job.run_at <= now),
+                and_(Job.status == JobStatus.RUNNING, Job.locked_until < now),
+            )
+        )
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(Job)
+        .where(Job.id.in_(ready.scalar_subquery()))
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=Job.attempts + 1,
+            locked_until=now + lease,
+        )
+        .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+        .execution_options(synchronize_session=False)
+    )
+    jobs = result.all()
+    await db.commit()
+    return sorted(jobs, key=lambda job: job.id)
+
+
+async def complete_job(db: AsyncSession, job_id: int) -> None:
+    """Отметить задание выполненным и зафиксировать."""
+
+    await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+        .values(status=JobStatus.DONE, locked_until=None, finished_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def fail_job(db: AsyncSession, job, error: str) -> bool:
+    """
+    Записать ошибку задания: вернуть его в очередь с экспоненциальной задержкой
+    или, если попытки исчерпаны, перевести в failed.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        job: Строка из claim_jobs.
+        error (str): Текст ошибки.
+
+    Returns:
+        bool: True, если задание будет повторено.
+    """
+
+    now = datetime.now()
+    retry = job.attempts < job.max_attempts
+    if retry:
+        values = {
+            "status": JobStatus.QUEUED,
+            "run_at": now + JOB_RETRY_DELAY * 2 ** (job.attempts - 1),
+        }
+    else:
+        values = {"status": JobStatus.FAILED, "finished_at": now}
+    await db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == JobStatus.RUNNING)
+        .values(locked_until=None, last_error=error, **values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return retry
+
+
+async def prune_jobs(db: AsyncSession, retention: timedelta = JOB_RETENTION) -> int:
+    """
+    Удалить выполненные задания старше retention.
+
+    Returns:
+        int: Число удалённых заданий.
+    """
+
+    result = await db.execute(
+        delete(Job)
+        .where(Job.status == JobStatus.DONE, Job.run_at < datetime.now() - retention)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
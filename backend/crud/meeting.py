@@ -1,10 +1,208 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, delete, func, not_, or_, tuple_
+from sqlalchemy.orm import load_only, selectinload, raiseload
+from collections.abc import Collection, Iterator, Mapping
 from backend.models.meeting import Meeting, meeting_participants
-from backend.models.user import User
-from backend.schemas.meeting import MeetingCreate
-from datetime import datetime
+from backend.models.meeting_exception import MeetingException
+from backend.models.user import User, UserRole
+from backend.schemas.meeting import MeetingCreate, MeetingExceptionCreate
+from backend.core.intervals import merge_intervals, overlaps_any
+from backend.core.recurrence import expand, is_occurrence, parse_rrule, series_end
+from backend.crud.calendar_changes import record_calendar_change
+from backend.crud.reminders import sync_reminders
+from backend.crud.versions import bump_versions, team_scope
+from datetime import datetime, timedelta
+
+# Насколько вперёд проверяются конфликты бесконечной серии при её создании.
+SERIES_CONFLICT_HORIZON = timedelta(days=365)
+
+# Колонки, которые нужно выбрать из meetings для каждого поля MeetingOut.
+MEETING_FIELD_COLUMNS = {
+    "title": (Meeting.title,),
+    "start_time": (Meeting.start_time,),
+    "end_time": (Meeting.end_time,),
+    "rrule": (Meeting.rrule,),
+    "creator": (Meeting.creator_id,),
+}
+
+
+def meeting_load_options(fields: set[str] | None) -> list:
+    """
+    Построить опции загрузки встречи под запрошенный набор полей.
+
+    Args:
+        fields (set[str] | None): Поля MeetingOut, запрошенные клиентом.
+            None означает полный ответ: все колонки, создатель и участники.
+
+    Returns:
+        list: Опции для select(Meeting).options(...): узкий список колонок
+              и selectin-загрузка только запрошенных связей. Связи загружаются
+              отдельными запросами на всю выборку (по одному на связь),
+              а не на каждую встречу.
+    """
+
+    if fields is None:
+        return [selectinload(Meeting.creator), selectinload(Meeting.participants)]
+
+    columns = [Meeting.start_time]
+    for name in fields:
+        columns.extend(MEETING_FIELD_COLUMNS.get(name, ()))
+
+    options = [load_only(*columns)]
+    for name, relation in (
+        ("creator", Meeting.creator),
+        ("participants", Meeting.participants),
+    ):
+        options.append(
+            selectinload(relation) if name in fields else raiseload(relation)
+        )
+    return options
+
+
+async def get_meeting_exceptions(
+    db: AsyncSession, meeting_ids
+) -> dict[int, dict[datetime, MeetingException]]:
+    """
+    Получить исключения серий встреч одним запросом.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        meeting_ids: Идентификаторы серий (коллекция или подзапрос select).
+
+    Returns:
+        dict[int, dict[datetime, MeetingException]]: Исключения по идентификатору
+        встречи и исходному началу повторения.
+    """
+
+    result = await db.execute(
+        select(MeetingException).where(MeetingException.meeting_id.in_(meeting_ids))
+    )
+    exceptions = {}
+    for exception in result.scalars():
+        exceptions.setdefault(exception.meeting_id, {})[
+            exception.original_start
+        ] = exception
+    return exceptions
+
+
+def series_occurrences(
+    start_time: datetime,
+    end_time: datetime,
+    rrule: str,
+    exceptions: Mapping[datetime, MeetingException],
+    window_start: datetime,
+    window_end: datetime,
+    overlap: bool = False,
+) -> Iterator[tuple[datetime, datetime, datetime, MeetingException | None]]:
+    """
+    Развернуть повторения серии встреч в окне с учётом исключений.
+
+    Args:
+        start_time (datetime): Начало первого повторения.
+        end_time (datetime): Окончание первого повторения.
+        rrule (str): Правило повторения.
+        exceptions (Mapping[datetime, MeetingException]): Исключения серии
+            по исходному началу повторения (см. get_meeting_exceptions).
+        window_start (datetime): Начало окна.
+        window_end (datetime): Конец окна (не включительно).
+        overlap (bool): False — повторения, начинающиеся в окне;
+            True — все повторения, пересекающие окно.
+
+    Yields:
+        tuple: (исходное начало, начало, окончание, исключение или None);
+        отменённые повторения пропускаются, порядок не гарантируется.
+    """
+
+    duration = end_time - start_time
+    lookback = duration if overlap else timedelta(0)
+    for original in expand(rrule, start_time, window_start - lookback, window_end):
+        if original in exceptions:
+            continue
+        if overlap and original + duration <= window_start:
+            continue
+        yield original, original, original + duration, None
+
+    for original, exception in exceptions.items():
+        if exception.cancelled:
+            continue
+        start = exception.start_time or original
+        end = exception.end_time or start + duration
+        if overlap:
+            in_window = start < window_end and end > window_start
+        else:
+            in_window = window_start <= start < window_end
+        if in_window:
+            yield original, start, end, exception
+
+
+async def get_busy_intervals(
+    db: AsyncSession, user_ids: Collection[int], start: datetime, end: datetime
+) -> dict[int, list[tuple[datetime, datetime]]]:
+    """
+    Получить занятость пользователей во встречах, пересекающих интервал.
+
+    Разовые встречи и серии выбираются одним запросом; серии разворачиваются
+    только в пределах [start, end).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        user_ids (Collection[int]): Идентификаторы пользователей.
+        start (datetime): Начало интервала.
+        end (datetime): Конец интервала (не включительно).
+
+    Returns:
+        dict[int, list[tuple[datetime, datetime]]]: Интервалы встреч
+        (без объединения) по идентификатору пользователя; пользователи
+        без встреч в интервале отсутствуют.
+    """
+
+    result = await db.execute(
+        select(
+            meeting_participants.c.user_id,
+            Meeting.id,
+            Meeting.start_time,
+            Meeting.end_time,
+            Meeting.rrule,
+        )
+        .join(Meeting, Meeting.id == meeting_participants.c.meeting_id)
+        .where(
+            meeting_participants.c.user_id.in_(user_ids),
+            Meeting.start_time < end,
+            or_(
+                and_(Meeting.rrule.is_(None), Meeting.end_time > start),
+                and_(
+                    Meeting.rrule.isnot(None),
+                    or_(Meeting.series_end.is_(None), Meeting.series_end > start),
+                ),
+            ),
+        )
+    )
+    rows = result.all()
+
+    series_ids = {row.id for row in rows if row.rrule is not None}
+    exceptions = await get_meeting_exceptions(db, series_ids) if series_ids else {}
+
+    busy = {}
+    for row in rows:
+        if row.rrule is None:
+            intervals = [(row.start_time, row.end_time)]
+        else:
+            intervals = [
+                (occurrence_start, occurrence_end)
+                for _, occurrence_start, occurrence_end, _ in series_occurrences(
+                    row.start_time,
+                    row.end_time,
+                    row.rrule,
+                    exceptions.get(row.id, {}),
+                    start,
+                    end,
+                    overlap=True,
+                )
+            ]
+        if intervals:
+            busy.setdefault(row.user_id, []).extend(intervals)
+    return busy
 
 
 async def user_has_conflict(
@@ -20,36 +218,24 @@ async def user_has_conflict(
         end (datetime): Время окончания проверяемого интервала.
 
     Returns:
-        bool: True, если у пользователя есть встреча, пересекающаяся с указанным интервалом,
-              иначе False.
+        bool: True, если у пользователя есть встреча (в том числе повторение
+              серии), пересекающаяся с указанным интервалом, иначе False.
     """
 
-    query = (
-        select(Meeting)
-        .join(meeting_participants)
-        .where(
-            and_(
-                meeting_participants.c.user_id == user_id,
-                or_(
-                    and_(Meeting.start_time < end, Meeting.end_time > start),
-                    and_(Meeting.start_time == start, Meeting.end_time == end),
-                ),
-            )
-        )
-    )
-    result = await db.execute(query)
-    return result.scalars().first() is not None
+    busy = await get_busy_intervals(db, [user_id], start, end)
+    return user_id in busy
 
 
 async def create_meeting(
     db: AsyncSession, meeting_in: MeetingCreate, creator_id: int, team_id: int
 ) -> Meeting:
     """
-    Создать новую встречу для команды.
+    Создать новую встречу (или серию встреч) для команды.
 
     Args:
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
-        meeting_in (MeetingCreate): Входные данные для встречи (название, время, участники).
+        meeting_in (MeetingCreate): Входные данные для встречи (название, время,
+            участники и необязательное правило повторения).
         creator_id (int): Идентификатор создателя встречи.
         team_id (int): Идентификатор команды.
 
@@ -59,30 +245,57 @@ async def create_meeting(
     Raises:
         ValueError:
             - Если время окончания <= времени начала.
+            - Если правило повторения некорректно или начало встречи
+              не является его первым повторением.
             - Если участник не найден или не состоит в команде.
-            - Если у участника есть конфликтующая встреча.
+            - Если у участника есть конфликтующая встреча (для серии —
+              в ближайшие SERIES_CONFLICT_HORIZON).
     """
 
     if meeting_in.start_time >= meeting_in.end_time:
         raise ValueError("End time must be after start time")
 
-    participants = []
+    duration = meeting_in.end_time - meeting_in.start_time
+    rrule = None
+    series_end_at = None
+    starts = (meeting_in.start_time,)
+    if meeting_in.rrule:
+        rrule = str(parse_rrule(meeting_in.rrule))
+        if not is_occurrence(rrule, meeting_in.start_time, meeting_in.start_time):
+            raise ValueError("Start time must match the recurrence rule")
+        series_end_at = series_end(rrule, meeting_in.start_time, duration)
+        starts = expand(
+            rrule,
+            meeting_in.start_time,
+            meeting_in.start_time,
+            meeting_in.start_time + SERIES_CONFLICT_HORIZON,
+        )
+
+    result = await db.execute(
+        select(User.id).where(
+            User.id.in_(meeting_in.participant_ids), User.team_id == team_id
+        )
+    )
+    found = set(result.scalars())
     for user_id in meeting_in.participant_ids:
-        user = await db.get(User, user_id)
-        if not user or user.team_id != team_id:
+        if user_id not in found:
             raise ValueError(f"User {user_id} not in your team or not found")
-        participants.append(user)
+    participant_ids = list(dict.fromkeys(meeting_in.participant_ids))
 
-    for user in participants:
-        if await user_has_conflict(
-            db, user.id, meeting_in.start_time, meeting_in.end_time
-        ):
-            raise ValueError(f"User {user.id} has a conflicting meeting")
+    busy = await get_busy_intervals(
+        db, participant_ids, meeting_in.start_time, starts[-1] + duration
+    )
+    for user_id in participant_ids:
+        merged = merge_intervals(busy.get(user_id, ()))
+        if any(overlaps_any(merged, start, start + duration) for start in starts):
+            raise ValueError(f"User {user_id} has a conflicting meeting")
 
     meeting = Meeting(
         title=meeting_in.title,
         start_time=meeting_in.start_time,
         end_time=meeting_in.end_time,
+        rrule=rrule,
+        series_end=series_end_at,
         creator_id=creator_id,
     )
     db.add(meeting)
@@ -90,42 +303,183 @@ async def create_meeting(
     await db.refresh(meeting)
 
     stmt = meeting_participants.insert().values(
-        [{"meeting_id": meeting.id, "user_id": user.id} for user in participants]
+        [{"meeting_id": meeting.id, "user_id": user_id} for user_id in participant_ids]
     )
     await db.execute(stmt)
+    record_calendar_change(db, team_id, "meeting", meeting.id)
+    await sync_reminders(db, "meeting", [meeting.id])
+    await bump_versions(db, team_scope(team_id))
     await db.commit()
 
     return meeting
 
 
-async def get_user_meetings(db: AsyncSession, user_id: int) -> list[Meeting]:
+def _meeting_ends_after(moment: datetime):
+    """Условие: встреча (для серии — последнее повторение) заканчивается после moment."""
+
+    return or_(
+        and_(Meeting.rrule.is_(None), Meeting.end_time > moment),
+        and_(
+            Meeting.rrule.isnot(None),
+            or_(Meeting.series_end.is_(None), Meeting.series_end > moment),
+        ),
+    )
+
+
+async def get_user_meetings(
+    db: AsyncSession,
+    user_id: int,
+    fields: set[str] | None = None,
+    when: str = "all",
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+) -> list[Meeting]:
     """
-    Получить список всех встреч пользователя.
+    Получить список встреч пользователя.
+
+    Создатель и участники загружаются через selectinload, поэтому число
+    запросов не зависит от количества встреч.
 
     Args:
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
         user_id (int): Идентификатор пользователя.
+        fields (set[str] | None): Поля MeetingOut для частичной загрузки
+            (см. meeting_load_options).
+        when (str): "all" — все встречи, "upcoming" — ещё не закончившиеся
+            (по возрастанию начала), "past" — закончившиеся (по убыванию начала).
+        limit (int | None): Максимальное число встреч (None — без ограничения).
+        after (tuple[datetime, int] | None): Ключ (start_time, id) последней
+            встречи предыдущей страницы (keyset-пагинация).
 
     Returns:
         list[Meeting]: Список встреч, в которых участвует пользователь,
-                       отсортированный по времени начала.
+                       отсортированный по (start_time, id).
     """
 
-    result = await db.execute(
+    key = tuple_(Meeting.start_time, Meeting.id)
+    descending = when == "past"
+
+    query = (
         select(Meeting)
         .join(meeting_participants)
         .where(meeting_participants.c.user_id == user_id)
-        .order_by(Meeting.start_time)
+        .options(*meeting_load_options(fields))
     )
+    if when == "upcoming":
+        query = query.where(_meeting_ends_after(datetime.now()))
+    elif when == "past":
+        query = query.where(not_(_meeting_ends_after(datetime.now())))
+    if after is not None:
+        query = query.where(key < tuple_(*after) if descending else key > tuple_(*after))
+    if descending:
+        query = query.order_by(Meeting.start_time.desc(), Meeting.id.desc())
+    else:
+        query = query.order_by(Meeting.start_time, Meeting.id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    result = await db.execute(query)
     return result.scalars().all()
 
 
+def _manageable_by(user_id: int, team_id: int):
+    """
+    Условие: пользователь может управлять встречей (отменять, менять повторения).
+
+    Управлять встречей может её создатель или администратор команды
+    создателя; проверка выполняется в том же запросе, что и само действие.
+    """
+
+    team_members = select(User.id).where(User.team_id == team_id)
+    is_team_admin = (
+        select(User.id)
+        .where(
+            User.id == user_id,
+            User.team_id == team_id,
+            User.role == UserRole.ADMIN,
+        )
+        .exists()
+    )
+    return and_(
+        Meeting.creator_id.in_(team_members),
+        or_(Meeting.creator_id == user_id, is_team_admin),
+    )
+
+
+async def _get_manageable_meeting(
+    db: AsyncSession, meeting_id: int, user_id: int, team_id: int
+) -> Meeting | None:
+    """
+    Получить встречу, которой пользователь может управлять (см. _manageable_by).
+
+    Returns:
+        Meeting | None: Встреча или None, если она не найдена или нет прав.
+    """
+
+    result = await db.execute(
+        select(Meeting).where(Meeting.id == meeting_id, _manageable_by(user_id, team_id))
+    )
+    return result.scalar_one_or_none()
+
+
+async def delete_meetings(
+    db: AsyncSession, user_id: int, team_id: int, *filters
+) -> list[int]:
+    """
+    Удалить встречи, которыми пользователь может управлять, массовыми запросами.
+
+    Права проверяются в условии каждого запроса (см. _manageable_by): сначала массово
+    удаляются участники и исключения серий этих встреч (на них ссылаются
+    внешние ключи), затем сами встречи; идентификаторы удалённых встреч
+    возвращаются через RETURNING. Всё — в одной транзакции.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        user_id (int): Идентификатор пользователя, инициирующего удаление.
+        team_id (int): Идентификатор команды.
+        *filters: Условия отбора встреч.
+
+    Returns:
+        list[int]: Идентификаторы удалённых встреч (пустой, если удалять нечего).
+    """
+
+    conditions = (*filters, _manageable_by(user_id, team_id))
+    selected = select(Meeting.id).where(*conditions)
+    await db.execute(
+        meeting_participants.delete().where(
+            meeting_participants.c.meeting_id.in_(selected)
+        )
+    )
+    await db.execute(
+        delete(MeetingException)
+        .where(MeetingException.meeting_id.in_(selected))
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(
+        delete(Meeting)
+        .where(*conditions)
+        .returning(Meeting.id)
+        .execution_options(synchronize_session=False)
+    )
+    meeting_ids = list(result.scalars())
+    if not meeting_ids:
+        return []
+
+    for meeting_id in meeting_ids:
+        record_calendar_change(db, team_id, "meeting", meeting_id, deleted=True)
+    await bump_versions(db, team_scope(team_id))
+    await db.commit()
+    return meeting_ids
+
+
 async def delete_meeting(
     db: AsyncSession, meeting_id: int, user_id: int, team_id: int
 ) -> bool:
     """
     Удалить встречу по её идентификатору.
 
+    Для серии удаляются все повторения и исключения.
+
     Args:
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
         meeting_id (int): Идентификатор встречи.
@@ -141,20 +495,111 @@ async def delete_meeting(
         - Пользователь имеет роль "admin" в команде.
     """
 
-    meeting = await db.get(Meeting, meeting_id)
-    if not meeting:
-        return False
+    return bool(await delete_meetings(db, user_id, team_id, Meeting.id == meeting_id))
+
+
+async def cancel_meetings_in_range(
+    db: AsyncSession, user_id: int, team_id: int, start: datetime, end: datetime
+) -> list[int]:
+    """
+    Отменить все встречи пользователя, целиком лежащие в [start, end).
+
+    Отменяются встречи, созданные пользователем; серия отменяется, только
+    если все её повторения попадают в интервал (бесконечные серии не отменяются).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        user_id (int): Идентификатор пользователя.
+        team_id (int): Идентификатор команды.
+        start (datetime): Начало интервала.
+        end (datetime): Конец интервала (не включительно).
+
+    Returns:
+        list[int]: Идентификаторы отменённых встреч.
+    """
+
+    return await delete_meetings(
+        db,
+        user_id,
+        team_id,
+        Meeting.creator_id == user_id,
+        Meeting.start_time >= start,
+        or_(
+            and_(Meeting.rrule.is_(None), Meeting.end_time <= end),
+            and_(Meeting.rrule.isnot(None), Meeting.series_end <= end),
+        ),
+    )
+
+
+async def set_meeting_exception(
+    db: AsyncSession,
+    meeting_id: int,
+    exception_in: MeetingExceptionCreate,
+    user_id: int,
+    team_id: int,
+) -> MeetingException | None:
+    """
+    Отменить или перенести одно повторение серии встреч.
+
+    Повторное исключение для того же повторения заменяет предыдущее.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        meeting_id (int): Идентификатор серии.
+        exception_in (MeetingExceptionCreate): Исходное начало повторения
+            и его отмена или новые название и время.
+        user_id (int): Идентификатор пользователя, вносящего изменение.
+        team_id (int): Идентификатор команды.
 
-    creator = await db.get(User, meeting.creator_id)
-    if not creator or creator.team_id != team_id:
-        return False
+    Returns:
+        MeetingException | None: Сохранённое исключение или None, если серия
+        не найдена или у пользователя нет прав (см. delete_meeting).
 
-    user = await db.get(User, user_id)
-    if not user:
-        return False
+    Raises:
+        ValueError:
+            - Если встреча не повторяется или в occurrence_start нет повторения.
+            - Если новое время окончания <= времени начала или повторение
+              переносится раньше начала серии.
+    """
 
-    if user.id == meeting.creator_id or user.role == "admin":
-        await db.delete(meeting)
-        await db.commit()
-        return True
-    return False
+    meeting = await _get_manageable_meeting(db, meeting_id, user_id, team_id)
+    if meeting is None:
+        return None
+    if meeting.rrule is None:
+        raise ValueError("Meeting is not recurring")
+
+    original = exception_in.occurrence_start
+    if not is_occurrence(meeting.rrule, meeting.start_time, original):
+        raise ValueError("No occurrence starts at this time")
+
+    start = exception_in.start_time or original
+    end = exception_in.end_time or start + (meeting.end_time - meeting.start_time)
+    if start >= end:
+        raise ValueError("End time must be after start time")
+    if start < meeting.start_time:
+        raise ValueError("Occurrence cannot be moved before the series start")
+
+    result = await db.execute(
+        select(MeetingException).where(
+            MeetingException.meeting_id == meeting.id,
+            MeetingException.original_start == original,
+        )
+    )
+    exception = result.scalar_one_or_none()
+    if exception is None:
+        exception = MeetingException(meeting_id=meeting.id, original_start=original)
+        db.add(exception)
+    exception.cancelled = exception_in.cancelled
+    exception.title = exception_in.title
+    exception.start_time = exception_in.start_time
+    exception.end_time = exception_in.end_time
+
+    if meeting.series_end is not None and end > meeting.series_end:
+        meeting.series_end = end
+    meeting.updated_at = func.now()
+    record_calendar_change(db, team_id, "meeting", meeting.id)
+    await sync_reminders(db, "meeting", [meeting.id])
+    await bump_versions(db, team_scope(team_id))
+    await db.commit()
+    await db.refresh(exception)
+    return exception
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.core.prefix_index import PrefixIndex, index_keys
+from backend.models.user import User
+from backend.crud.versions import get_versions, members_scope
+
+# Сколько индексов команд держится в памяти процесса (LRU).
+MEMBER_INDEX_MAX_TEAMS = 256
+
+
+@dataclass
+class _TeamIndex:
+    version: int
+    index: PrefixIndex
+
+
+_team_indexes: OrderedDict[int, _TeamIndex] = OrderedDict()
+
+
+def _member_entry(user_id: int, email: str, full_name: str | None, role) -> tuple:
+    """Тройка (id, данные UserOut, ключи поиска) для PrefixIndex."""
+
+    member = {
+        "id": user_id,
+        "email": email,
+        "full_name": full_name,
+        "role": getattr(role, "value", role),
+    }
+    return user_id, member, index_keys(email, full_name)
+
+
+async def _get_team_index(db: AsyncSession, team_id: int) -> PrefixIndex:
+    """
+    Индекс участников команды: из памяти, если он соответствует версии
+    состава команды в БД, иначе — построенный заново одним запросом.
+    """
+
+    scope = members_scope(team_id)
+    version = (await get_versions(db, [scope]))[scope]
+    cached = _team_indexes.get(team_id)
+    if cached is not None and cached.version == version:
+        _team_indexes.move_to_end(team_id)
+        return cached.index
+
+    result = await db.execute(
+        select(User.id, User.email, User.full_name, User.role).where(
+            User.team_id == team_id
+        )
+    )
+    index = PrefixIndex.build(_member_entry(*row) for row in result)
+    _team_indexes[team_id] = _TeamIndex(version, index)
+    _team_indexes.move_to_end(team_id)
+    while len(_team_indexes) > MEMBER_INDEX_MAX_TEAMS:
+        _team_indexes.popitem(last=False)
+    return index
+
+
+async def search_team_members(
+    db: AsyncSession, team_id: int, prefix: str, limit: int = 10
+) -> list[dict]:
+    """
+    Найти участников команды по началу email, имени или любого их слова.
+
+    Поиск идёт по индексу в памяти процесса (см. PrefixIndex); к БД
+    выполняется только проверка версии состава команды.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+        prefix (str): Начало email, имени или фамилии.
+        limit (int): Максимальное число результатов.
+
+    Returns:
+        list[dict]: Участники в формате UserOut.
+    """
+
+    index = await _get_team_index(db, team_id)
+    return index.search(prefix, limit)
+
+
+def update_member_index(
+    team_id: int | None, users: Iterable = (), removed_ids: Iterable[int] = ()
+) -> None:
+    """
+    Применить изменение состава команды к индексу в памяти (вызывается после commit).
+
+    Изменение должно сопровождаться одним увеличением версии members_scope(team_id):
+    версия индекса увеличивается на один, и если её в БД увеличил кто-то ещё
+    (например, другой процесс), индекс будет построен заново при следующем поиске.
+
+    Args:
+        team_id (int | None): Команда, состав которой изменился.
+        users (Iterable): Добавленные или изменённые участники — объекты User
+            или строки запроса с полями id, email, full_name, role.
+        removed_ids (Iterable[int]): Идентификаторы удалённых из команды участников.
+    """
+
+    cached = _team_indexes.get(team_id)
+    if cached is None:
+        return
+    for user_id in removed_ids:
+        cached.index.remove(user_id)
+    for user in users:
+        cached.index.add(*_member_entry(user.id, user.email, user.full_name, user.role))
+    cached.version += 1
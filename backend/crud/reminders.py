@@ -0,0 +1,297 @@
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from heapq import merge
+from itertools import islice
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.core.config import settings
+from backend.core.recurrence import iter_occurrences, parse_rrule
+from backend.crud.jobs import enqueue_job
+from backend.models.meeting import Meeting, meeting_participants
+from backend.models.meeting_exception import MeetingException
+from backend.models.task import Task, TaskStatus
+from backend.models.user import User
+
+# За сколько до дедлайна задачи и до начала встречи отправляется напоминание.
+TASK_REMINDER_LEAD = timedelta(minutes=settings.REMINDER_TASK_LEAD_MINUTES)
+MEETING_REMINDER_LEAD = timedelta(minutes=settings.REMINDER_MEETING_LEAD_MINUTES)
+
+REMINDER_MODELS = {"task": Task, "meeting": Meeting}
+
+# Ключ в session.info: напоминания, изменённые в транзакции (см. backend.reminders).
+REMINDERS_CHANGED_KEY = "reminders_changed"
+
+
+def task_reminder_due(
+    deadline: datetime | None,
+    status: TaskStatus | None,
+    sent_for: datetime | None,
+    now: datetime,
+) -> datetime | None:
+    """
+    Время напоминания о дедлайне задачи.
+
+    Напоминания нет, если дедлайна нет или он прошёл, задача выполнена или
+    об этом дедлайне уже напомнили. Если до дедлайна меньше TASK_REMINDER_LEAD,
+    время напоминания уже наступило, и оно отправляется сразу.
+    """
+
+    if deadline is None or deadline <= now or deadline == sent_for:
+        return None
+    if status == TaskStatus.DONE:
+        return None
+    return deadline - TASK_REMINDER_LEAD
+
+
+def next_occurrence(
+    start_time: datetime,
+    rrule: str | None,
+    exceptions: dict[datetime, MeetingException],
+    after: datetime,
+) -> datetime | None:
+    """
+    Начало ближайшего повторения встречи позже after (с учётом отмен и переносов).
+
+    Args:
+        start_time (datetime): Начало встречи (первого повторения серии).
+        rrule (str | None): Правило повторения (None — одиночная встреча).
+        exceptions (dict[datetime, MeetingException]): Исключения серии
+            по исходному началу повторения.
+        after (datetime): Момент, после которого ищется повторение.
+
+    Returns:
+        datetime | None: Начало повторения или None, если повторений больше нет.
+    """
+
+    if rrule is None:
+        return start_time if start_time > after else None
+
+    starts = [
+        exception.start_time or original
+        for original, exception in exceptions.items()
+        if not exception.cancelled and (exception.start_time or original) > after
+    ]
+    for original in iter_occurrences(parse_rrule(rrule), start_time, after=after):
+        if original > after and original not in exceptions:
+            starts.append(original)
+            break
+    return min(starts, default=None)
+
+
+def meeting_reminder_due(
+    start_time: datetime,
+    rrule: str | None,
+    exceptions: dict[datetime, MeetingException],
+    sent_for: datetime | None,
+    now: datetime,
+) -> datetime | None:
+    """Время напоминания о ближайшем ещё не начавшемся повторении, о котором не напоминали."""
+
+    after = max(now, sent_for) if sent_for is not None else now
+    start = next_occurrence(start_time, rrule, exceptions, after)
+    return start - MEETING_REMINDER_LEAD if start is not None else None
+
+
+async def _meeting_exceptions(
+    db: AsyncSession, meeting_ids: Iterable[int]
+) -> dict[int, dict[datetime, MeetingException]]:
+    """Исключения серий одним запросом: {id встречи: {исходное начало: исключение}}."""
+
+    result = await db.execute(
+        select(MeetingException).where(MeetingException.meeting_id.in_(meeting_ids))
+    )
+    exceptions: dict[int, dict[datetime, MeetingException]] = {}
+    for exception in result.scalars():
+        exceptions.setdefault(exception.meeting_id, {})[exception.original_start] = exception
+    return exceptions
+
+
+async def sync_reminders(db: AsyncSession, item_type: str, item_ids: Iterable[int]) -> None:
+    """
+    Пересчитать next_reminder_at задач или встреч после их изменения (без commit).
+
+    Вызывается CRUD-функциями в той же транзакции, что и изменение (рядом с
+    record_calendar_change). После commit новые времена напоминаний передаются
+    планировщику процесса (см. backend.reminders) без перечитывания таблиц.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        item_type (str): "task" или "meeting".
+        item_ids (Iterable[int]): Идентификаторы созданных или изменённых записей.
+    """
+
+    item_ids = list(item_ids)
+    if not item_ids:
+        return
+    now = datetime.now()
+    model = REMINDER_MODELS[item_type]
+    changes = []
+    if item_type == "task":
+        result = await db.execute(
+            select(
+                Task.id,
+                Task.deadline,
+                Task.status,
+                Task.next_reminder_at,
+                Task.reminder_sent_for,
+            ).where(Task.id.in_(item_ids))
+        )
+        for row in result:
+            due = task_reminder_due(row.deadline, row.status, row.reminder_sent_for, now)
+            if due != row.next_reminder_at:
+                changes.append({"id": row.id, "next_reminder_at": due})
+    else:
+        result = await db.execute(
+            select(
+                Meeting.id,
+                Meeting.start_time,
+                Meeting.rrule,
+                Meeting.next_reminder_at,
+                Meeting.reminder_sent_for,
+            ).where(Meeting.id.in_(item_ids))
+        )
+        rows = result.all()
+        exceptions = await _meeting_exceptions(
+            db, [row.id for row in rows if row.rrule is not None]
+        )
+        for row in rows:
+            due = meeting_reminder_due(
+                row.start_time,
+                row.rrule,
+                exceptions.get(row.id, {}),
+                row.reminder_sent_for,
+                now,
+            )
+            if due != row.next_reminder_at:
+                changes.append({"id": row.id, "next_reminder_at": due})
+
+    if not changes:
+        return
+    await db.execute(update(model), changes)
+    db.info.setdefault(REMINDERS_CHANGED_KEY, []).extend(
+        (change["next_reminder_at"], item_type, change["id"])
+        for change in changes
+        if change["next_reminder_at"] is not None
+    )
+
+
+async def get_due_reminders(
+    db: AsyncSession, until: datetime, limit: int
+) -> list[tuple[datetime, str, int]]:
+    """
+    Ближайшие напоминания раньше until по индексу next_reminder_at.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        until (datetime): Граница (не включительно).
+        limit (int): Максимальное число напоминаний.
+
+    Returns:
+        list[tuple[datetime, str, int]]: (время, тип, id) по возрастанию
+        времени, при равном времени — по id.
+    """
+
+    per_type = []
+    for item_type, model in REMINDER_MODELS.items():
+        result = await db.execute(
+            select(model.next_reminder_at, model.id)
+            .where(model.next_reminder_at < until)
+            .order_by(model.next_reminder_at, model.id)
+            .limit(limit)
+        )
+        per_type.append([(due, item_type, item_id) for due, item_id in result])
+    return list(islice(merge(*per_type), limit))
+
+
+async def _task_reminder(db: AsyncSession, task_id: int, due: datetime):
+    result = await db.execute(
+        select(Task.title, Task.deadline, User.email)
+        .join(User, User.id == Task.assignee_id)
+        .where(Task.id == task_id, Task.next_reminder_at == due)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return row.title, row.deadline, None, [row.email]
+
+
+async def _meeting_reminder(db: AsyncSession, meeting_id: int, due: datetime):
+    result = await db.execute(
+        select(Meeting.title, Meeting.start_time, Meeting.rrule).where(
+            Meeting.id == meeting_id, Meeting.next_reminder_at == due
+        )
+    )
+    row = result.first()
+    if row is None:
+        return None
+    occurrence = due + MEETING_REMINDER_LEAD
+    exceptions = (await _meeting_exceptions(db, [meeting_id])).get(meeting_id, {})
+    following = next_occurrence(row.start_time, row.rrule, exceptions, occurrence)
+    next_due = following - MEETING_REMINDER_LEAD if following is not None else None
+    recipients = await db.execute(
+        select(User.email)
+        .join(meeting_participants, meeting_participants.c.user_id == User.id)
+        .where(meeting_participants.c.meeting_id == meeting_id)
+    )
+    return row.title, occurrence, next_due, list(recipients.scalars())
+
+
+async def claim_reminder(
+    db: AsyncSession, item_type: str, item_id: int, due: datetime
+) -> tuple[bool, datetime | None]:
+    """
+    Забрать напоминание для отправки и поставить задание на доставку (без commit).
+
+    Напоминание забирается условным UPDATE ... WHERE next_reminder_at = due:
+    если несколько процессов одновременно увидели одно и то же напоминание,
+    UPDATE изменит строку только у одного из них, и доставка поставится в
+    очередь один раз. next_reminder_at сдвигается на следующее повторение
+    встречи (для задачи — NULL), reminder_sent_for запоминает, о каком
+    дедлайне или повторении напомнили. updated_at не меняется: для календаря
+    это не изменение события.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        item_type (str): "task" или "meeting".
+        item_id (int): Идентификатор записи.
+        due (datetime): Время напоминания, которое видел планировщик.
+
+    Returns:
+        tuple[bool, datetime | None]: Забрано ли напоминание и время следующего
+        напоминания этой записи (None — его нет).
+    """
+
+    load = _task_reminder if item_type == "task" else _meeting_reminder
+    reminder = await load(db, item_id, due)
+    if reminder is None:
+        return False, None
+    title, at, next_due, recipients = reminder
+
+    model = REMINDER_MODELS[item_type]
+    claimed = await db.execute(
+        update(model)
+        .where(model.id == item_id, model.next_reminder_at == due)
+        .values(
+            next_reminder_at=next_due,
+            reminder_sent_for=at,
+            updated_at=model.updated_at,
+        )
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.first() is None:
+        return False, None
+
+    enqueue_job(
+        db,
+        "reminders.deliver",
+        {
+            "type": item_type,
+            "id": item_id,
+            "title": title,
+            "at": at.isoformat(),
+            "recipients": recipients,
+        },
+    )
+    return True, next_due
@@ -1,9 +1,65 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_
+from sqlalchemy import and_, column, func, insert, literal_column, table, tuple_, update
+from sqlalchemy.orm import load_only, selectinload, raiseload
 from backend.models.task import Task, TaskStatus
 from backend.models.comment import Comment
-from backend.schemas.task import TaskCreate
+from backend.models.user import User
+from backend.models.task_search import SEARCH_CONFIG, SEARCH_TABLE, SEARCH_VECTOR_COLUMN
+from backend.schemas.task import TaskBulkUpdateItem, TaskCreate
+from backend.core.events import record_team_event
+from backend.crud.calendar_changes import record_calendar_change, record_calendar_changes
+from backend.crud.reminders import sync_reminders
+from backend.crud.versions import bump_versions, team_scope
+import re
+
+# Колонки, которые нужно выбрать из tasks для каждого поля TaskOut.
+TASK_FIELD_COLUMNS = {
+    "title": (Task.title,),
+    "description": (Task.description,),
+    "deadline": (Task.deadline,),
+    "status": (Task.status,),
+    "creator": (Task.creator_id,),
+    "assignee": (Task.assignee_id,),
+}
+
+# Максимальное число слов в поисковом запросе.
+SEARCH_MAX_TERMS = 16
+
+# Веса полей в ранжировании SQLite (bm25): заголовок, описание, комментарии.
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def task_load_options(fields: set[str] | None) -> list:
+    """
+    Построить опции загрузки задачи под запрошенный набор полей.
+
+    Args:
+        fields (set[str] | None): Поля TaskOut, запрошенные клиентом.
+            None означает полный ответ (загрузка по умолчанию).
+
+    Returns:
+        list: Опции для select(Task).options(...): узкий список колонок,
+              selectin-загрузка только нужных связей, остальные связи не загружаются.
+    """
+
+    if fields is None:
+        return []
+
+    columns = [Task.team_id]
+    for name in fields:
+        columns.extend(TASK_FIELD_COLUMNS.get(name, ()))
+
+    options = [load_only(*columns), raiseload(Task.team), raiseload(Task.evaluations)]
+    for name, relation in (("creator", Task.creator), ("assignee", Task.assignee)):
+        options.append(
+            selectinload(relation) if name in fields else raiseload(relation)
+        )
+    if "comments" in fields:
+        options.append(selectinload(Task.comments).selectinload(Comment.author))
+    else:
+        options.append(raiseload(Task.comments))
+    return options
 
 
 async def create_task(
@@ -32,29 +88,38 @@ async def create_task(
         creator_id=creator_id,
     )
     db.add(task)
+    await db.flush()
+    record_calendar_change(db, team_id, "task", task.id)
+    await sync_reminders(db, "task", [task.id])
+    await bump_versions(db, team_scope(team_id))
     await db.commit()
     await db.refresh(task)
     return task
 
 
-async def get_task_by_id(db: AsyncSession, task_id: int) -> Task | None:
+async def get_task_by_id(
+    db: AsyncSession, task_id: int, fields: set[str] | None = None
+) -> Task | None:
     """
     Получить задачу по её идентификатору.
 
     Args:
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
         task_id (int): Идентификатор задачи.
+        fields (set[str] | None): Поля TaskOut для частичной загрузки (см. task_load_options).
 
     Returns:
         Task | None: Объект задачи, если найден, иначе None.
     """
 
-    result = await db.execute(select(Task).where(Task.id == task_id))
+    result = await db.execute(
+        select(Task).where(Task.id == task_id).options(*task_load_options(fields))
+    )
     return result.scalars().first()
 
 
 async def get_tasks_for_user(
-    db: AsyncSession, user_id: int, team_id: int
+    db: AsyncSession, user_id: int, team_id: int, fields: set[str] | None = None
 ) -> list[Task]:
     """
     Получить список задач для пользователя в рамках команды.
@@ -63,6 +128,7 @@ async def get_tasks_for_user(
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
         user_id (int): Идентификатор пользователя.
         team_id (int): Идентификатор команды.
+        fields (set[str] | None): Поля TaskOut для частичной загрузки (см. task_load_options).
 
     Returns:
         list[Task]: Список задач, где пользователь является создателем или исполнителем.
@@ -72,11 +138,102 @@ async def get_tasks_for_user(
         select(Task).where(
             and_(Task.team_id == team_id, Task.creator_id == user_id)
             | and_(Task.team_id == team_id, Task.assignee_id == user_id)
-        )
+        ).options(*task_load_options(fields))
     )
     return result.scalars().all()
 
 
+def search_terms(query: str) -> list[str]:
+    """
+    Разбить поисковый запрос на слова.
+
+    Args:
+        query (str): Строка запроса пользователя.
+
+    Returns:
+        list[str]: Не больше SEARCH_MAX_TERMS слов в нижнем регистре.
+
+    Raises:
+        ValueError: Если в запросе нет ни одного слова.
+    """
+
+    terms = re.findall(r"\w+", query.lower())[:SEARCH_MAX_TERMS]
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+    return terms
+
+
+def _search_condition(dialect: str, terms: list[str]) -> tuple:
+    """
+    Условие совпадения и ранг (меньше — релевантнее) для полнотекстового поиска.
+
+    Все слова обязательны, последнее ищется как префикс (поиск по мере ввода).
+    """
+
+    if dialect == "postgresql":
+        vector = literal_column(f"{Task.__tablename__}.{SEARCH_VECTOR_COLUMN}")
+        tsquery = func.to_tsquery(SEARCH_CONFIG, " & ".join(terms) + ":*")
+        return vector.op("@@")(tsquery), -func.ts_rank(vector, tsquery)
+
+    match = " ".join(f'"{term}"' for term in terms) + "*"
+    index = literal_column(SEARCH_TABLE)
+    return index.op("MATCH")(match), func.bm25(index, *SEARCH_WEIGHTS)
+
+
+async def search_tasks(
+    db: AsyncSession,
+    team_id: int,
+    query: str,
+    fields: set[str] | None = None,
+    limit: int | None = None,
+    after: tuple[float, int] | None = None,
+) -> list[tuple[Task, float]]:
+    """
+    Полнотекстовый поиск задач команды по заголовку, описанию и комментариям.
+
+    Используется индекс из backend.models.task_search (FTS5 в SQLite,
+    tsvector с GIN-индексом в PostgreSQL).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+        query (str): Поисковый запрос (слова через пробел).
+        fields (set[str] | None): Поля TaskOut для частичной загрузки (см. task_load_options).
+        limit (int | None): Максимальное число задач (None — без ограничения).
+        after (tuple[float, int] | None): Ключ (rank, id) последней задачи
+            предыдущей страницы (keyset-пагинация).
+
+    Returns:
+        list[tuple[Task, float]]: Задачи и их ранг, от более релевантных к менее
+        (при равном ранге — по id).
+
+    Raises:
+        ValueError: Если в запросе нет ни одного слова.
+    """
+
+    condition, rank = _search_condition(db.bind.dialect.name, search_terms(query))
+    statement = select(Task, rank.label("rank")).where(
+        Task.team_id == team_id, condition
+    )
+    if db.bind.dialect.name != "postgresql":
+        index = table(SEARCH_TABLE, column("rowid"))
+        statement = statement.join(index, index.c.rowid == Task.id)
+
+    if fields is None:
+        options = [selectinload(Task.comments).selectinload(Comment.author)]
+    else:
+        options = task_load_options(fields)
+    statement = statement.options(*options)
+    if after is not None:
+        statement = statement.where(tuple_(rank, Task.id) > tuple_(*after))
+    statement = statement.order_by(rank, Task.id)
+    if limit is not None:
+        statement = statement.limit(limit)
+
+    result = await db.execute(statement)
+    return result.all()
+
+
 async def update_task(db: AsyncSession, task: Task, update_data: dict) -> Task:
     """
     Обновить данные существующей задачи.
@@ -93,6 +250,9 @@ async def update_task(db: AsyncSession, task: Task, update_data: dict) -> Task:
     for field, value in update_data.items():
         if value is not None:
             setattr(task, field, value)
+    record_calendar_change(db, task.team_id, "task", task.id)
+    await sync_reminders(db, "task", [task.id])
+    await bump_versions(db, team_scope(task.team_id))
     await db.commit()
     await db.refresh(task)
     return task
@@ -111,9 +271,138 @@ async def delete_task(db: AsyncSession, task: Task) -> None:
     """
 
     await db.delete(task)
+    record_calendar_change(db, task.team_id, "task", task.id, deleted=True)
+    await bump_versions(db, team_scope(task.team_id))
     await db.commit()
 
 
+async def create_tasks_bulk(
+    db: AsyncSession, tasks_in: list[TaskCreate], creator_id: int, team_id: int
+) -> list[dict]:
+    """
+    Создать много задач в команде одной транзакцией.
+
+    Исполнители всех задач проверяются одним запросом, корректные задачи
+    вставляются одним INSERT ... RETURNING (executemany), некорректные
+    пропускаются с описанием ошибки.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        tasks_in (list[TaskCreate]): Входные данные задач.
+        creator_id (int): Идентификатор пользователя, создающего задачи.
+        team_id (int): Идентификатор команды.
+
+    Returns:
+        list[dict]: Результат по каждой задаче в порядке входных данных:
+            {"index": номер, "id": идентификатор созданной задачи}
+            или {"index": номер, "error": причина}.
+    """
+
+    result = await db.execute(
+        select(User.id).where(
+            User.id.in_({task_in.assignee_id for task_in in tasks_in}),
+            User.team_id == team_id,
+        )
+    )
+    team_assignees = set(result.scalars())
+
+    results = [{"index": index} for index in range(len(tasks_in))]
+    rows, row_indexes = [], []
+    for index, task_in in enumerate(tasks_in):
+        if task_in.assignee_id not in team_assignees:
+            results[index]["error"] = "Assignee must be in your team"
+            continue
+        rows.append(
+            {
+                "title": task_in.title,
+                "description": task_in.description,
+                "deadline": task_in.deadline,
+                "status": TaskStatus.OPEN,
+                "team_id": team_id,
+                "assignee_id": task_in.assignee_id,
+                "creator_id": creator_id,
+            }
+        )
+        row_indexes.append(index)
+    if not rows:
+        return results
+
+    inserted = await db.execute(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+    )
+    task_ids = list(inserted.scalars())
+    for index, task_id in zip(row_indexes, task_ids):
+        results[index]["id"] = task_id
+
+    await record_calendar_changes(db, team_id, "task", task_ids)
+    await sync_reminders(db, "task", task_ids)
+    await bump_versions(db, team_scope(team_id))
+    await db.commit()
+    return results
+
+
+async def update_tasks_bulk(
+    db: AsyncSession, updates: list[TaskBulkUpdateItem], team_id: int
+) -> list[dict]:
+    """
+    Обновить много задач команды одной транзакцией.
+
+    Принадлежность задач команде проверяется одним запросом, изменения
+    применяются пакетным UPDATE по первичному ключу (executemany).
+    Как и в update_task, поля со значением None не изменяются.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        updates (list[TaskBulkUpdateItem]): Идентификаторы задач и новые значения полей.
+        team_id (int): Идентификатор команды.
+
+    Returns:
+        list[dict]: Результат по каждому элементу в порядке входных данных
+        (см. create_tasks_bulk).
+    """
+
+    result = await db.execute(
+        select(Task.id).where(
+            Task.id.in_({item.id for item in updates}), Task.team_id == team_id
+        )
+    )
+    team_task_ids = set(result.scalars())
+    statuses = {status.value for status in TaskStatus}
+
+    results = []
+    rows = []
+    seen = set()
+    for index, item in enumerate(updates):
+        outcome = {"index": index, "id": item.id}
+        results.append(outcome)
+        if item.id not in team_task_ids:
+            outcome["error"] = "Task not found"
+        elif item.id in seen:
+            outcome["error"] = "Duplicate task id"
+        elif item.status is not None and item.status not in statuses:
+            outcome["error"] = "Invalid status"
+        else:
+            seen.add(item.id)
+            values = {
+                field: value
+                for field, value in item.model_dump(exclude_unset=True).items()
+                if value is not None
+            }
+            if "status" in values:
+                values["status"] = TaskStatus(values["status"])
+            if len(values) > 1:
+                rows.append(values)
+
+    if rows:
+        await db.execute(update(Task), rows)
+        task_ids = [row["id"] for row in rows]
+        await record_calendar_changes(db, team_id, "task", task_ids)
+        await sync_reminders(db, "task", task_ids)
+        await bump_versions(db, team_scope(team_id))
+        await db.commit()
+    return results
+
+
 # Комментарии
 
 
@@ -135,6 +424,13 @@ async def create_comment(
 
     comment = Comment(task_id=task_id, author_id=author_id, content=content)
     db.add(comment)
+    await db.flush()
+    team_id = await db.scalar(select(Task.team_id).where(Task.id == task_id))
+    record_team_event(
+        db, team_id, {"type": "comment", "id": comment.id, "task_id": task_id}
+    )
+    # Комментарии входят в списки задач (?fields=comments), кэшируемые по версии команды.
+    await bump_versions(db, team_scope(team_id))
     await db.commit()
     await db.refresh(comment)
     return comment
@@ -0,0 +1,231 @@
+from collections.abc import AsyncIterable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from sqlalchemy import func, insert, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.models.task import Task, TaskStatus
+from backend.models.user import User
+from backend.crud.calendar_changes import record_calendar_changes
+from backend.crud.reminders import sync_reminders
+from backend.crud.versions import bump_versions, team_scope
+
+# Размер пакета по умолчанию: столько задач вставляется и фиксируется за раз.
+IMPORT_BATCH_SIZE = 500
+
+# Сколько ошибок по строкам попадает в отчёт (остальные только считаются).
+MAX_REPORTED_ERRORS = 100
+
+# Сколько исполнителей держит кэш одного импорта.
+ASSIGNEE_CACHE_SIZE = 10_000
+
+
+@dataclass
+class ImportProgress:
+    """
+    Состояние импорта задач.
+
+    rows — число обработанных записей файла, включая пропущенные по resume_from;
+    после каждого зафиксированного пакета это контрольная точка, с которой
+    импорт можно продолжить.
+    """
+
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def fail(self, row: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": error})
+
+
+def _assignee_key(record: dict) -> str | int | None:
+    """Ключ исполнителя из записи: идентификатор или email (в нижнем регистре)."""
+
+    value = (
+        record.get("assignee_id")
+        or record.get("assignee_email")
+        or record.get("assignee")
+    )
+    if isinstance(value, int):
+        return value
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    return int(value) if value.isdigit() else value.lower()
+
+
+async def _resolve_assignees(
+    db: AsyncSession, team_id: int, keys: set, cache: dict
+) -> None:
+    """
+    Дописать в кэш идентификаторы ещё не известных исполнителей одним запросом.
+
+    Исполнители не из команды кэшируются как None.
+    """
+
+    missing = keys - cache.keys()
+    if not missing:
+        return
+    if len(cache) + len(missing) > ASSIGNEE_CACHE_SIZE:
+        # Очистка убирает и уже известных исполнителей пакета: разрешаем его целиком.
+        cache.clear()
+        missing = keys
+
+    ids = {key for key in missing if isinstance(key, int)}
+    emails = missing - ids
+    email = func.lower(User.email)
+    result = await db.execute(
+        select(User.id, email).where(
+            User.team_id == team_id, or_(User.id.in_(ids), email.in_(emails))
+        )
+    )
+    cache.update(dict.fromkeys(missing))
+    for user_id, user_email in result:
+        if user_id in ids:
+            cache[user_id] = user_id
+        if user_email in emails:
+            cache[user_email] = user_id
+
+
+def _task_row(
+    record: dict | None, assignee_id: int | None, team_id: int, creator_id: int
+) -> dict:
+    """
+    Проверить запись файла и построить строку для INSERT.
+
+    Raises:
+        ValueError: Если запись некорректна.
+    """
+
+    if record is None:
+        raise ValueError("Invalid record")
+    title = str(record.get("title") or "").strip()
+    if not title:
+        raise ValueError("Title is required")
+    if assignee_id is None:
+        raise ValueError("Assignee must be in your team")
+
+    deadline = record.get("deadline") or None
+    if deadline is not None:
+        try:
+            deadline = datetime.fromisoformat(str(deadline))
+        except ValueError:
+            raise ValueError("Invalid deadline")
+        if deadline.tzinfo is not None:
+            deadline = deadline.astimezone().replace(tzinfo=None)
+    try:
+        status = TaskStatus(record.get("status") or TaskStatus.OPEN)
+    except ValueError:
+        raise ValueError("Invalid status")
+
+    return {
+        "title": title,
+        "description": str(record["description"]) if record.get("description") else None,
+        "deadline": deadline,
+        "status": status,
+        "team_id": team_id,
+        "assignee_id": assignee_id,
+        "creator_id": creator_id,
+    }
+
+
+async def _import_batch(
+    db: AsyncSession,
+    batch: list[tuple[int, dict | None]],
+    team_id: int,
+    creator_id: int,
+    cache: dict,
+    progress: ImportProgress,
+) -> None:
+    """Вставить и зафиксировать один пакет записей, обновив progress."""
+
+    keys = {_assignee_key(record) for _, record in batch if record is not None}
+    keys.discard(None)
+    await _resolve_assignees(db, team_id, keys, cache)
+
+    rows = []
+    for row_number, record in batch:
+        key = _assignee_key(record) if record is not None else None
+        try:
+            rows.append(_task_row(record, cache.get(key), team_id, creator_id))
+        except ValueError as e:
+            progress.fail(row_number, str(e))
+
+    if rows:
+        inserted = await db.execute(insert(Task).returning(Task.id), rows)
+        task_ids = list(inserted.scalars())
+        await record_calendar_changes(db, team_id, "task", task_ids)
+        await sync_reminders(db, "task", task_ids)
+        await bump_versions(db, team_scope(team_id))
+        await db.commit()
+    progress.imported += len(rows)
+    progress.rows = batch[-1][0]
+    progress.batches += 1
+
+
+async def import_tasks(
+    db: AsyncSession,
+    records: AsyncIterable[dict | None],
+    team_id: int,
+    creator_id: int,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    resume_from: int = 0,
+    on_batch: Callable[[ImportProgress], None] | None = None,
+    progress: ImportProgress | None = None,
+) -> ImportProgress:
+    """
+    Потоково импортировать задачи в команду пакетами.
+
+    Записи читаются по одной, в памяти держится только текущий пакет.
+    Для каждого пакета исполнители (email или id) разрешаются одним запросом
+    с кэшем на весь импорт, задачи вставляются одним INSERT (executemany),
+    и пакет сразу фиксируется — после сбоя импорт продолжается с progress.rows.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        records (AsyncIterable[dict | None]): Записи с полями title, description,
+            deadline (ISO 8601), status и assignee_id / assignee_email / assignee;
+            None — нераспознанная запись (см. backend.core.record_stream).
+        team_id (int): Идентификатор команды.
+        creator_id (int): Идентификатор пользователя, от имени которого создаются задачи.
+        batch_size (int): Размер пакета.
+        resume_from (int): Контрольная точка: столько первых записей уже импортировано
+            и пропускается.
+        on_batch (Callable[[ImportProgress], None] | None): Вызывается после
+            фиксации каждого пакета (вывод прогресса, сохранение контрольной точки).
+        progress (ImportProgress | None): Объект, в котором копится прогресс;
+            позволяет вызывающему узнать контрольную точку, если разбор прервался
+            исключением.
+
+    Returns:
+        ImportProgress: Итог импорта; errors содержит номера строк-записей
+        (с 1) и причины ошибок.
+    """
+
+    if progress is None:
+        progress = ImportProgress()
+    progress.rows = resume_from
+    cache: dict = {}
+    batch: list[tuple[int, dict | None]] = []
+    row_number = 0
+
+    async for record in records:
+        row_number += 1
+        if row_number <= resume_from:
+            continue
+        batch.append((row_number, record))
+        if len(batch) >= batch_size:
+            await _import_batch(db, batch, team_id, creator_id, cache, progress)
+            batch = []
+            if on_batch is not None:
+                on_batch(progress)
+
+    if batch:
+        await _import_batch(db, batch, team_id, creator_id, cache, progress)
+        if on_batch is not None:
+            on_batch(progress)
+    return progress
@@ -1,8 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func, or_, update
+from datetime import datetime, timedelta
 from backend.models.team import Team
 from backend.models.user import User, UserRole
 from backend.schemas.team import TeamCreate
+from backend.core.intervals import busy_histogram
+from backend.crud.meeting import get_busy_intervals
+from backend.crud.member_search import update_member_index
+from backend.crud.team_invite import claim_invite, find_invite
+from backend.crud.versions import bump_versions, members_scope, team_scope, user_scope
 
 
 async def create_team(db: AsyncSession, team_create: TeamCreate, admin_id: int) -> Team:
@@ -27,6 +34,8 @@ async def create_team(db: AsyncSession, team_create: TeamCreate, admin_id: int)
 
     team = Team(name=team_create.name, admin_id=admin_id)
     db.add(team)
+    await db.flush()
+    await bump_versions(db, team_scope(team.id), user_scope(admin_id))
     await db.commit()
     await db.refresh(team)
     return team
@@ -65,8 +74,16 @@ async def add_user_to_team(db: AsyncSession, user_id: int, team_id: int) -> bool
     user = result.scalars().first()
     if not user:
         return False
+    previous_team_id = user.team_id
+    scopes = [team_scope(team_id), members_scope(team_id), user_scope(user.id)]
+    if previous_team_id is not None:
+        scopes += [team_scope(previous_team_id), members_scope(previous_team_id)]
     user.team_id = team_id
+    await bump_versions(db, *scopes)
     await db.commit()
+    if previous_team_id != team_id:
+        update_member_index(previous_team_id, removed_ids=[user.id])
+    update_member_index(team_id, [user])
     return True
 
 
@@ -88,9 +105,14 @@ async def remove_user_from_team(db: AsyncSession, user_id: int) -> bool:
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalars().first()
     if user and user.team_id:
+        team_id = user.team_id
+        await bump_versions(
+            db, team_scope(team_id), members_scope(team_id), user_scope(user.id)
+        )
         user.team_id = None
         user.role = UserRole.MEMBER
         await db.commit()
+        update_member_index(team_id, removed_ids=[user.id])
         return True
     return False
 
@@ -112,55 +134,307 @@ async def set_user_role_in_team(db: AsyncSession, user_id: int, role: UserRole)
     user = result.scalars().first()
     if user and user.team_id:
         user.role = role
+        await bump_versions(
+            db, team_scope(user.team_id), members_scope(user.team_id), user_scope(user.id)
+        )
         await db.commit()
+        update_member_index(user.team_id, [user])
         return True
     return False
 
 
-async def get_team_members(db: AsyncSession, team_id: int) -> list[User]:
+async def _resolve_users(
+    db: AsyncSession, users: list[int | str]
+) -> tuple[list[dict], dict[int, int | None]]:
+    """
+    Найти пользователей по id или email одним запросом.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        users (list[int | str]): Идентификаторы или email (без учёта регистра).
+
+    Returns:
+        tuple[list[dict], dict[int, int | None]]: Результат по каждому элементу
+        в порядке входных данных ({"index", "user", "id"} или {"index", "user",
+        "error"} для ненайденных и повторов) и команда каждого найденного
+        пользователя {id: team_id}.
+    """
+
+    ids = {user for user in users if isinstance(user, int)}
+    emails = {user.strip().lower() for user in users if isinstance(user, str)}
+    email = func.lower(User.email)
+    result = await db.execute(
+        select(User.id, email, User.team_id).where(
+            or_(User.id.in_(ids), email.in_(emails))
+        )
+    )
+    by_key, teams = {}, {}
+    for user_id, user_email, team_id in result:
+        by_key[user_id] = by_key[user_email] = user_id
+        teams[user_id] = team_id
+
+    results, seen = [], set()
+    for index, user in enumerate(users):
+        user_id = by_key.get(user.strip().lower() if isinstance(user, str) else user)
+        outcome = {"index": index, "user": user, "id": user_id}
+        if user_id is None:
+            outcome["error"] = "User not found"
+        elif user_id in seen:
+            outcome["error"] = "Duplicate user"
+        seen.add(user_id)
+        results.append(outcome)
+    return results, teams
+
+
+async def _apply_members_update(
+    db: AsyncSession,
+    team_id: int,
+    results: list[dict],
+    condition,
+    values: dict,
+    error: str,
+) -> None:
+    """
+    Применить изменение к пользователям без ошибок одним UPDATE ... WHERE id IN (...).
+
+    Условие condition проверяется в самом UPDATE, поэтому пользователь, которого
+    успели изменить параллельно, получает ошибку error, а не перезаписывается.
+    Версии и индекс участников обновляются после commit.
+    """
+
+    pending = {item["id"]: item for item in results if "error" not in item}
+    if not pending:
+        return
+    updated = await db.execute(
+        update(User)
+        .where(User.id.in_(pending), condition)
+        .values(**values)
+        .returning(User.id, User.email, User.full_name, User.role)
+    )
+    rows = updated.all()
+    changed = {row.id for row in rows}
+    for user_id, item in pending.items():
+        if user_id not in changed:
+            item["error"] = error
+    if not rows:
+        return
+
+    await bump_versions(
+        db,
+        team_scope(team_id),
+        members_scope(team_id),
+        *(user_scope(user_id) for user_id in changed),
+    )
+    await db.commit()
+    update_member_index(team_id, rows)
+
+
+async def add_users_to_team_bulk(
+    db: AsyncSession, team_id: int, users: list[int | str], role: UserRole
+) -> list[dict]:
+    """
+    Добавить много пользователей в команду одной транзакцией.
+
+    Пользователи находятся одним запросом, добавляются одним
+    UPDATE ... WHERE id IN (...). В отличие от add_user_to_team, пользователи
+    из других команд не переводятся, а получают ошибку.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+        users (list[int | str]): Идентификаторы или email пользователей.
+        role (UserRole): Роль добавленных пользователей.
+
+    Returns:
+        list[dict]: Результат по каждому элементу в порядке входных данных:
+            {"index", "user", "id"} или {"index", "user", "id", "error"}.
+    """
+
+    results, teams = await _resolve_users(db, users)
+    for item in results:
+        if "error" in item:
+            continue
+        if teams[item["id"]] == team_id:
+            item["error"] = "Already in team"
+        elif teams[item["id"]] is not None:
+            item["error"] = "User is in another team"
+
+    await _apply_members_update(
+        db,
+        team_id,
+        results,
+        User.team_id.is_(None),
+        {"team_id": team_id, "role": role},
+        "User is in another team",
+    )
+    return results
+
+
+async def set_roles_in_team_bulk(
+    db: AsyncSession, team_id: int, users: list[int | str], role: UserRole
+) -> list[dict]:
+    """
+    Установить роль многим участникам команды одним UPDATE (см. set_user_role_in_team).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+        users (list[int | str]): Идентификаторы или email участников.
+        role (UserRole): Новая роль.
+
+    Returns:
+        list[dict]: Результат по каждому элементу (см. add_users_to_team_bulk).
+    """
+
+    results, teams = await _resolve_users(db, users)
+    for item in results:
+        if "error" not in item and teams[item["id"]] != team_id:
+            item["error"] = "User not in team"
+
+    await _apply_members_update(
+        db, team_id, results, User.team_id == team_id, {"role": role}, "User not in team"
+    )
+    return results
+
+
+async def get_team_members(
+    db: AsyncSession,
+    team_id: int,
+    role: UserRole | None = None,
+    limit: int | None = None,
+    after_id: int | None = None,
+) -> list[User]:
     """
     Получить список участников команды.
 
     Args:
         db (AsyncSession): Асинхронная сессия SQLAlchemy.
         team_id (int): Идентификатор команды.
+        role (UserRole | None): Только участники с этой ролью.
+        limit (int | None): Максимальное число участников (None — без ограничения).
+        after_id (int | None): Идентификатор последнего участника предыдущей
+            страницы (keyset-пагинация по id).
 
     Returns:
-        list[User]: Список пользователей, входящих в команду.
+        list[User]: Пользователи, входящие в команду, по возрастанию id.
     """
 
-    result = await db.execute(select(User).where(User.team_id == team_id))
+    query = select(User).where(User.team_id == team_id)
+    if role is not None:
+        query = query.where(User.role == role)
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    query = query.order_by(User.id)
+    if limit is not None:
+        query = query.limit(limit)
+    result = await db.execute(query)
     return result.scalars().all()
 
 
+async def get_role_counts(db: AsyncSession, team_id: int) -> dict[str, int]:
+    """
+    Посчитать участников команды по ролям одним запросом (GROUP BY).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+
+    Returns:
+        dict[str, int]: {роль: количество} для всех ролей (в том числе нулевые).
+    """
+
+    result = await db.execute(
+        select(User.role, func.count())
+        .where(User.team_id == team_id)
+        .group_by(User.role)
+    )
+    counts = dict.fromkeys((role.value for role in UserRole), 0)
+    for role, count in result:
+        # Роль по умолчанию — MEMBER (у старых записей она может быть не задана).
+        counts[(role or UserRole.MEMBER).value] += count
+    return counts
+
+
+async def get_busy_heatmap(
+    db: AsyncSession,
+    team_id: int,
+    start: datetime,
+    end: datetime,
+    bucket: timedelta,
+) -> tuple[int, list[int]]:
+    """
+    Посчитать занятость участников команды по интервалам сетки.
+
+    Встречи всех участников выбираются одним запросом (см. get_busy_intervals),
+    подсчёт выполняется разностным массивом (см. busy_histogram).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+        start (datetime): Начало периода.
+        end (datetime): Конец периода (не включительно).
+        bucket (timedelta): Длина интервала сетки.
+
+    Returns:
+        tuple[int, list[int]]: Количество участников команды и количество
+        занятых участников в каждом интервале сетки, начиная со start.
+    """
+
+    member_ids = select(User.id).where(User.team_id == team_id)
+    member_count = await db.scalar(
+        select(func.count()).select_from(member_ids.subquery())
+    )
+    busy = await get_busy_intervals(db, member_ids, start, end)
+    buckets = -((start - end) // bucket)
+    return member_count, busy_histogram(busy.values(), start, bucket, buckets)
+
+
 async def join_team_by_code(db: AsyncSession, user_id: int, invite_code: str) -> bool:
     """
-    Присоединяет пользователя к команде по инвайт-коду.
+    Присоединяет пользователя к команде по коду приглашения.
+
+    Пользователь добавляется условным UPDATE users ... WHERE team_id IS NULL,
+    использование приглашения с лимитом занимается последним, перед самым
+    commit (см. claim_invite), — блокировка строки приглашения держится
+    минимально. Версии команды, её состава и пользователя увеличиваются
+    в той же транзакции, чтобы ETag и кэш фрагментов сбросились сразу.
 
     Args:
         db (AsyncSession): Асинхронная сессия базы данных
         user_id (int): ID пользователя, который хочет присоединиться к команде
-        invite_code (str): Инвайт-код команды
+        invite_code (str): Код приглашения
 
     Returns:
         bool: True если пользователь успешно присоединился к команде, False в противном случае
 
     Notes:
         - Пользователь не должен состоять ни в одной команде (team_id is None)
-        - Инвайт-код должен существовать в базе данных
+        - Приглашение должно быть действующим: не отозвано, не истекло и не исчерпано
         - При успешном присоединении роль пользователя меняется на MEMBER
-        - Изменения автоматически сохраняются в базе данных (commit)
     """
-    user = await db.get(User, user_id)
-    if not user or user.team_id is not None:
+    invite = await find_invite(db, invite_code)
+    if invite is None:
+        await db.rollback()
         return False
-
-    result = await db.execute(select(Team).where(Team.invite_code == invite_code))
-    team = result.scalars().first()
-    if not team:
+    team_id = invite.team_id
+
+    joined = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.team_id.is_(None))
+        .values(team_id=team_id, role=UserRole.MEMBER)
+        .returning(User.id, User.email, User.full_name, User.role)
+    )
+    member = joined.first()
+    if member is None:
+        await db.rollback()
         return False
 
-    user.team_id = team.id
-    user.role = UserRole.MEMBER
+    await bump_versions(
+        db, team_scope(team_id), members_scope(team_id), user_scope(user_id)
+    )
+    if not await claim_invite(db, invite):
+        await db.rollback()
+        return False
     await db.commit()
+    update_member_index(team_id, [member])
     return True
@@ -0,0 +1,160 @@
+from collections.abc import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.models.comment import Comment
+from backend.models.evaluation import Evaluation
+from backend.models.meeting import Meeting, meeting_participants
+from backend.models.task import Task
+from backend.models.user import User
+
+# Размер порции чтения из серверного курсора.
+EXPORT_BATCH_SIZE = 1000
+
+
+def _team_meeting_ids(team_id: int):
+    """Подзапрос идентификаторов встреч, в которых участвует кто-то из команды."""
+
+    return (
+        select(meeting_participants.c.meeting_id)
+        .join(User, User.id == meeting_participants.c.user_id)
+        .where(User.team_id == team_id)
+        .distinct()
+    )
+
+
+def export_queries(team_id: int) -> dict[str, object]:
+    """
+    Запросы экспорта команды по типам записей.
+
+    Встречи команды — те, в которых участвует хотя бы один её участник
+    (как в командном календаре).
+
+    Args:
+        team_id (int): Идентификатор команды.
+
+    Returns:
+        dict[str, object]: {тип записи: select(...)} в порядке выгрузки;
+        имена колонок запроса — поля записи.
+    """
+
+    team_tasks = select(Task.id).where(Task.team_id == team_id)
+    team_meetings = _team_meeting_ids(team_id)
+    return {
+        "task": select(
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.deadline,
+            Task.assignee_id,
+            Task.creator_id,
+            Task.updated_at,
+        )
+        .where(Task.team_id == team_id)
+        .order_by(Task.id),
+        "comment": select(
+            Comment.id,
+            Comment.task_id,
+            Comment.author_id,
+            Comment.content,
+            Comment.created_at,
+        )
+        .where(Comment.task_id.in_(team_tasks))
+        .order_by(Comment.id),
+        "evaluation": select(
+            Evaluation.id,
+            Evaluation.task_id,
+            Evaluation.evaluator_id,
+            Evaluation.evaluated_user_id,
+            Evaluation.score,
+            Evaluation.created_at,
+        )
+        .where(Evaluation.task_id.in_(team_tasks))
+        .order_by(Evaluation.id),
+        "meeting": select(
+            Meeting.id,
+            Meeting.title,
+            Meeting.start_time,
+            Meeting.end_time,
+            Meeting.rrule,
+            Meeting.creator_id,
+            Meeting.updated_at,
+        )
+        .where(Meeting.id.in_(team_meetings))
+        .order_by(Meeting.id),
+        "meeting_participant": select(
+            meeting_participants.c.meeting_id, meeting_participants.c.user_id
+        )
+        .where(meeting_participants.c.meeting_id.in_(team_meetings))
+        .order_by(meeting_participants.c.meeting_id, meeting_participants.c.user_id),
+    }
+
+
+def export_columns() -> list[str]:
+    """
+    Колонки плоского (CSV) экспорта: "type" и объединение полей всех типов записей.
+
+    Returns:
+        list[str]: Имена колонок в порядке первого появления.
+    """
+
+    columns = {"type": None}
+    for query in export_queries(0).values():
+        columns.update(dict.fromkeys(query.selected_columns.keys()))
+    return list(columns)
+
+
+async def begin_read_snapshot(db: AsyncSession) -> None:
+    """
+    Начать транзакцию только для чтения, в которой все запросы видят один снимок БД.
+
+    PostgreSQL: REPEATABLE READ READ ONLY. SQLite: явный BEGIN — драйвер
+    не открывает транзакцию для SELECT сам, и без него каждый запрос видел бы
+    своё состояние базы. Снимок завершается db.rollback().
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+    """
+
+    # Завершить неявную транзакцию, открытую при загрузке пользователя.
+    await db.commit()
+    if db.bind.dialect.name == "postgresql":
+        await db.connection(
+            execution_options={
+                "isolation_level": "REPEATABLE READ",
+                "postgresql_readonly": True,
+            }
+        )
+    else:
+        connection = await db.connection()
+        await connection.exec_driver_sql("BEGIN")
+
+
+async def stream_team_export(
+    db: AsyncSession, team_id: int, batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[dict]:
+    """
+    Потоково выдать задачи, комментарии, оценки и встречи команды.
+
+    Все запросы выполняются в одном снимке (см. begin_read_snapshot),
+    строки читаются через серверный курсор порциями по batch_size,
+    поэтому память не зависит от размера команды.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+        batch_size (int): Размер порции чтения из курсора.
+
+    Yields:
+        dict: Запись {"type": тип, ...поля} — сначала все задачи, затем
+        комментарии, оценки, встречи и участники встреч, каждый тип по id.
+    """
+
+    await begin_read_snapshot(db)
+    try:
+        for record_type, query in export_queries(team_id).items():
+            result = await db.stream(query.execution_options(yield_per=batch_size))
+            async for row in result.mappings():
+                yield {"type": record_type, **row}
+    finally:
+        await db.rollback()
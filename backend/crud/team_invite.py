@@ -0,0 +1,164 @@
+import secrets
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.core.security import hash_token
+from backend.models.team_invite import TeamInvite
+
+# Длина кода приглашения в байтах случайности (≈16 символов base64url).
+INVITE_CODE_BYTES = 12
+
+
+def active_invite_condition(now: datetime):
+    """Условие SQL: приглашение не отозвано, не истекло и не исчерпано."""
+
+    return and_(
+        TeamInvite.revoked.is_(False),
+        or_(TeamInvite.expires_at.is_(None), TeamInvite.expires_at > now),
+        or_(TeamInvite.uses_left.is_(None), TeamInvite.uses_left > 0),
+    )
+
+
+async def create_team_invite(
+    db: AsyncSession,
+    team_id: int,
+    created_by: int,
+    expires_in: timedelta | None = None,
+    max_uses: int | None = None,
+) -> tuple[TeamInvite, str]:
+    """
+    Создать приглашение в команду.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+        created_by (int): Идентификатор создавшего приглашение администратора.
+        expires_in (timedelta | None): Срок действия (None — бессрочно).
+        max_uses (int | None): Сколько пользователей могут присоединиться
+            по приглашению (None — без ограничения).
+
+    Returns:
+        tuple[TeamInvite, str]: Приглашение и код в открытом виде. В базе
+        хранится только хэш кода, поэтому показать его повторно нельзя.
+    """
+
+    code = secrets.token_urlsafe(INVITE_CODE_BYTES)
+    invite = TeamInvite(
+        team_id=team_id,
+        code_hash=hash_token(code),
+        created_by=created_by,
+        expires_at=datetime.now() + expires_in if expires_in is not None else None,
+        max_uses=max_uses,
+        uses_left=max_uses,
+    )
+    db.add(invite)
+    await db.commit()
+    await db.refresh(invite)
+    return invite, code
+
+
+async def get_team_invites(db: AsyncSession, team_id: int) -> list[TeamInvite]:
+    """
+    Получить приглашения команды, от новых к старым (включая неактивные).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+
+    Returns:
+        list[TeamInvite]: Приглашения команды.
+    """
+
+    result = await db.execute(
+        select(TeamInvite)
+        .where(TeamInvite.team_id == team_id)
+        .order_by(TeamInvite.id.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def revoke_team_invite(db: AsyncSession, team_id: int, invite_id: int) -> bool:
+    """
+    Отозвать приглашение команды.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        team_id (int): Идентификатор команды.
+        invite_id (int): Идентификатор приглашения.
+
+    Returns:
+        bool: True, если приглашение найдено и отозвано, иначе False.
+    """
+
+    result = await db.execute(
+        update(TeamInvite)
+        .where(
+            TeamInvite.id == invite_id,
+            TeamInvite.team_id == team_id,
+            TeamInvite.revoked.is_(False),
+        )
+        .values(revoked=True)
+        .returning(TeamInvite.id)
+    )
+    revoked = result.first() is not None
+    await db.commit()
+    return revoked
+
+
+async def find_invite(db: AsyncSession, code: str) -> TeamInvite | None:
+    """
+    Найти действующее приглашение по коду (без блокировок и изменений).
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        code (str): Код приглашения в открытом виде.
+
+    Returns:
+        TeamInvite | None: Приглашение или None, если оно не найдено, отозвано,
+        истекло или исчерпано.
+    """
+
+    result = await db.execute(
+        select(TeamInvite).where(
+            TeamInvite.code_hash == hash_token(code),
+            active_invite_condition(datetime.now()),
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def claim_invite(db: AsyncSession, invite: TeamInvite) -> bool:
+    """
+    Занять одно использование приглашения.
+
+    Для приглашения с лимитом это один условный
+    UPDATE ... SET uses_left = uses_left - 1 WHERE uses_left > 0 ... RETURNING:
+    проверка и уменьшение счётчика атомарны, и два пользователя не могут занять
+    последнее использование. Строка приглашения блокируется до commit, поэтому
+    вызывающий занимает использование последним, непосредственно перед commit.
+    Бессрочные многоразовые приглашения (общая ссылка для массового онбординга)
+    не изменяются вовсе — параллельные присоединения не ждут друг друга.
+
+    Изменение не фиксируется: вызывающий делает commit вместе с присоединением
+    пользователя или rollback, если занять использование не удалось.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        invite (TeamInvite): Приглашение (см. find_invite).
+
+    Returns:
+        bool: True, если использование занято; False, если приглашение
+        за это время отозвано, истекло или исчерпано.
+    """
+
+    if invite.uses_left is None:
+        return True
+    claimed = await db.execute(
+        update(TeamInvite)
+        .where(TeamInvite.id == invite.id, active_invite_condition(datetime.now()))
+        .values(uses_left=TeamInvite.uses_left - 1)
+        .returning(TeamInvite.id)
+        .execution_options(synchronize_session=False)
+    )
+    return claimed.first() is not None
@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.models.user import User
-from backend.core.security import get_password_hash
+from backend.core.security import generate_token, get_password_hash, hash_token
 from backend.schemas.auth import UserCreate
+from backend.crud.member_search import update_member_index
+from backend.crud.versions import bump_versions, members_scope, team_scope, user_scope
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
@@ -92,8 +94,13 @@ async def update_user_profile(
     if full_name is not None:
         user.full_name = full_name
 
+    scopes = [user_scope(user.id)]
+    if user.team_id is not None:
+        scopes += [team_scope(user.team_id), members_scope(user.team_id)]
+    await bump_versions(db, *scopes)
     await db.commit()
     await db.refresh(user)
+    update_member_index(user.team_id, [user])
     return user
 
 
@@ -117,6 +124,51 @@ async def delete_user(db: AsyncSession, user_id: int) -> bool:
     user = result.scalars().first()
     if not user:
         return False
+    team_id = user.team_id
+    scopes = [user_scope(user.id)]
+    if team_id is not None:
+        scopes += [team_scope(team_id), members_scope(team_id)]
     await db.delete(user)
+    await bump_versions(db, *scopes)
     await db.commit()
+    update_member_index(team_id, removed_ids=[user_id])
     return True
+
+
+async def rotate_feed_token(db: AsyncSession, user: User) -> str:
+    """
+    Выпустить новый токен календарного фида пользователя.
+
+    Старый токен перестаёт действовать. В базе хранится только хэш токена,
+    поэтому показать его повторно нельзя — только выпустить новый.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        user (User): Пользователь.
+
+    Returns:
+        str: Новый токен в открытом виде.
+    """
+
+    token = generate_token()
+    user.feed_token_hash = hash_token(token)
+    await db.commit()
+    return token
+
+
+async def get_user_by_feed_token(db: AsyncSession, token: str) -> User | None:
+    """
+    Найти пользователя по токену календарного фида.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy для работы с БД.
+        token (str): Токен из ссылки на фид.
+
+    Returns:
+        User | None: Владелец токена, если найден, иначе None.
+    """
+
+    result = await db.execute(
+        select(User).where(User.feed_token_hash == hash_token(token))
+    )
+    return result.scalars().first()
@@ -0,0 +1,97 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.dialects import postgresql, sqlite
+from backend.models.change_version import ChangeVersion
+from backend.core.cache import fragment_cache
+
+
+def team_scope(team_id: int) -> str:
+    """Ключ версии для данных команды (задачи, встречи, участники, оценки)."""
+
+    return f"team:{team_id}"
+
+
+def user_scope(user_id: int) -> str:
+    """Ключ версии для данных конкретного пользователя (профиль, членство в команде)."""
+
+    return f"user:{user_id}"
+
+
+def members_scope(team_id: int) -> str:
+    """Ключ версии состава команды (участники, их роли, имена и email)."""
+
+    return f"members:{team_id}"
+
+
+def scopes_for_user(user_id: int, team_id: int | None) -> list[str]:
+    """
+    Области изменений, от которых зависят данные, видимые пользователю.
+
+    Args:
+        user_id (int): Идентификатор пользователя.
+        team_id (int | None): Идентификатор его команды.
+
+    Returns:
+        list[str]: Ключ пользователя и (если он в команде) ключ команды.
+    """
+
+    scopes = [user_scope(user_id)]
+    if team_id is not None:
+        scopes.append(team_scope(team_id))
+    return scopes
+
+
+async def bump_versions(db: AsyncSession, *scopes: str) -> None:
+    """
+    Увеличить версии изменений для указанных областей.
+
+    Выполняется одним upsert-запросом в текущей транзакции и не делает commit —
+    версия фиксируется вместе с изменением, которое её вызвало. Фрагменты HTML,
+    зависящие от этих областей, удаляются из кэша.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        *scopes (str): Ключи областей (см. team_scope, user_scope).
+
+    Returns:
+        None
+    """
+
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(ChangeVersion).values(
+        [{"scope": scope, "version": 1} for scope in scopes]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ChangeVersion.scope],
+        set_={"version": ChangeVersion.version + 1},
+    )
+    await db.execute(stmt)
+
+    for scope in scopes:
+        fragment_cache.invalidate(scope)
+
+
+async def get_versions(db: AsyncSession, scopes: list[str]) -> dict[str, int]:
+    """
+    Получить текущие версии изменений для указанных областей.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy.
+        scopes (list[str]): Ключи областей.
+
+    Returns:
+        dict[str, int]: Версия для каждого ключа (0, если изменений ещё не было).
+    """
+
+    result = await db.execute(
+        select(ChangeVersion.scope, ChangeVersion.version).where(
+            ChangeVersion.scope.in_(scopes)
+        )
+    )
+    versions = dict.fromkeys(scopes, 0)
+    versions.update(result.tuples().all())
+    return versions
@@ -0,0 +1,204 @@
+"""
+Фоновые задания: очередь в таблице jobs и обработчик в процессе приложения.
+
+CRUD-функции ставят задание через backend.crud.jobs.enqueue_job в своей
+транзакции; после commit обработчики заданий процесса будятся сразу.
+Задание выполняет зарегистрированная через job_handler корутина
+handler(db, **payload) в собственной сессии. Ошибка — повтор с
+экспоненциальной задержкой, после max_attempts — статус failed.
+
+Задание может выполниться повторно (процесс упал после выполнения, но до
+отметки done), поэтому обработчики должны быть идемпотентны.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from backend.core.config import settings
+from backend.core.reminder_sinks import get_reminder_sink
+from backend.crud.jobs import (
+    JOBS_ENQUEUED_KEY,
+    claim_jobs,
+    complete_job,
+    fail_job,
+    prune_jobs,
+)
+from backend.models.base import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Как часто удаляются старые выполненные задания (в секундах).
+JOB_PRUNE_INTERVAL = 3600
+
+JobHandler = Callable[..., Awaitable[None]]
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(name: str) -> Callable[[JobHandler], JobHandler]:
+    """
+    Зарегистрировать обработчик заданий с именем name.
+
+    Обработчик вызывается как handler(db, **payload) и сам фиксирует свои
+    изменения.
+    """
+
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[name] = handler
+        return handler
+
+    return register
+
+
+class JobRunner:
+    """
+    Обработчик очереди заданий в процессе приложения.
+
+    Одновременно выполняется не больше concurrency заданий. Таблица
+    опрашивается раз в poll_interval секунд, а также сразу после commit
+    транзакции, поставившей задание, и после завершения каждого задания.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = AsyncSessionLocal,
+        concurrency: int = settings.JOB_CONCURRENCY,
+        poll_interval: float = settings.JOB_POLL_INTERVAL,
+    ):
+        self._session_factory = session_factory
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._running: set[asyncio.Task] = set()
+        self._loop_task: asyncio.Task | None = None
+        self._stopping = False
+
+    def notify(self) -> None:
+        """Разбудить цикл опроса: в очереди появились задания."""
+
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        """Запустить цикл опроса очереди в фоне."""
+
+        self._stopping = False
+        _runners.add(self)
+        self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = settings.JOB_SHUTDOWN_TIMEOUT) -> None:
+        """
+        Остановить обработку: новые задания не берутся, выполняющиеся
+        дожидаются до timeout секунд, затем отменяются.
+
+        Отменённые задания остаются running и по истечении срока закрепления
+        снова берутся в работу (этим или другим процессом).
+        """
+
+        self._stopping = True
+        _runners.discard(self)
+        self._wakeup.set()
+        if self._loop_task is not None:
+            await self._loop_task
+            self._loop_task = None
+        if self._running:
+            _, pending = await asyncio.wait(self._running, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def run_pending(self) -> int:
+        """
+        Выполнить все готовые задания и дождаться их завершения
+        (без фонового цикла: для командной строки и тестов).
+
+        Returns:
+            int: Число выполненных заданий (успешно или с ошибкой).
+        """
+
+        total = 0
+        while True:
+            async with self._session_factory() as db:
+                jobs = await claim_jobs(db, self._concurrency)
+            if not jobs:
+                return total
+            await asyncio.gather(*(self._execute(job) for job in jobs))
+            total += len(jobs)
+
+    async def _run(self) -> None:
+        pruned_at = 0.0
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                await self._poll()
+                if time.monotonic() - pruned_at > JOB_PRUNE_INTERVAL:
+                    async with self._session_factory() as db:
+                        await prune_jobs(db)
+                    pruned_at = time.monotonic()
+            except Exception:
+                logger.exception("Job queue polling failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self) -> None:
+        free = self._concurrency - len(self._running)
+        if free <= 0:
+            return
+        async with self._session_factory() as db:
+            jobs = await claim_jobs(db, free)
+        for job in jobs:
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._wakeup.set()
+
+    async def _execute(self, job) -> None:
+        async with self._session_factory() as db:
+            try:
+                handler = _handlers.get(job.name)
+                if handler is None:
+                    raise LookupError(f"Unknown job {job.name!r}")
+                await handler(db, **job.payload)
+            except Exception as e:
+                await db.rollback()
+                retry = await fail_job(db, job, f"{type(e).__name__}: {e}")
+                logger.warning(
+                    "Job %s (%s) failed on attempt %s%s: %s",
+                    job.id,
+                    job.name,
+                    job.attempts,
+                    ", will retry" if retry else "",
+                    e,
+                )
+            else:
+                await complete_job(db, job.id)
+
+
+_runners: set[JobRunner] = set()
+
+job_runner = JobRunner()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_runners(session: Session) -> None:
+    if session.info.pop(JOBS_ENQUEUED_KEY, False):
+        for runner in _runners:
+            runner.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued(session: Session) -> None:
+    session.info.pop(JOBS_ENQUEUED_KEY, None)
+
+
+@job_handler("reminders.deliver")
+async def _deliver_reminder(db: AsyncSession, **reminder) -> None:
+    await get_reminder_sink().send(reminder)
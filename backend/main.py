@@ -1,26 +1,83 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from backend.models.base import Base, engine
-from backend.api import auth, team, task, evaluation, meeting, event_calendar
-from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
+from backend.models.schema_upgrade import upgrade_schema
+from backend.models.task_search import create_search_index
+from backend.api import (
+    auth,
+    team,
+    task,
+    evaluation,
+    meeting,
+    event_calendar,
+    calendar_feed,
+)
 import os
+from backend.core.config import settings
+from backend.core.cache import fragment_cache
+from backend.core.event_transports import create_event_transport
+from backend.core.events import event_bus
+from backend.core.static import PrecompressedStaticFiles, StaticManifest
+from backend.core.templates import create_templates, precompile_templates
 from backend.middleware.auth_middleware import AuthMiddleware
+from backend.middleware.compression import CompressionMiddleware
 from backend.api.html_views import html_router
 from backend.api.auth import auth_api_router, auth_html_router
+from backend.jobs import job_runner
+from backend.reminders import reminder_scheduler
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
+templates = create_templates(
+    os.path.join(BASE_DIR, "templates"),
+    cache_dir=settings.TEMPLATE_CACHE_DIR,
+    auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+    fragment_cache=fragment_cache,
+)
 
 
-app = FastAPI(title="MVP")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Создание таблиц и полнотекстового индекса задач при запуске приложения,
+    если база не создана, и недостающих колонок и индексов в таблицах старых
+    баз (см. models.schema_upgrade), предварительная компиляция шаблонов, запуск
+    обработчика фоновых заданий, планировщика напоминаний и транспорта
+    событий команд между воркерами; при остановке — закрыть потоки событий
+    и дождаться выполняющихся заданий.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+        await conn.run_sync(create_search_index)
+    precompile_templates(templates)
+    await event_bus.start(create_event_transport())
+    if settings.JOBS_ENABLED:
+        await job_runner.start()
+    if settings.REMINDERS_ENABLED:
+        await reminder_scheduler.start()
+    try:
+        yield
+    finally:
+        if settings.REMINDERS_ENABLED:
+            await reminder_scheduler.stop()
+        if settings.JOBS_ENABLED:
+            await job_runner.stop()
+        await event_bus.stop()
+
+
+app = FastAPI(title="MVP", lifespan=lifespan)
 
 app.state.templates = templates
 
 static_dir = os.path.join(BASE_DIR, "static")
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+app.mount("/static", PrecompressedStaticFiles(directory=static_dir), name="static")
+templates.env.globals["static_url"] = StaticManifest(static_dir).url
 
 
 app.add_middleware(AuthMiddleware)
+app.add_middleware(
+    CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE
+)
 app.include_router(auth_html_router, prefix="/auth")
 app.include_router(html_router)
 
@@ -31,6 +88,7 @@ app.include_router(task.router, prefix="/api")
 app.include_router(evaluation.router, prefix="/api")
 app.include_router(meeting.router, prefix="/api")
 app.include_router(event_calendar.router, prefix="/api")
+app.include_router(calendar_feed.router, prefix="/api")
 
 
 import backend.admin
@@ -39,12 +97,3 @@ import backend.admin
 @app.get("/")
 def get_message():
     return {"message": "Добро пожаловать!"}
-
-
-@app.on_event("startup")
-async def startup():
-    """
-    Создание таблиц при запуске приложения, если база не создана.
-    """
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,215 @@
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость, без неё работает только gzip
+    brotli = None
+
+# Кодировки, которые middleware умеет выдавать в этом окружении.
+AVAILABLE_ENCODINGS = frozenset({"gzip", "br"} if brotli is not None else {"gzip"})
+
+# Типы содержимого, которые имеет смысл сжимать (изображения, архивы и т.п. уже сжаты).
+DEFAULT_COMPRESSIBLE_TYPES = (
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "text/calendar",
+    "text/csv",
+    "application/javascript",
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """
+    Разобрать заголовок Accept-Encoding.
+
+    Args:
+        accept_encoding (str): Значение заголовка, например "gzip, br;q=0.8, *;q=0".
+
+    Returns:
+        set[str]: Кодировки, которые клиент принимает (q > 0), в нижнем регистре.
+    """
+
+    encodings = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+class _GzipCompressor:
+    """Потоковый gzip-компрессор поверх zlib."""
+
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        chunk = self._compressor.compress(data)
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return chunk + self._compressor.flush(flush_mode)
+
+
+class _BrotliCompressor:
+    """Потоковый brotli-компрессор."""
+
+    encoding = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        chunk = self._compressor.process(data)
+        return chunk + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов gzip/brotli.
+
+    1. Выбирает кодировку по Accept-Encoding (brotli предпочтительнее, если установлен)
+    2. Сжимает только типы содержимого из списка разрешённых
+    3. Не трогает ответы меньше minimum_size, ответы, у которых уже есть
+       Content-Encoding (предварительно сжатая статика, потоковый экспорт),
+       и части ответов (206, Content-Range); сильный ETag сжатого ответа
+       становится слабым
+    4. Потоковые ответы сжимаются по частям, с flush после каждой части
+
+    Реализован как "чистый" ASGI middleware, а не BaseHTTPMiddleware,
+    чтобы не буферизовать потоковые ответы целиком.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        compressible_types: tuple[str, ...] = DEFAULT_COMPRESSIBLE_TYPES,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        """
+        Args:
+            app (ASGIApp): Оборачиваемое приложение.
+            minimum_size (int): Минимальный размер тела (в байтах) для сжатия.
+            compressible_types (tuple[str, ...]): Разрешённые типы содержимого.
+            gzip_level (int): Уровень сжатия gzip (1–9).
+            brotli_quality (int): Качество сжатия brotli (0–11).
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressible_types = compressible_types
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _make_compressor(self, accept_encoding: str):
+        """
+        Выбрать компрессор по заголовку Accept-Encoding.
+
+        Returns:
+            _BrotliCompressor | _GzipCompressor | None: Компрессор или None,
+            если клиент не принимает поддерживаемых кодировок.
+        """
+
+        encodings = accepted_encodings(accept_encoding) & AVAILABLE_ENCODINGS
+        if "br" in encodings:
+            return _BrotliCompressor(self.brotli_quality)
+        if "gzip" in encodings:
+            return _GzipCompressor(self.gzip_level)
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        if not accepted_encodings(accept_encoding) & AVAILABLE_ENCODINGS:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "").split(";")[0].strip()
+                passthrough = (
+                    "content-encoding" in headers
+                    or "content-range" in headers
+                    or content_type not in self.compressible_types
+                    or message["status"] in (204, 206, 304)
+                )
+                if not passthrough:
+                    MutableHeaders(raw=message["headers"]).add_vary_header(
+                        "Accept-Encoding"
+                    )
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                # Первая часть тела: решаем, сжимать ли ответ.
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    passthrough = True
+                    return
+
+                compressor = self._make_compressor(accept_encoding)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["Content-Encoding"] = compressor.encoding
+                etag = headers.get("etag")
+                if etag is not None and not etag.startswith("W/"):
+                    # Сжатое тело отличается побайтово: сильный валидатор ему не подходит.
+                    headers["ETag"] = "W/" + etag
+                body = compressor.compress(body, final=not more_body)
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                start_message = None
+                await send(
+                    {"type": "http.response.body", "body": body, "more_body": more_body}
+                )
+                return
+
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": compressor.compress(body, final=not more_body),
+                    "more_body": more_body,
+                }
+            )
+
+        await self.app(scope, receive, send_wrapper)
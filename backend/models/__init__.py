@@ -1,7 +1,13 @@
 from .base import Base
 from .user import User
 from .team import Team
+from .team_invite import TeamInvite
 from .task import Task
 from .meeting import Meeting
+from .meeting_exception import MeetingException
 from .evaluation import Evaluation
 from .comment import Comment
+from . import task_search  # DDL полнотекстового индекса задач
+from .change_version import ChangeVersion
+from .calendar_change import CalendarChange
+from .job import Job
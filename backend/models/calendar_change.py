@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, text
+from backend.models.base import Base
+
+
+class CalendarChange(Base):
+    __tablename__ = "calendar_changes"
+    __table_args__ = (
+        Index("ix_calendar_changes_team_id_id", "team_id", "id"),
+        Index("ix_calendar_changes_team_id_changed_at", "team_id", "changed_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    item_type = Column(String, nullable=False)
+    item_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+
+    changed_at = Column(
+        DateTime(timezone=True),
+        server_default=text("CURRENT_TIMESTAMP"),
+        nullable=False,
+    )
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String
+from backend.models.base import Base
+
+
+class ChangeVersion(Base):
+    __tablename__ = "change_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
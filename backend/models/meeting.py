@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, text
 from sqlalchemy.orm import relationship
 from backend.models.base import Base
 from sqlalchemy import Table
@@ -6,8 +6,8 @@ from sqlalchemy import Table
 meeting_participants = Table(
     "meeting_participants",
     Base.metadata,
-    Column("meeting_id", Integer, ForeignKey("meetings.id")),
-    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("meeting_id", Integer, ForeignKey("meetings.id"), index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), index=True),
 )
 
 
@@ -16,8 +16,25 @@ class Meeting(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    start_time = Column(DateTime, nullable=False)
+    start_time = Column(DateTime, nullable=False, index=True)
     end_time = Column(DateTime, nullable=False)
+    # Правило повторения (подмножество RRULE, см. core.recurrence) и верхняя
+    # граница окончания последнего повторения (NULL — бесконечная серия).
+    rrule = Column(String, nullable=True)
+    series_end = Column(DateTime, nullable=True)
+    # Когда отправить напоминание о ближайшем повторении (NULL — не нужно)
+    # и о каком повторении напоминание уже отправлено (см. crud.reminders).
+    next_reminder_at = Column(DateTime, nullable=True, index=True)
+    reminder_sent_for = Column(DateTime, nullable=True)
+    # default дублирует server_default: в SQLite-базах, куда колонка добавлена
+    # через upgrade_schema, значение по умолчанию в таблице — константа.
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=text("CURRENT_TIMESTAMP"),
+        server_default=text("CURRENT_TIMESTAMP"),
+        onupdate=text("CURRENT_TIMESTAMP"),
+        nullable=False,
+    )
 
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     creator = relationship("User", foreign_keys=[creator_id])
@@ -25,3 +42,6 @@ class Meeting(Base):
     participants = relationship(
         "User", secondary=meeting_participants, back_populates="meetings"
     )
+    exceptions = relationship(
+        "MeetingException", back_populates="meeting", cascade="all, delete-orphan"
+    )
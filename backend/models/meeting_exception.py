@@ -0,0 +1,30 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import relationship
+from backend.models.base import Base
+
+
+class MeetingException(Base):
+    """Исключение из серии встреч: отмена или перенос одного повторения."""
+
+    __tablename__ = "meeting_exceptions"
+    __table_args__ = (UniqueConstraint("meeting_id", "original_start"),)
+
+    id = Column(Integer, primary_key=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False, index=True)
+    original_start = Column(DateTime, nullable=False)
+    cancelled = Column(Boolean, nullable=False, default=False)
+
+    # Переопределения повторения (NULL — как в серии).
+    title = Column(String, nullable=True)
+    start_time = Column(DateTime, nullable=True)
+    end_time = Column(DateTime, nullable=True)
+
+    meeting = relationship("Meeting", back_populates="exceptions")
@@ -0,0 +1,81 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from backend.models.base import Base
+import backend.models  # noqa: F401 — регистрирует все модели в Base.metadata
+
+# Дополнение таблиц, созданных старыми версиями приложения.
+#
+# create_all создаёт только отсутствующие таблицы и не меняет уже созданные,
+# поэтому колонки и индексы, появившиеся в моделях позже, для старых баз
+# добавляет upgrade_schema при запуске приложения.
+
+# Колонки, добавленные в существующие таблицы: (таблица, колонка модели).
+ADDED_COLUMNS = (
+    ("tasks", "updated_at"),
+    ("meetings", "updated_at"),
+    ("users", "feed_token_hash"),
+    ("meetings", "rrule"),
+    ("meetings", "series_end"),
+    ("tasks", "next_reminder_at"),
+    ("tasks", "reminder_sent_for"),
+    ("meetings", "next_reminder_at"),
+    ("meetings", "reminder_sent_for"),
+)
+
+# SQLite не разрешает ADD COLUMN с непостоянным значением по умолчанию
+# (CURRENT_TIMESTAMP) для NOT NULL колонки: она добавляется с этой константой,
+# существующие строки заполняются текущим временем, а новые получают время
+# из default модели.
+SQLITE_PLACEHOLDER_DEFAULT = "'1970-01-01 00:00:00'"
+
+
+def _add_column_statements(
+    connection: Connection, table_name: str, column_name: str
+) -> tuple[str, ...]:
+    """SQL для добавления колонки модели в существующую таблицу."""
+
+    column = Base.metadata.tables[table_name].c[column_name]
+    preparer = connection.dialect.identifier_preparer
+    table = preparer.quote(table_name)
+    name = preparer.quote(column_name)
+    ddl = f"ALTER TABLE {table} ADD COLUMN {name} {column.type.compile(connection.dialect)}"
+    if column.nullable:
+        return (ddl,)
+
+    default = getattr(column.server_default.arg, "text", column.server_default.arg)
+    if connection.dialect.name == "sqlite":
+        return (
+            f"{ddl} NOT NULL DEFAULT {SQLITE_PLACEHOLDER_DEFAULT}",
+            f"UPDATE {table} SET {name} = {default}",
+        )
+    return (f"{ddl} NOT NULL DEFAULT {default}",)
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """
+    Добавить в существующие таблицы недостающие колонки (ADDED_COLUMNS)
+    и индексы моделей. Повторный вызов ничего не меняет.
+
+    Вызывается при запуске приложения после create_all.
+
+    Args:
+        connection (Connection): Синхронное соединение (например, из conn.run_sync).
+    """
+
+    inspector = inspect(connection)
+    columns = {
+        table.name: {column["name"] for column in inspector.get_columns(table.name)}
+        for table in Base.metadata.tables.values()
+        if inspector.has_table(table.name)
+    }
+    for table_name, column_name in ADDED_COLUMNS:
+        if table_name not in columns or column_name in columns[table_name]:
+            continue
+        for statement in _add_column_statements(connection, table_name, column_name):
+            connection.exec_driver_sql(statement)
+        columns[table_name].add(column_name)
+
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            if table.name in columns and {c.name for c in index.columns} <= columns[table.name]:
+                index.create(connection, checkfirst=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from backend.models.base import Base
 import enum
@@ -12,16 +12,30 @@ class TaskStatus(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (Index("ix_tasks_team_id_deadline", "team_id", "deadline"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     deadline = Column(DateTime, nullable=True)
     status = Column(Enum(TaskStatus), default=TaskStatus.OPEN)
+    # Когда отправить напоминание о дедлайне (NULL — не нужно) и о каком
+    # дедлайне напоминание уже отправлено (см. crud.reminders).
+    next_reminder_at = Column(DateTime, nullable=True, index=True)
+    reminder_sent_for = Column(DateTime, nullable=True)
 
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
     assignee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # default дублирует server_default: в SQLite-базах, куда колонка добавлена
+    # через upgrade_schema, значение по умолчанию в таблице — константа.
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=text("CURRENT_TIMESTAMP"),
+        server_default=text("CURRENT_TIMESTAMP"),
+        onupdate=text("CURRENT_TIMESTAMP"),
+        nullable=False,
+    )
 
     team = relationship("Team", back_populates="tasks", lazy="selectin")
     assignee = relationship(
@@ -0,0 +1,147 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from backend.models.comment import Comment
+from backend.models.task import Task
+
+# Полнотекстовый индекс задач: заголовок, описание и текст всех комментариев.
+#
+# SQLite: виртуальная таблица FTS5 tasks_fts (rowid = tasks.id), которую
+# поддерживают в актуальном состоянии триггеры на tasks и comments.
+# PostgreSQL: колонка tasks.search_vector (tsvector, веса A/B/C) с GIN-индексом;
+# её пересчитывает BEFORE-триггер на tasks, а триггер на comments запускает
+# пересчёт, обнуляя search_vector задачи.
+#
+# Колонки нет в модели Task: тип tsvector есть только в PostgreSQL.
+
+SEARCH_TABLE = "tasks_fts"
+SEARCH_VECTOR_COLUMN = "search_vector"
+
+# Конфигурация текстового поиска PostgreSQL: без стемминга, как и unicode61 в SQLite.
+SEARCH_CONFIG = "simple"
+
+_SQLITE_COMMENTS_TEXT = (
+    "coalesce((SELECT group_concat(content, ' ') FROM comments "
+    "WHERE task_id = {task_id}), '')"
+)
+
+SQLITE_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+    "title, description, comments, tokenize = 'unicode61 remove_diacritics 2')",
+    f"""CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO {SEARCH_TABLE} (rowid, title, description, comments)
+        VALUES (new.id, new.title, coalesce(new.description, ''), '');
+    END""",
+    f"""CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        UPDATE {SEARCH_TABLE}
+        SET title = new.title, description = coalesce(new.description, '')
+        WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER comments_fts_insert AFTER INSERT ON comments BEGIN
+        UPDATE {SEARCH_TABLE}
+        SET comments = {_SQLITE_COMMENTS_TEXT.format(task_id="new.task_id")}
+        WHERE rowid = new.task_id;
+    END""",
+    f"""CREATE TRIGGER comments_fts_update AFTER UPDATE OF content, task_id ON comments BEGIN
+        UPDATE {SEARCH_TABLE}
+        SET comments = {_SQLITE_COMMENTS_TEXT.format(task_id="old.task_id")}
+        WHERE rowid = old.task_id;
+        UPDATE {SEARCH_TABLE}
+        SET comments = {_SQLITE_COMMENTS_TEXT.format(task_id="new.task_id")}
+        WHERE rowid = new.task_id;
+    END""",
+    f"""CREATE TRIGGER comments_fts_delete AFTER DELETE ON comments BEGIN
+        UPDATE {SEARCH_TABLE}
+        SET comments = {_SQLITE_COMMENTS_TEXT.format(task_id="old.task_id")}
+        WHERE rowid = old.task_id;
+    END""",
+)
+
+SQLITE_SEARCH_BACKFILL = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, title, description, comments)
+    SELECT tasks.id, tasks.title, coalesce(tasks.description, ''),
+           {_SQLITE_COMMENTS_TEXT.format(task_id="tasks.id")}
+    FROM tasks
+"""
+
+POSTGRES_SEARCH_DDL = (
+    f"ALTER TABLE tasks ADD COLUMN {SEARCH_VECTOR_COLUMN} tsvector",
+    f"CREATE INDEX ix_tasks_search_vector ON tasks USING GIN ({SEARCH_VECTOR_COLUMN})",
+    f"""CREATE OR REPLACE FUNCTION tasks_search_vector_refresh() RETURNS trigger AS $$
+    BEGIN
+        NEW.{SEARCH_VECTOR_COLUMN} :=
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A')
+            || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'B')
+            || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+                (SELECT string_agg(content, ' ') FROM comments WHERE task_id = NEW.id),
+                '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql""",
+    f"""CREATE TRIGGER tasks_search_vector
+    BEFORE INSERT OR UPDATE OF title, description, {SEARCH_VECTOR_COLUMN} ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_refresh()""",
+    f"""CREATE OR REPLACE FUNCTION comments_search_vector_refresh() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            UPDATE tasks SET {SEARCH_VECTOR_COLUMN} = NULL WHERE id = OLD.task_id;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            UPDATE tasks SET {SEARCH_VECTOR_COLUMN} = NULL WHERE id = NEW.task_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER comments_search_vector
+    AFTER INSERT OR UPDATE OR DELETE ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_search_vector_refresh()""",
+)
+
+POSTGRES_SEARCH_BACKFILL = f"UPDATE tasks SET {SEARCH_VECTOR_COLUMN} = NULL"
+
+
+def _search_index_exists(connection: Connection) -> bool:
+    if connection.dialect.name == "postgresql":
+        query = (
+            "SELECT 1 FROM information_schema.columns WHERE table_name = 'tasks' "
+            f"AND column_name = '{SEARCH_VECTOR_COLUMN}'"
+        )
+    else:
+        query = f"SELECT 1 FROM sqlite_master WHERE name = '{SEARCH_TABLE}'"
+    return connection.exec_driver_sql(query).first() is not None
+
+
+def create_search_index(connection: Connection) -> None:
+    """
+    Создать полнотекстовый индекс задач и заполнить его, если его ещё нет.
+
+    Для новых баз вызывается автоматически после создания таблицы comments;
+    для баз, созданных до появления поиска, — при запуске приложения.
+
+    Args:
+        connection (Connection): Синхронное соединение (например, из conn.run_sync).
+    """
+
+    if connection.dialect.name not in ("sqlite", "postgresql"):
+        return
+    if _search_index_exists(connection):
+        return
+    if connection.dialect.name == "postgresql":
+        statements = (*POSTGRES_SEARCH_DDL, POSTGRES_SEARCH_BACKFILL)
+    else:
+        statements = (*SQLITE_SEARCH_DDL, SQLITE_SEARCH_BACKFILL)
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Comment.__table__, "after_create")
+def _create_search_index(target, connection: Connection, **kw) -> None:
+    create_search_index(connection)
+
+
+@event.listens_for(Task.__table__, "before_drop")
+def _drop_search_index(target, connection: Connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
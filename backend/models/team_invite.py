@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, text
+from backend.models.base import Base
+
+
+class TeamInvite(Base):
+    """
+    Приглашение в команду.
+
+    Хранится только хэш кода: показать код можно один раз, при создании.
+    uses_left — сколько раз приглашение ещё можно использовать
+    (NULL — без ограничения).
+    """
+
+    __tablename__ = "team_invites"
+
+    id = Column(Integer, primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
+    code_hash = Column(String, unique=True, nullable=False, index=True)
+    created_by = Column(
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    expires_at = Column(DateTime, nullable=True)
+    max_uses = Column(Integer, nullable=True)
+    uses_left = Column(Integer, nullable=True)
+    revoked = Column(Boolean, nullable=False, default=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=text("CURRENT_TIMESTAMP"),
+        nullable=False,
+    )
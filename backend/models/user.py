@@ -19,8 +19,9 @@ class User(Base):
     full_name = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
     role = Column(Enum(UserRole), default=UserRole.MEMBER)
+    feed_token_hash = Column(String, unique=True, index=True, nullable=True)
 
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)
     team = relationship("Team", back_populates="members", foreign_keys=[team_id])
 
     tasks_assigned = relationship(
@@ -0,0 +1,171 @@
+"""
+Планировщик напоминаний о дедлайнах задач и начале встреч.
+
+Ближайшие напоминания (next_reminder_at раньше now + горизонт) загружаются
+одним запросом по индексу в min-кучу; планировщик спит до вершины кучи.
+Изменения задач и встреч в этом процессе попадают в кучу сразу после commit
+(см. crud.reminders.sync_reminders), изменения из других процессов — при
+очередной перезагрузке кучи из БД. Наступившее напоминание забирается
+условным UPDATE (crud.reminders.claim_reminder), поэтому при нескольких
+процессах оно доставляется один раз; доставка — фоновое задание
+"reminders.deliver" с повторами (см. backend.jobs).
+"""
+
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+from backend.crud.reminders import REMINDERS_CHANGED_KEY, claim_reminder, get_due_reminders
+from backend.models.base import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# На сколько вперёд напоминания загружаются в кучу и как часто она перезагружается.
+REMINDER_HORIZON = timedelta(minutes=10)
+REMINDER_RELOAD_INTERVAL = timedelta(minutes=1)
+
+# Максимальный размер кучи; остальные напоминания загрузятся позже.
+REMINDER_LOAD_LIMIT = 10_000
+
+
+class ReminderScheduler:
+    """Min-куча ближайших напоминаний (время, тип, id) и цикл их отправки."""
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = AsyncSessionLocal,
+        horizon: timedelta = REMINDER_HORIZON,
+        reload_interval: timedelta = REMINDER_RELOAD_INTERVAL,
+        load_limit: int = REMINDER_LOAD_LIMIT,
+    ):
+        self._session_factory = session_factory
+        self._horizon = horizon
+        self._reload_interval = reload_interval
+        self._load_limit = load_limit
+        self._heap: list[tuple[datetime, str, int]] = []
+        self._loaded_until = datetime.min
+        self._reload_at = datetime.min
+        self._wakeup = asyncio.Event()
+        self._loop_task: asyncio.Task | None = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, due: datetime, item_type: str, item_id: int) -> None:
+        """
+        Добавить напоминание в кучу, если оно попадает в загруженный горизонт
+        (более поздние загрузятся при перезагрузке).
+
+        Устаревшие записи кучи не удаляются: при отправке их отсеивает
+        условие next_reminder_at = due.
+        """
+
+        if due < self._loaded_until:
+            heapq.heappush(self._heap, (due, item_type, item_id))
+            self._wakeup.set()
+
+    async def load(self) -> None:
+        """Перезагрузить кучу из БД: напоминания раньше now + горизонт."""
+
+        now = datetime.now()
+        until = now + self._horizon
+        async with self._session_factory() as db:
+            due = await get_due_reminders(db, until, self._load_limit)
+        if len(due) == self._load_limit:
+            # Загружены не все: горизонт — до последнего загруженного времени.
+            # Напоминания с этим временем остаются в куче (даже если загружена
+            # только часть из них): после отправки у них меняется
+            # next_reminder_at, и следующая загрузка, которая наступит сразу,
+            # вернёт следующие по (время, id).
+            until = due[-1][0]
+        heapq.heapify(due)
+        self._heap = due
+        self._loaded_until = until
+        self._reload_at = min(now + self._reload_interval, until)
+
+    async def fire_due(self) -> int:
+        """
+        Забрать наступившие напоминания и поставить их доставку в очередь
+        одной транзакцией.
+
+        Returns:
+            int: Число забранных этим процессом напоминаний.
+        """
+
+        now = datetime.now()
+        due = set()
+        while self._heap and self._heap[0][0] <= now:
+            due.add(heapq.heappop(self._heap))
+        if not due:
+            return 0
+
+        claimed = 0
+        following = []
+        async with self._session_factory() as db:
+            for when, item_type, item_id in sorted(due):
+                ok, next_due = await claim_reminder(db, item_type, item_id, when)
+                claimed += ok
+                if next_due is not None:
+                    following.append((next_due, item_type, item_id))
+            await db.commit()
+        for entry in following:
+            self.schedule(*entry)
+        return claimed
+
+    async def start(self) -> None:
+        """Запустить цикл планировщика в фоне."""
+
+        self._stopping = False
+        _schedulers.add(self)
+        self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановить цикл; незабранные напоминания остаются в БД."""
+
+        self._stopping = True
+        _schedulers.discard(self)
+        self._wakeup.set()
+        if self._loop_task is not None:
+            await self._loop_task
+            self._loop_task = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                if datetime.now() >= self._reload_at:
+                    await self.load()
+                await self.fire_due()
+            except Exception:
+                logger.exception("Reminder scheduler failed")
+                # Снятые с кучи напоминания вернутся при перезагрузке.
+                self._reload_at = datetime.now() + self._reload_interval
+            wake_at = self._reload_at
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+            timeout = (wake_at - datetime.now()).total_seconds()
+            timeout = min(max(timeout, 0.0), self._reload_interval.total_seconds())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+_schedulers: set[ReminderScheduler] = set()
+
+reminder_scheduler = ReminderScheduler()
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_changed(session: Session) -> None:
+    for entry in session.info.pop(REMINDERS_CHANGED_KEY, ()):
+        for scheduler in _schedulers:
+            scheduler.schedule(*entry)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed(session: Session) -> None:
+    session.info.pop(REMINDERS_CHANGED_KEY, None)
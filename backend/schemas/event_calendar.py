@@ -11,6 +11,10 @@ class CalendarEvent(BaseModel):
     end: datetime | None = None
     assignee_id: int | None = None
     creator_id: int
+    updated_at: datetime | None = None
+    rrule: str | None = None
+    recurrence_id: datetime | None = None
+    exdates: list[datetime] | None = None
 
 
 class DayEventsResponse(BaseModel):
@@ -22,3 +26,38 @@ class MonthEventsResponse(BaseModel):
     year: int
     month: int
     days: dict[str, list[CalendarEvent]]
+
+
+class TeamMonthEventsResponse(MonthEventsResponse):
+    team_id: int
+    member_ids: list[int] | None = None
+
+
+class RangeEventsResponse(BaseModel):
+    start: str
+    end: str
+    events: list[CalendarEvent]
+
+
+class RangeDaysResponse(BaseModel):
+    start: str
+    end: str
+    days: dict[str, list[CalendarEvent]]
+
+
+class CalendarTombstone(BaseModel):
+    type: Literal["task", "meeting"]
+    id: int
+
+
+class CalendarSyncResponse(BaseModel):
+    sync_token: str
+    full: bool
+    events: list[CalendarEvent]
+    deleted: list[CalendarTombstone]
+
+
+class FeedTokenResponse(BaseModel):
+    token: str
+    user_feed: str
+    team_feed: str | None = None
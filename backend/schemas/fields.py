@@ -0,0 +1,49 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    """
+    Получить (и закэшировать) TypeAdapter для одного поля схемы.
+
+    Args:
+        model (type[BaseModel]): Pydantic-схема ответа.
+        name (str): Имя поля схемы.
+
+    Returns:
+        TypeAdapter: Адаптер, валидирующий значение по аннотации поля.
+    """
+
+    return TypeAdapter(model.model_fields[name].annotation)
+
+
+def dump_fields(model: type[BaseModel], obj: Any, fields: set[str]) -> dict:
+    """
+    Сериализовать только запрошенные поля объекта по схеме ответа.
+
+    В отличие от model_validate(obj), не обращается к незапрошенным атрибутам,
+    поэтому не вызывает ленивую загрузку колонок и связей, которые CRUD-слой
+    не выбрал из базы.
+
+    Args:
+        model (type[BaseModel]): Pydantic-схема ответа (TaskOut, MeetingOut, ...).
+        obj (Any): ORM-объект или словарь с данными.
+        fields (set[str]): Набор запрошенных полей.
+
+    Returns:
+        dict: JSON-совместимый словарь только с запрошенными полями
+              (порядок полей совпадает с порядком в схеме).
+    """
+
+    data = {}
+    for name in model.model_fields:
+        if name not in fields:
+            continue
+        value = obj.get(name) if isinstance(obj, Mapping) else getattr(obj, name)
+        adapter = _field_adapter(model, name)
+        value = adapter.validate_python(value, from_attributes=True)
+        data[name] = adapter.dump_python(value, mode="json")
+    return data
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from backend.schemas.user import UserOut
 
 
@@ -9,6 +9,7 @@ class MeetingCreate(BaseModel):
     start_time: datetime
     end_time: datetime
     participant_ids: List[int]
+    rrule: Optional[str] = None
 
 
 class MeetingOut(BaseModel):
@@ -16,8 +17,39 @@ class MeetingOut(BaseModel):
     title: str
     start_time: datetime
     end_time: datetime
+    rrule: Optional[str] = None
     creator: UserOut
     participants: List[UserOut]
 
     class Config:
         from_attributes = True
+
+
+class MeetingExceptionCreate(BaseModel):
+    occurrence_start: datetime
+    cancelled: bool = False
+    title: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+
+
+class MeetingExceptionOut(BaseModel):
+    id: int
+    meeting_id: int
+    original_start: datetime
+    cancelled: bool
+    title: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class MeetingCancelRange(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class MeetingCancelResult(BaseModel):
+    cancelled: List[int]
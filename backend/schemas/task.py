@@ -18,6 +18,45 @@ class TaskUpdate(BaseModel):
     status: Optional[str] = None
 
 
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate]
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem]
+
+
+class TaskBulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class TaskBulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBulkItemResult]
+
+
+class TaskImportError(BaseModel):
+    row: int
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    rows: int
+    imported: int
+    failed: int
+    batches: int
+    errors: List[TaskImportError]
+    completed: bool
+    detail: Optional[str] = None
+
+
 class CommentCreate(BaseModel):
     content: str
 
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional, Union
 from backend.schemas.user import UserOut
 
 
@@ -12,6 +13,51 @@ class TeamMemberUpdate(BaseModel):
     role: str
 
 
+class TeamBulkMembers(BaseModel):
+    users: List[Union[int, str]]
+    role: str = "member"
+
+
+class TeamBulkMemberResult(BaseModel):
+    index: int
+    user: Union[int, str]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class TeamBulkMembersResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TeamBulkMemberResult]
+
+
+class TeamInviteCreate(BaseModel):
+    expires_in_hours: Optional[int] = 168
+    max_uses: Optional[int] = None
+
+
+class TeamInviteOut(BaseModel):
+    id: int
+    team_id: int
+    created_by: Optional[int] = None
+    created_at: datetime
+    expires_at: Optional[datetime] = None
+    max_uses: Optional[int] = None
+    uses_left: Optional[int] = None
+    revoked: bool
+
+    class Config:
+        from_attributes = True
+
+
+class TeamInviteCreated(TeamInviteOut):
+    code: str
+
+
+class TeamJoin(BaseModel):
+    code: str
+
+
 class TeamOut(BaseModel):
     id: int
     name: str
@@ -20,3 +66,20 @@ class TeamOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TeamSummary(BaseModel):
+    id: int
+    name: str
+    admin_id: int
+    member_count: int
+    role_counts: Dict[str, int]
+
+
+class BusyHeatmapResponse(BaseModel):
+    team_id: int
+    start: datetime
+    end: datetime
+    bucket_minutes: int
+    member_count: int
+    counts: List[int]
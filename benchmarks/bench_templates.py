@@ -0,0 +1,102 @@
+"""
+Бенчмарк запуска шаблонов: время старта (компиляция всех шаблонов) и задержка
+первого рендера страницы с кэшем байткода и без него.
+
+Запуск:
+
+    python -m benchmarks.bench_templates [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+from backend.core.templates import create_templates, precompile_templates
+
+TEMPLATES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "templates"
+)
+
+PAGE = "dashboard.html"
+
+
+def page_context() -> dict:
+    """Контекст для рендера дашборда без базы данных и HTTP-запроса."""
+
+    user = SimpleNamespace(id=1, email="bench@example.com", team_id=None, role="member")
+    request = SimpleNamespace(state=SimpleNamespace(user=user), query_params={})
+    return {"request": request, "user": user, "tasks": [], "meetings": [], "team": None}
+
+
+def new_templates(cache_dir: str):
+    """Новое окружение шаблонов, как его создаёт воркер при старте."""
+
+    templates = create_templates(TEMPLATES_DIR, cache_dir=cache_dir)
+    templates.env.globals["static_url"] = lambda path: f"/static/{path}"
+    return templates
+
+
+def measure(fn, repeat: int) -> float:
+    """Медиана времени выполнения fn() в миллисекундах."""
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Template startup benchmark")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    context = page_context()
+
+    def cold_startup():
+        with tempfile.TemporaryDirectory() as cache_dir:
+            precompile_templates(new_templates(cache_dir))
+
+    def first_request_lazy():
+        with tempfile.TemporaryDirectory() as cache_dir:
+            new_templates(cache_dir).get_template(PAGE).render(context)
+
+    with tempfile.TemporaryDirectory() as shared_cache:
+        precompile_templates(new_templates(shared_cache))
+
+        def warm_startup():
+            precompile_templates(new_templates(shared_cache))
+
+        def first_request_bytecode():
+            new_templates(shared_cache).get_template(PAGE).render(context)
+
+        precompiled = new_templates(shared_cache)
+        precompile_templates(precompiled)
+
+        def first_request_precompiled():
+            precompiled.get_template(PAGE).render(context)
+
+        results = [
+            ("startup, empty bytecode cache", measure(cold_startup, args.repeat)),
+            ("startup, warm bytecode cache", measure(warm_startup, args.repeat)),
+            ("first render, lazy compile", measure(first_request_lazy, args.repeat)),
+            (
+                "first render, bytecode cache",
+                measure(first_request_bytecode, args.repeat),
+            ),
+            (
+                "first render, precompiled",
+                measure(first_request_precompiled, args.repeat),
+            ),
+        ]
+
+    width = max(len(name) for name, _ in results)
+    for name, value in results:
+        print(f"{name:<{width}}  {value:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
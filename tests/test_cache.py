@@ -0,0 +1,65 @@
+import pytest
+from backend.core.cache import FragmentCache, MemoryLRUStore, SQLiteStore, fragment_key
+from backend.core.templates import create_templates
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_fragment_cache_lru_and_invalidate(backend, tmp_path):
+    """Тест кэша фрагментов: вытеснение LRU по числу записей и размеру, сброс по области видимости"""
+
+    if backend == "memory":
+        store = MemoryLRUStore(max_entries=2)
+    else:
+        store = SQLiteStore(str(tmp_path / "fragments.sqlite3"), max_entries=2)
+    cache = FragmentCache(store)
+
+    first = fragment_key("meeting_list", {"team:1": 3, "user:1": 1}, 1)
+    second = fragment_key("meeting_list", {"team:2": 1, "user:2": 1}, 2)
+    third = fragment_key("task_list", {"team:1": 3, "user:3": 1}, 3)
+    assert first == "meeting_list|1|team:1=3|user:1=1"
+
+    cache.set(first, "<ul>1</ul>")
+    cache.set(second, "<ul>2</ul>")
+    assert cache.get(first) == "<ul>1</ul>"
+    cache.set(third, "<ul>3</ul>")
+    assert cache.get_many([first, second, third]) == {
+        first: "<ul>1</ul>",
+        third: "<ul>3</ul>",
+    }
+
+    cache.invalidate("team:1")
+    assert cache.get_many([first, third]) == {}
+
+    # Лимит суммарного размера: старые записи вытесняются, слишком большая не сохраняется.
+    if backend == "memory":
+        store = MemoryLRUStore(max_entries=10, max_bytes=12)
+    else:
+        store = SQLiteStore(str(tmp_path / "sized.sqlite3"), max_entries=10, max_bytes=12)
+    store.set("a", "x" * 5)
+    store.set("b", "y" * 5)
+    store.set("c", "z" * 5)
+    assert store.get_many(["a", "b", "c"]) == {"b": "y" * 5, "c": "z" * 5}
+    store.set("d", "w" * 13)
+    assert store.get("d") is None
+
+
+def test_cache_tag_renders_once_per_key(tmp_path):
+    """Тест тега {% cache %}: фрагмент рендерится один раз на ключ"""
+
+    (tmp_path / "list.html").write_text(
+        "{% cache key %}<ul>{% for item in items %}<li>{{ item }}</li>{% endfor %}</ul>"
+        "{% endcache %}",
+        encoding="utf-8",
+    )
+    cache = FragmentCache(MemoryLRUStore())
+    env = create_templates(str(tmp_path), fragment_cache=cache).env
+    template = env.get_template("list.html")
+
+    assert template.render(key="list|1", items=["<a>"]) == "<ul><li>&lt;a&gt;</li></ul>"
+    assert template.render(key="list|1", items=["b"]) == "<ul><li>&lt;a&gt;</li></ul>"
+    assert template.render(key="list|2", items=["b"]) == "<ul><li>b</li></ul>"
+    assert (
+        template.render(key="list|3", items=[], fragments={"list|3": "<p>x</p>"})
+        == "<p>x</p>"
+    )
+    assert template.render(key=None, items=["c"]) == "<ul><li>c</li></ul>"
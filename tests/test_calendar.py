@@ -0,0 +1,250 @@
+import jwt
+import pytest
+from datetime import date, timedelta
+from httpx import AsyncClient
+from backend.core.calendar_layout import month_grid
+from backend.crud.calendar_changes import get_changed_items
+
+
+def test_month_grid_is_cached_and_iso_keyed():
+    """Тест сетки месяца: мемоизация, ISO-ключи дней и недели с соседними месяцами"""
+
+    grid = month_grid(2026, 3)
+
+    assert month_grid(2026, 3) is grid
+    assert len(grid.keys) == 31
+    assert grid.keys[0] == "2026-03-01"
+    assert grid.key_for(date(2026, 3, 10)) == "2026-03-10"
+    assert (grid.start, grid.end) == (date(2026, 3, 1), date(2026, 4, 1))
+
+    first_week = grid.weeks[0]
+    assert first_week.number == 9
+    assert [cell.in_month for cell in first_week.cells] == [False] * 6 + [True]
+    assert first_week.cells[0].key == "2026-02-23"
+    assert grid.weeks[-1].cells[-1].key == "2026-04-05"
+
+    assert month_grid(2026, 12).end == date(2027, 1, 1)
+    with pytest.raises(ValueError):
+        month_grid(2026, 13)
+
+
+@pytest.mark.asyncio
+async def test_calendar_month_buckets_events(auth_headers, client: AsyncClient):
+    """Тест календаря на месяц: события разложены по ISO-ключам всех дней месяца"""
+
+    await client.post("/api/teams/", json={"name": "CalendarTeam"}, headers=auth_headers)
+    await client.post(
+        "/api/meetings/",
+        json={
+            "title": "Sync",
+            "start_time": "2031-03-10T10:00:00",
+            "end_time": "2031-03-10T11:00:00",
+            "participant_ids": [],
+        },
+        headers=auth_headers,
+    )
+
+    response = await client.get(
+        "/api/calendar/month?year=2031&month=3", headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    days = response.json()["days"]
+    assert list(days) == list(month_grid(2031, 3).keys)
+    assert [event["title"] for event in days["2031-03-10"]] == ["Встреча: Sync"]
+    assert days["2031-03-11"] == []
+
+
+@pytest.mark.asyncio
+async def test_calendar_range_and_week(auth_headers, client: AsyncClient):
+    """Тест календаря за период и за неделю: сортировка по времени, выбор полей, лимит длины периода"""
+
+    await client.post("/api/teams/", json={"name": "RangeTeam"}, headers=auth_headers)
+    for title, start in [("Late", "2031-05-14T15:00:00"), ("Early", "2031-05-12T09:00:00")]:
+        await client.post(
+            "/api/meetings/",
+            json={
+                "title": title,
+                "start_time": start,
+                "end_time": start[:11] + "23:00:00",
+                "participant_ids": [],
+            },
+            headers=auth_headers,
+        )
+    user_id = jwt.decode(
+        auth_headers["Authorization"].replace("Bearer ", ""),
+        options={"verify_signature": False},
+    )["user_id"]
+    await client.post(
+        "/api/tasks/",
+        json={
+            "title": "Report",
+            "deadline": "2031-05-13T12:00:00",
+            "assignee_id": user_id,
+        },
+        headers=auth_headers,
+    )
+
+    response = await client.get(
+        "/api/calendar/range?start=2031-05-01&end=2031-05-31", headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert [e["title"] for e in response.json()["events"]] == [
+        "Встреча: Early",
+        "Задача: Report",
+        "Встреча: Late",
+    ]
+
+    response = await client.get(
+        "/api/calendar/week?day=2031-05-15&fields=title", headers=auth_headers
+    )
+    body = response.json()
+    assert (body["start"], body["end"]) == ("2031-05-12", "2031-05-18")
+    assert len(body["days"]) == 7
+    assert [e["title"] for e in body["days"]["2031-05-13"]] == ["Задача: Report"]
+    assert set(body["days"]["2031-05-13"][0]) == {"id", "title"}
+
+    response = await client.get(
+        "/api/calendar/range?start=2031-01-01&end=2031-05-01", headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_calendar_sync_returns_changes_and_tombstones(
+    auth_headers, client: AsyncClient, db_session
+):
+    """Тест синхронизации календаря: полная выдача, дельта по токену с удалёнными и окно повторного чтения"""
+
+    await client.post("/api/teams/", json={"name": "SyncTeam"}, headers=auth_headers)
+    meeting = {
+        "start_time": "2032-02-02T10:00:00",
+        "end_time": "2032-02-02T11:00:00",
+        "participant_ids": [],
+    }
+    kept = await client.post(
+        "/api/meetings/", json={**meeting, "title": "Kept"}, headers=auth_headers
+    )
+
+    first = (await client.get("/api/calendar/sync", headers=auth_headers)).json()
+    assert first["full"] is True
+    synced = {e["id"]: e for e in first["events"] if e["type"] == "meeting"}
+    assert synced[kept.json()["id"]]["updated_at"] is not None
+
+    unchanged = (
+        await client.get(
+            f"/api/calendar/sync?sync_token={first['sync_token']}", headers=auth_headers
+        )
+    ).json()
+    assert unchanged["full"] is False
+    assert (unchanged["events"], unchanged["deleted"]) == ([], [])
+
+    added = await client.post(
+        "/api/meetings/",
+        json={
+            **meeting,
+            "title": "Added",
+            "start_time": "2032-02-03T10:00:00",
+            "end_time": "2032-02-03T11:00:00",
+        },
+        headers=auth_headers,
+    )
+    await client.delete(f"/api/meetings/{kept.json()['id']}", headers=auth_headers)
+
+    delta = (
+        await client.get(
+            f"/api/calendar/sync?sync_token={first['sync_token']}", headers=auth_headers
+        )
+    ).json()
+    assert delta["full"] is False
+    assert [e["title"] for e in delta["events"]] == ["Встреча: Added"]
+    assert delta["events"][0]["id"] == added.json()["id"]
+    assert delta["deleted"] == [{"type": "meeting", "id": kept.json()["id"]}]
+    assert delta["sync_token"] != first["sync_token"]
+
+    # Окно повторного чтения возвращает и недавние изменения до курсора.
+    team_id, cursor = (int(part) for part in delta["sync_token"].split("."))
+    assert await get_changed_items(db_session, team_id, cursor, cursor) == {
+        "task": set(),
+        "meeting": set(),
+    }
+    rescanned = await get_changed_items(
+        db_session, team_id, cursor, cursor, timedelta(minutes=5)
+    )
+    assert rescanned["meeting"] == {kept.json()["id"], added.json()["id"]}
+
+    response = await client.get("/api/calendar/sync?sync_token=bad", headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_team_calendar_month_dedupes_and_filters(
+    auth_headers, client: AsyncClient
+):
+    """Тест календаря команды: встреча показывается один раз, фильтр по участнику"""
+
+    team = await client.post(
+        "/api/teams/", json={"name": "TeamCalendarTeam"}, headers=auth_headers
+    )
+    manager_id = jwt.decode(
+        auth_headers["Authorization"].replace("Bearer ", ""),
+        options={"verify_signature": False},
+    )["user_id"]
+    await client.post(
+        "/api/auth/register",
+        json={"email": "teammate@example.com", "password": "123"},
+    )
+    login = await client.post(
+        "/api/auth/login",
+        data={"username": "teammate@example.com", "password": "123"},
+    )
+    worker_token = login.json()["access_token"]
+    worker_id = jwt.decode(worker_token, options={"verify_signature": False})["user_id"]
+    await client.post(
+        f"/api/teams/{team.json()['id']}/add-member",
+        json={"user_id": worker_id, "role": "member"},
+        headers=auth_headers,
+    )
+
+    await client.post(
+        "/api/meetings/",
+        json={
+            "title": "Planning",
+            "start_time": "2034-06-05T10:00:00",
+            "end_time": "2034-06-05T11:00:00",
+            "participant_ids": [worker_id],
+        },
+        headers=auth_headers,
+    )
+    await client.post(
+        "/api/tasks/",
+        json={
+            "title": "Budget",
+            "deadline": "2034-06-07T18:00:00",
+            "assignee_id": manager_id,
+        },
+        headers=auth_headers,
+    )
+
+    response = await client.get(
+        "/api/calendar/team/month?year=2034&month=6", headers=auth_headers
+    )
+    assert response.status_code == 200
+    days = response.json()["days"]
+    assert [e["title"] for e in days["2034-06-05"]] == ["Встреча: Planning"]
+    assert [e["title"] for e in days["2034-06-07"]] == ["Задача: Budget"]
+
+    response = await client.get(
+        f"/api/calendar/team/month?year=2034&month=6&member_id={worker_id}",
+        headers=auth_headers,
+    )
+    days = response.json()["days"]
+    assert response.json()["member_ids"] == [worker_id]
+    assert [e["title"] for e in days["2034-06-05"]] == ["Встреча: Planning"]
+    assert days["2034-06-07"] == []
+
+    response = await client.get(
+        "/api/calendar/team/month?year=2034&month=6",
+        headers={"Authorization": f"Bearer {worker_token}"},
+    )
+    assert response.status_code == 403
@@ -0,0 +1,69 @@
+import pytest
+from httpx import AsyncClient
+from backend.core.ics import fold_line
+
+
+def test_fold_line_respects_octet_limit():
+    """Тест свёртки строк iCalendar: не длиннее 75 октетов, без разрыва символов UTF-8"""
+
+    line = "SUMMARY:" + "Встреча " * 20
+    folded = fold_line(line)
+
+    physical = folded.split("\r\n")[:-1]
+    assert all(len(part.encode()) <= 75 for part in physical)
+    assert "".join(part[1:] if i else part for i, part in enumerate(physical)) == line
+
+
+@pytest.mark.asyncio
+async def test_user_feed_token_etag_and_invalidation(auth_headers, client: AsyncClient):
+    """Тест iCalendar-ленты: доступ по токену, ETag/304 и сброс кэша при новой встрече"""
+
+    await client.post("/api/teams/", json={"name": "FeedTeam"}, headers=auth_headers)
+    meeting = {
+        "title": "Standup, daily",
+        "start_time": "2033-04-01T09:00:00",
+        "end_time": "2033-04-01T09:15:00",
+        "participant_ids": [],
+    }
+    await client.post("/api/meetings/", json=meeting, headers=auth_headers)
+
+    links = (await client.post("/api/calendar/feed-token", headers=auth_headers)).json()
+    assert links["team_feed"] is not None
+
+    response = await client.get(links["user_feed"])
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/calendar")
+    assert response.text.startswith("BEGIN:VCALENDAR\r\n")
+    assert "SUMMARY:Встреча: Standup\\, daily\r\n" in response.text
+    assert "DTSTART:20330401T090000\r\n" in response.text
+    etag = response.headers["etag"]
+    assert "last-modified" in response.headers
+
+    cached = await client.get(links["user_feed"])
+    assert cached.text == response.text
+
+    not_modified = await client.get(links["user_feed"], headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    weak = "W/" + etag.removeprefix("W/")
+    not_modified = await client.get(links["user_feed"], headers={"If-None-Match": weak})
+    assert not_modified.status_code == 304
+
+    await client.post(
+        "/api/meetings/",
+        json={
+            **meeting,
+            "title": "Retro",
+            "start_time": "2033-04-02T09:00:00",
+            "end_time": "2033-04-02T10:00:00",
+        },
+        headers=auth_headers,
+    )
+    changed = await client.get(links["user_feed"], headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert "SUMMARY:Встреча: Retro\r\n" in changed.text
+
+    team_feed = await client.get(links["team_feed"])
+    assert team_feed.text.count("SUMMARY:Встреча: Retro") == 1
+
+    invalid = await client.get(links["user_feed"].replace("token=", "token=x"))
+    assert invalid.status_code == 404
@@ -0,0 +1,110 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+from backend.core.static import PrecompressedStaticFiles, build_static
+from backend.middleware import compression
+from backend.middleware.compression import CompressionMiddleware
+
+
+def make_app(**routes) -> Starlette:
+    app = Starlette(
+        routes=[Route(f"/{name}", endpoint) for name, endpoint in routes.items()]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return app
+
+
+async def large_json(request):
+    return JSONResponse({"events": [{"id": i, "title": "Встреча"} for i in range(200)]})
+
+
+async def small_json(request):
+    return JSONResponse({"ok": True})
+
+
+async def tagged_text(request):
+    return Response("строка\n" * 200, media_type="text/plain", headers={"ETag": '"v1"'})
+
+
+async def partial_text(request):
+    return Response(
+        "x" * 1000,
+        status_code=206,
+        media_type="text/plain",
+        headers={"Content-Range": "bytes 0-999/5000"},
+    )
+
+
+async def large_png(request):
+    return Response(b"\x89PNG" + b"\x00" * 2000, media_type="image/png")
+
+
+@pytest.mark.asyncio
+async def test_compression_threshold_and_allowlist(monkeypatch):
+    """Тест сжатия: большие JSON-ответы сжимаются, маленькие и бинарные — нет"""
+
+    app = make_app(
+        large=large_json,
+        small=small_json,
+        png=large_png,
+        tagged=tagged_text,
+        partial=partial_text,
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert len(response.json()["events"]) == 200
+
+        response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+        response = await client.get("/png", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+        response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+
+        # Сжатый ответ получает слабый ETag, часть ответа (206) не сжимается.
+        response = await client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == 'W/"v1"'
+        response = await client.get("/partial", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 206
+        assert "content-encoding" not in response.headers
+        assert response.content == b"x" * 1000
+
+        # Без установленного brotli клиент, принимающий только br, получает ответ без сжатия.
+        monkeypatch.setattr(compression, "AVAILABLE_ENCODINGS", frozenset({"gzip"}))
+        response = await client.get("/large", headers={"Accept-Encoding": "br"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_precompressed_static_files(tmp_path):
+    """Тест сборки статики: хэшированное имя, .gz-вариант и immutable-кэширование"""
+
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "site.css").write_text("body { margin: 0; }\n" * 100)
+    manifest = build_static(str(tmp_path))
+    hashed = manifest["css/site.css"]
+    assert hashed.startswith("css/site.") and hashed.endswith(".css")
+    assert (tmp_path / "dist" / (hashed + ".gz")).exists()
+
+    app = Starlette(
+        routes=[Mount("/static", PrecompressedStaticFiles(directory=str(tmp_path)))]
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            f"/static/dist/{hashed}", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/css")
+        assert "immutable" in response.headers["cache-control"]
+        assert response.text.startswith("body { margin: 0; }")
@@ -0,0 +1,118 @@
+import asyncio
+import jwt
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.future import select
+from backend.core.event_transports import EventBroker, UnixSocketTransport, _QueuedTransport
+from backend.core.events import EventBus, event_bus, record_team_event
+from backend.models.user import User
+
+
+@pytest.mark.asyncio
+async def test_event_bus_commit_and_slow_subscriber(db_session):
+    """Тест шины событий: публикация только после commit, drop-oldest для медленного подписчика"""
+
+    bus = EventBus(queue_size=2)
+    subscription = bus.subscribe(1)
+    other_team = bus.subscribe(2)
+    for number in range(4):
+        bus.publish(1, {"type": "task", "id": number})
+
+    assert await subscription.get(0) == {"type": "overflow", "dropped": 2}
+    assert await subscription.get(0) == {"type": "task", "id": 2}
+    assert await subscription.get(0) == {"type": "task", "id": 3}
+    assert await subscription.get(0) is None
+    assert await other_team.get(0) is None
+    bus.unsubscribe(subscription)
+    assert bus.subscriber_count(1) == 0
+
+    subscription = event_bus.subscribe(-1)
+    try:
+        await db_session.execute(select(User.id))
+        record_team_event(db_session, -1, {"type": "task", "id": 1})
+        await db_session.rollback()
+        record_team_event(db_session, -1, {"type": "task", "id": 2})
+        assert await subscription.get(0) is None
+        await db_session.commit()
+        assert await subscription.get(0) == {"type": "task", "id": 2}
+        assert await subscription.get(0) is None
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_broker_relays_between_workers(tmp_path):
+    """Тест брокера: событие одного процесса доходит до подписчиков другого, но не повторяется у себя"""
+
+    with pytest.raises(TypeError):
+        _QueuedTransport()
+
+    path = str(tmp_path / "events.sock")
+    broker = asyncio.create_task(EventBroker(path).serve())
+    first, second = EventBus(), EventBus()
+    try:
+        while not (tmp_path / "events.sock").exists():
+            await asyncio.sleep(0.01)
+        await first.start(UnixSocketTransport(path))
+        await second.start(UnixSocketTransport(path))
+        own = first.subscribe(7)
+        remote = second.subscribe(7)
+
+        # Транспорт подключается в фоне: публикуем, пока событие не дойдёт.
+        received = None
+        for _ in range(100):
+            first.publish(7, {"type": "comment", "id": 1, "task_id": 3})
+            received = await remote.get(0.05)
+            if received is not None:
+                break
+        assert received == {"type": "comment", "id": 1, "task_id": 3}
+        assert await own.get(0) == received
+    finally:
+        await first.stop()
+        await second.stop()
+        broker.cancel()
+        await asyncio.gather(broker, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_team_event_stream_sse(auth_headers, client: AsyncClient):
+    """Тест SSE-потока команды: изменения задачи и комментарий приходят событиями"""
+
+    await client.post("/api/teams/", json={"name": "EventsTeam"}, headers=auth_headers)
+    token = auth_headers["Authorization"].replace("Bearer ", "")
+    user_id = jwt.decode(token, options={"verify_signature": False})["user_id"]
+
+    unauthorized = await client.get("/api/teams/me/events")
+    assert unauthorized.status_code == 401
+
+    stream = asyncio.create_task(client.get(f"/api/teams/me/events?token={token}"))
+    team_id = (await client.get("/api/teams/me", headers=auth_headers)).json()["id"]
+    while not event_bus.subscriber_count(team_id):
+        await asyncio.sleep(0.01)
+
+    task = await client.post(
+        "/api/tasks/",
+        json={"title": "Стрим", "assignee_id": user_id},
+        headers=auth_headers,
+    )
+    task_id = task.json()["id"]
+    await client.put(
+        f"/api/tasks/{task_id}", json={"status": "in_progress"}, headers=auth_headers
+    )
+    comment = await client.post(
+        f"/api/tasks/{task_id}/comments", json={"content": "готово"}, headers=auth_headers
+    )
+    # Закрытие подписок (как при остановке приложения) завершает поток.
+    await asyncio.sleep(0.05)
+    await event_bus.stop()
+    response = await stream
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [frame for frame in response.text.split("\n\n") if frame.startswith("event:")]
+    assert frames == [
+        f'event: task\ndata: {{"type": "task", "id": {task_id}, "deleted": false}}',
+        f'event: task\ndata: {{"type": "task", "id": {task_id}, "deleted": false}}',
+        f'event: comment\ndata: {{"type": "comment", "id": {comment.json()["id"]}, '
+        f'"task_id": {task_id}}}',
+    ]
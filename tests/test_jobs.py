@@ -0,0 +1,52 @@
+import pytest
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+from backend.crud.jobs import enqueue_job
+from backend.jobs import JobRunner, job_handler
+from backend.models.job import Job, JobStatus
+
+
+def _runner(db_session: AsyncSession) -> JobRunner:
+    factory = sessionmaker(bind=db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    return JobRunner(session_factory=factory, concurrency=2)
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_after_commit_and_retry(db_session):
+    """Тест очереди заданий: задание из отменённой транзакции не выполняется, ошибка — повтор"""
+
+    calls = []
+
+    @job_handler("test.flaky")
+    async def flaky(db, value: int) -> None:
+        calls.append(value)
+        if len(calls) == 1:
+            raise RuntimeError("temporary failure")
+
+    enqueue_job(db_session, "test.flaky", {"value": 0})
+    await db_session.rollback()
+    job = enqueue_job(db_session, "test.flaky", {"value": 1}, max_attempts=2)
+    enqueue_job(db_session, "test.unknown", max_attempts=1)
+    await db_session.commit()
+
+    runner = _runner(db_session)
+    assert await runner.run_pending() == 2
+    assert calls == [1]
+    await db_session.refresh(job)
+    assert (job.status, job.attempts, job.last_error) == (
+        JobStatus.QUEUED,
+        1,
+        "RuntimeError: temporary failure",
+    )
+    unknown = await db_session.execute(select(Job).where(Job.name == "test.unknown"))
+    assert unknown.scalars().one().status == JobStatus.FAILED
+
+    # Повтор отложен с задержкой; сдвигаем его на «сейчас».
+    job.run_at = datetime.now()
+    await db_session.commit()
+    assert await runner.run_pending() == 1
+    assert calls == [1, 1]
+    await db_session.refresh(job)
+    assert (job.status, job.attempts) == (JobStatus.DONE, 2)
@@ -0,0 +1,245 @@
+import jwt
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from backend.core.intervals import merge_intervals, overlaps_any
+from backend.core.recurrence import expand, parse_rrule, series_end
+
+
+def test_recurrence_expansion_is_bounded_to_window():
+    """Тест разворачивания RRULE: только в пределах окна, конец серии, слияние интервалов"""
+
+    start = datetime(2035, 1, 1, 10)  # понедельник
+
+    assert expand("FREQ=WEEKLY;BYDAY=MO,WE", start, datetime(2035, 1, 7), datetime(2035, 1, 17)) == (
+        datetime(2035, 1, 8, 10),
+        datetime(2035, 1, 10, 10),
+        datetime(2035, 1, 15, 10),
+    )
+    # 31-е число есть не в каждом месяце — такие месяцы пропускаются.
+    assert len(expand("FREQ=MONTHLY", datetime(2035, 1, 31), start, datetime(2036, 1, 1))) == 7
+    assert series_end("FREQ=DAILY;COUNT=3", start, timedelta(hours=1)) == datetime(2035, 1, 3, 11)
+    assert series_end("FREQ=DAILY", start, timedelta(hours=1)) is None
+    assert str(parse_rrule("freq=weekly;byday=we,mo")) == "FREQ=WEEKLY;BYDAY=MO,WE"
+    with pytest.raises(ValueError):
+        parse_rrule("FREQ=YEARLY")
+
+    merged = merge_intervals([(start, start + timedelta(hours=1)), (start - timedelta(hours=1), start)])
+    assert merged == [(start - timedelta(hours=1), start + timedelta(hours=1))]
+    assert overlaps_any(merged, start + timedelta(minutes=30), start + timedelta(hours=2))
+    assert not overlaps_any(merged, start + timedelta(hours=1), start + timedelta(hours=2))
+
+
+@pytest.mark.asyncio
+async def test_recurring_meeting_expands_with_exceptions(auth_headers, client: AsyncClient):
+    """Тест повторяющейся встречи: конфликт с экземпляром серии, перенос и отмена экземпляров"""
+
+    await client.post("/api/teams/", json={"name": "RecurringTeam"}, headers=auth_headers)
+    response = await client.post(
+        "/api/meetings/",
+        json={
+            "title": "Standup",
+            "start_time": "2035-03-05T09:00:00",
+            "end_time": "2035-03-05T09:30:00",
+            "participant_ids": [],
+            "rrule": "FREQ=WEEKLY;COUNT=4",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    meeting_id = response.json()["id"]
+    assert response.json()["rrule"] == "FREQ=WEEKLY;COUNT=4"
+
+    conflict = await client.post(
+        "/api/meetings/",
+        json={
+            "title": "Clash",
+            "start_time": "2035-03-19T09:15:00",
+            "end_time": "2035-03-19T10:00:00",
+            "participant_ids": [],
+        },
+        headers=auth_headers,
+    )
+    assert conflict.status_code == 400
+
+    await client.post(
+        f"/api/meetings/{meeting_id}/exceptions",
+        json={"occurrence_start": "2035-03-12T09:00:00", "cancelled": True},
+        headers=auth_headers,
+    )
+    moved = await client.post(
+        f"/api/meetings/{meeting_id}/exceptions",
+        json={
+            "occurrence_start": "2035-03-19T09:00:00",
+            "start_time": "2035-03-20T15:00:00",
+            "title": "Moved standup",
+        },
+        headers=auth_headers,
+    )
+    assert moved.status_code == 200
+    missing = await client.post(
+        f"/api/meetings/{meeting_id}/exceptions",
+        json={"occurrence_start": "2035-03-13T09:00:00", "cancelled": True},
+        headers=auth_headers,
+    )
+    assert missing.status_code == 400
+
+    response = await client.get(
+        "/api/calendar/range?start=2035-03-01&end=2035-03-31", headers=auth_headers
+    )
+    events = [
+        (e["title"], e["start"], e["end"], e["recurrence_id"])
+        for e in response.json()["events"]
+    ]
+    assert events == [
+        ("Встреча: Standup", "2035-03-05T09:00:00", "2035-03-05T09:30:00", "2035-03-05T09:00:00"),
+        ("Встреча: Moved standup", "2035-03-20T15:00:00", "2035-03-20T15:30:00", "2035-03-19T09:00:00"),
+        ("Встреча: Standup", "2035-03-26T09:00:00", "2035-03-26T09:30:00", "2035-03-26T09:00:00"),
+    ]
+
+    freed = await client.post(
+        "/api/meetings/",
+        json={
+            "title": "Now free",
+            "start_time": "2035-03-19T09:15:00",
+            "end_time": "2035-03-19T10:00:00",
+            "participant_ids": [],
+        },
+        headers=auth_headers,
+    )
+    assert freed.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_list_meetings_keyset_pages_and_time_filter(
+    auth_headers, client: AsyncClient
+):
+    """Тест списка встреч: постраничная выдача по курсору, фильтр по времени и выбор полей"""
+
+    await client.post("/api/teams/", json={"name": "PagingTeam"}, headers=auth_headers)
+    for start in [
+        "2000-01-03T10:00:00",
+        "2038-01-04T10:00:00",
+        "2038-01-05T10:00:00",
+        "2038-01-06T10:00:00",
+    ]:
+        await client.post(
+            "/api/meetings/",
+            json={
+                "title": f"Meeting {start[:10]}",
+                "start_time": start,
+                "end_time": start[:11] + "11:00:00",
+                "participant_ids": [],
+            },
+            headers=auth_headers,
+        )
+
+    titles, cursor = [], None
+    while True:
+        params = {"when": "upcoming", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/meetings/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        page = response.json()
+        assert all(len(m["participants"]) == 1 for m in page)
+        titles += [m["title"] for m in page]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert titles[-3:] == ["Meeting 2038-01-04", "Meeting 2038-01-05", "Meeting 2038-01-06"]
+    assert "Meeting 2000-01-03" not in titles
+
+    response = await client.get(
+        "/api/meetings/?when=past&fields=title", headers=auth_headers
+    )
+    assert response.json()[0] == {"id": response.json()[0]["id"], "title": "Meeting 2000-01-03"}
+    response = await client.get(
+        "/api/meetings/?when=past", headers={**auth_headers, "If-None-Match": "*"}
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/api/meetings/?cursor=bad", headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest_asyncio.fixture
+async def foreign_keys(db_session):
+    """Фикстура, включающая проверку внешних ключей SQLite (как в PostgreSQL)"""
+
+    await db_session.commit()
+    connection = await db_session.connection()
+    await connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+    yield
+    await db_session.commit()
+    connection = await db_session.connection()
+    await connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+
+
+@pytest.mark.asyncio
+async def test_cancel_meeting_checks_rights_and_cancels_range(
+    auth_headers, client: AsyncClient, foreign_keys
+):
+    """Тест отмены встреч: проверка прав и отмена диапазона вместе с участниками и исключениями серий"""
+
+    team = await client.post(
+        "/api/teams/", json={"name": "CancelTeam"}, headers=auth_headers
+    )
+    await client.post(
+        "/api/auth/register", json={"email": "canceller@example.com", "password": "123"}
+    )
+    login = await client.post(
+        "/api/auth/login", data={"username": "canceller@example.com", "password": "123"}
+    )
+    member_token = login.json()["access_token"]
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+    member_id = jwt.decode(member_token, options={"verify_signature": False})["user_id"]
+    await client.post(
+        f"/api/teams/{team.json()['id']}/add-member",
+        json={"user_id": member_id, "role": "member"},
+        headers=auth_headers,
+    )
+
+    ids = []
+    for day, rrule in [
+        ("2039-02-01", None),
+        ("2039-02-02", "FREQ=DAILY;COUNT=3"),
+        ("2039-02-03", "FREQ=WEEKLY"),
+        ("2039-02-20", None),
+    ]:
+        response = await client.post(
+            "/api/meetings/",
+            json={
+                "title": "Cancel me",
+                "start_time": f"{day}T{'12' if rrule == 'FREQ=WEEKLY' else '10'}:00:00",
+                "end_time": f"{day}T{'13' if rrule == 'FREQ=WEEKLY' else '11'}:00:00",
+                "participant_ids": [member_id],
+                "rrule": rrule,
+            },
+            headers=auth_headers,
+        )
+        ids.append(response.json()["id"])
+
+    exception = await client.post(
+        f"/api/meetings/{ids[1]}/exceptions",
+        json={"occurrence_start": "2039-02-03T10:00:00", "cancelled": True},
+        headers=auth_headers,
+    )
+    assert exception.status_code == 200
+
+    response = await client.delete(f"/api/meetings/{ids[0]}", headers=member_headers)
+    assert response.status_code == 404
+
+    response = await client.post(
+        "/api/meetings/cancel-range",
+        json={"start": "2039-02-01T00:00:00", "end": "2039-02-10T00:00:00"},
+        headers=auth_headers,
+    )
+    assert sorted(response.json()["cancelled"]) == ids[:2]
+
+    response = await client.delete(f"/api/meetings/{ids[3]}", headers=auth_headers)
+    assert response.status_code == 200
+    remaining = await client.get("/api/meetings/?fields=title", headers=member_headers)
+    assert [m["id"] for m in remaining.json() if m["id"] in ids] == [ids[2]]
@@ -0,0 +1,149 @@
+import jwt
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from httpx import AsyncClient
+import backend.jobs as jobs
+from backend.crud.reminders import MEETING_REMINDER_LEAD, TASK_REMINDER_LEAD
+from backend.jobs import JobRunner
+from backend.models.meeting import Meeting
+from backend.models.task import Task
+from backend.reminders import ReminderScheduler
+
+
+class CollectingSink:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, reminder: dict) -> None:
+        self.sent.append(reminder)
+
+
+@pytest.mark.asyncio
+async def test_reminders_are_delivered_once(
+    auth_headers, client: AsyncClient, db_session, monkeypatch
+):
+    """Тест напоминаний: время в next_reminder_at, один раз на два планировщика, повтор серии"""
+
+    sink = CollectingSink()
+    monkeypatch.setattr(jobs, "get_reminder_sink", lambda: sink)
+    factory = sessionmaker(bind=db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    await client.post("/api/teams/", json={"name": "ReminderTeam"}, headers=auth_headers)
+    admin_id = jwt.decode(
+        auth_headers["Authorization"].replace("Bearer ", ""),
+        options={"verify_signature": False},
+    )["user_id"]
+
+    now = datetime.now().replace(microsecond=0)
+    soon = await client.post(
+        "/api/tasks/",
+        json={
+            "title": "Отчёт",
+            "deadline": (now + timedelta(hours=2)).isoformat(),
+            "assignee_id": admin_id,
+        },
+        headers=auth_headers,
+    )
+    later = await client.post(
+        "/api/tasks/",
+        json={
+            "title": "План",
+            "deadline": (now + timedelta(days=3)).isoformat(),
+            "assignee_id": admin_id,
+        },
+        headers=auth_headers,
+    )
+    start = now + timedelta(minutes=5)
+    meeting = await client.post(
+        "/api/meetings/",
+        json={
+            "title": "Стендап",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=15)).isoformat(),
+            "participant_ids": [admin_id],
+            "rrule": "FREQ=DAILY;COUNT=2",
+        },
+        headers=auth_headers,
+    )
+    soon_id, later_id, meeting_id = (
+        soon.json()["id"],
+        later.json()["id"],
+        meeting.json()["id"],
+    )
+    later_task = await db_session.get(Task, later_id)
+    assert later_task.next_reminder_at == now + timedelta(days=3) - TASK_REMINDER_LEAD
+
+    # Два процесса видят одни и те же наступившие напоминания.
+    workers = [ReminderScheduler(session_factory=factory) for _ in range(2)]
+    for worker in workers:
+        await worker.load()
+    for worker in workers:
+        await worker.fire_due()
+    await JobRunner(session_factory=factory).run_pending()
+
+    mine = sorted(
+        (r["type"], r["id"], r["at"], r["recipients"])
+        for r in sink.sent
+        if (r["type"], r["id"]) in {("task", soon_id), ("meeting", meeting_id)}
+    )
+    assert mine == [
+        ("meeting", meeting_id, start.isoformat(), ["test@example.com"]),
+        ("task", soon_id, (now + timedelta(hours=2)).isoformat(), ["test@example.com"]),
+    ]
+
+    db_session.expire_all()
+    series = await db_session.get(Meeting, meeting_id)
+    assert series.next_reminder_at == start + timedelta(days=1) - MEETING_REMINDER_LEAD
+    later_task = await db_session.get(Task, later_id)
+    assert later_task.reminder_sent_for is None
+
+    # Правка без смены дедлайна не повторяет напоминание, новый дедлайн — повторяет.
+    await client.put(f"/api/tasks/{soon_id}", json={"title": "Отчёт v2"}, headers=auth_headers)
+    task = await db_session.get(Task, soon_id)
+    await db_session.refresh(task)
+    assert task.next_reminder_at is None
+    new_deadline = now + timedelta(hours=5)
+    await client.put(
+        f"/api/tasks/{soon_id}",
+        json={"deadline": new_deadline.isoformat()},
+        headers=auth_headers,
+    )
+    await db_session.refresh(task)
+    assert task.next_reminder_at == new_deadline - TASK_REMINDER_LEAD
+
+
+@pytest.mark.asyncio
+async def test_reminder_load_limit_with_equal_times(
+    auth_headers, client: AsyncClient, db_session, monkeypatch
+):
+    """Тест планировщика: напоминания с одним временем, которых больше load_limit, все отправляются"""
+
+    monkeypatch.setattr(jobs, "get_reminder_sink", lambda: CollectingSink())
+    factory = sessionmaker(bind=db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    await client.post("/api/teams/", json={"name": "SprintTeam"}, headers=auth_headers)
+    admin_id = jwt.decode(
+        auth_headers["Authorization"].replace("Bearer ", ""),
+        options={"verify_signature": False},
+    )["user_id"]
+    deadline = (datetime.now() + timedelta(hours=2)).replace(microsecond=0)
+    response = await client.post(
+        "/api/tasks/bulk",
+        json={
+            "tasks": [
+                {"title": f"Спринт {n}", "deadline": deadline.isoformat(), "assignee_id": admin_id}
+                for n in range(12)
+            ]
+        },
+        headers=auth_headers,
+    )
+    task_ids = [item["id"] for item in response.json()["results"]]
+
+    scheduler = ReminderScheduler(session_factory=factory, load_limit=5)
+    for _ in range(10):
+        await scheduler.load()
+        await scheduler.fire_due()
+
+    db_session.expire_all()
+    tasks = [await db_session.get(Task, task_id) for task_id in task_ids]
+    assert [task.reminder_sent_for for task in tasks] == [deadline] * 12
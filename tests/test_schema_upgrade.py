@@ -0,0 +1,49 @@
+from sqlalchemy import create_engine, inspect, select
+from backend.models.schema_upgrade import ADDED_COLUMNS, upgrade_schema
+from backend.models.task import Task
+
+# Таблицы в том виде, в каком их создавала первая версия приложения.
+OLD_SCHEMA = (
+    """CREATE TABLE users (
+        id INTEGER PRIMARY KEY, email VARCHAR NOT NULL, hashed_password VARCHAR NOT NULL,
+        full_name VARCHAR, is_active BOOLEAN, role VARCHAR(6), team_id INTEGER
+    )""",
+    """CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, description TEXT,
+        deadline DATETIME, status VARCHAR(11), team_id INTEGER NOT NULL,
+        assignee_id INTEGER NOT NULL, creator_id INTEGER NOT NULL
+    )""",
+    """CREATE TABLE meetings (
+        id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, start_time DATETIME NOT NULL,
+        end_time DATETIME NOT NULL, creator_id INTEGER NOT NULL
+    )""",
+    "INSERT INTO tasks (id, title, team_id, assignee_id, creator_id) VALUES (1, 'Old', 1, 1, 1)",
+)
+
+
+def test_upgrade_schema_adds_missing_columns_and_indexes():
+    """Тест обновления схемы: старые таблицы получают новые колонки и индексы, повторно — без изменений"""
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        for statement in OLD_SCHEMA:
+            connection.exec_driver_sql(statement)
+        upgrade_schema(connection)
+        upgrade_schema(connection)
+
+        inspector = inspect(connection)
+        for table_name, column_name in ADDED_COLUMNS:
+            assert column_name in {c["name"] for c in inspector.get_columns(table_name)}
+        assert "ix_tasks_team_id_deadline" in {
+            index["name"] for index in inspector.get_indexes("tasks")
+        }
+        unique = {index["name"]: index["unique"] for index in inspector.get_indexes("users")}
+        assert unique["ix_users_feed_token_hash"]
+
+        connection.execute(
+            Task.__table__.insert().values(
+                id=2, title="New", team_id=1, assignee_id=1, creator_id=1
+            )
+        )
+        updated = connection.execute(select(Task.id, Task.updated_at).order_by(Task.id)).all()
+        assert all(row.updated_at.year > 1970 for row in updated)
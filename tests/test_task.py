@@ -2,6 +2,7 @@ import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 import jwt
+import backend.crud.task_import as task_import
 
 
 @pytest.mark.asyncio
@@ -81,3 +82,264 @@ async def test_manager_can_create_task(auth_headers, client: AsyncClient):
     assert task_data["creator"]["role"] == "admin"
 
     assert task_data["comments"] == []
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_sparse_fields(auth_headers, client: AsyncClient):
+    """Тест параметра ?fields=: в ответе остаются только запрошенные поля"""
+
+    await client.post("/api/teams/", json={"name": "SparseTeam"}, headers=auth_headers)
+    manager_token = auth_headers["Authorization"].replace("Bearer ", "")
+    manager_id = jwt.decode(manager_token, options={"verify_signature": False})[
+        "user_id"
+    ]
+
+    task_response = await client.post(
+        "/api/tasks/",
+        json={"title": "Sparse", "description": "Long text", "assignee_id": manager_id},
+        headers=auth_headers,
+    )
+    assert task_response.status_code == 200
+    task_id = task_response.json()["id"]
+
+    response = await client.get(
+        "/api/tasks/?fields=title,status,deadline", headers=auth_headers
+    )
+    assert response.status_code == 200
+    task_data = next(t for t in response.json() if t["id"] == task_id)
+    assert task_data == {
+        "id": task_id,
+        "title": "Sparse",
+        "deadline": None,
+        "status": "open",
+    }
+
+    response = await client.get(
+        f"/api/tasks/{task_id}?fields=assignee", headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert set(response.json()) == {"id", "assignee"}
+    assert response.json()["assignee"]["id"] == manager_id
+
+    response = await client.get("/api/tasks/?fields=password", headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_conditional_get(auth_headers, client: AsyncClient):
+    """Тест ETag: повторный запрос с If-None-Match получает 304 до изменения задач"""
+
+    await client.post("/api/teams/", json={"name": "EtagTeam"}, headers=auth_headers)
+    manager_token = auth_headers["Authorization"].replace("Bearer ", "")
+    manager_id = jwt.decode(manager_token, options={"verify_signature": False})[
+        "user_id"
+    ]
+
+    response = await client.get("/api/tasks/", headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = await client.get(
+        "/api/tasks/", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    await client.post(
+        "/api/tasks/",
+        json={"title": "New", "assignee_id": manager_id},
+        headers=auth_headers,
+    )
+
+    response = await client.get(
+        "/api/tasks/", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_and_update_report_item_errors(
+    auth_headers, client: AsyncClient
+):
+    """Тест пакетного создания и обновления задач с ошибками отдельных элементов"""
+
+    await client.post("/api/teams/", json={"name": "BulkTeam"}, headers=auth_headers)
+    user_id = jwt.decode(
+        auth_headers["Authorization"].replace("Bearer ", ""),
+        options={"verify_signature": False},
+    )["user_id"]
+
+    tasks = [
+        {"title": f"Bulk {i}", "deadline": "2040-01-10T12:00:00", "assignee_id": user_id}
+        for i in range(1000)
+    ]
+    tasks[3]["assignee_id"] = 999_999
+    response = await client.post(
+        "/api/tasks/bulk", json={"tasks": tasks}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (999, 1)
+    assert body["results"][3] == {
+        "index": 3, "id": None, "error": "Assignee must be in your team"
+    }
+    ids = [item["id"] for item in body["results"] if item["id"]]
+    assert len(set(ids)) == 999
+
+    response = await client.patch(
+        "/api/tasks/bulk",
+        json={
+            "tasks": [
+                {"id": ids[0], "status": "done"},
+                {"id": ids[1], "status": "finished"},
+                {"id": ids[0], "status": "open"},
+                {"id": 999_999, "status": "done"},
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert [item.get("error") for item in response.json()["results"]] == [
+        None, "Invalid status", "Duplicate task id", "Task not found"
+    ]
+
+    task = await client.get(f"/api/tasks/{ids[0]}?fields=status,title", headers=auth_headers)
+    assert task.json() == {"id": ids[0], "title": "Bulk 0", "status": "done"}
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_streams_csv_and_ndjson(auth_headers, client: AsyncClient):
+    """Тест потокового импорта задач: ошибки по строкам, пакеты и продолжение"""
+
+    await client.post("/api/teams/", json={"name": "ImportTeam"}, headers=auth_headers)
+
+    csv_body = (
+        "title,deadline,assignee_email,description\n"
+        'Plan,2041-01-05T10:00:00,TEST@example.com,"multi\nline"\n'
+        "Ghost,,nobody@example.com,\n"
+        ",2041-01-06T10:00:00,test@example.com,\n"
+        "Ship,2041-01-07T10:00:00,test@example.com,\n"
+    )
+    response = await client.post(
+        "/api/tasks/import?batch_size=2",
+        content=csv_body.encode(),
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["rows"], body["imported"], body["failed"], body["batches"]) == (4, 2, 2, 2)
+    assert body["errors"] == [
+        {"row": 2, "error": "Assignee must be in your team"},
+        {"row": 3, "error": "Title is required"},
+    ]
+
+    tasks = (await client.get("/api/tasks/", headers=auth_headers)).json()
+    plan = next(task for task in tasks if task["title"] == "Plan")
+    assert plan["description"] == "multi\nline"
+
+    ndjson_body = (
+        '{"title": "Skipped", "assignee": "test@example.com"}\n'
+        "not json\n"
+        '{"title": "Resumed", "assignee": "test@example.com", "status": "done"}\n'
+    )
+    response = await client.post(
+        "/api/tasks/import?format=ndjson&resume_from=1",
+        content=ndjson_body.encode(),
+        headers=auth_headers,
+    )
+    body = response.json()
+    assert (body["rows"], body["imported"], body["completed"]) == (3, 1, True)
+    assert body["errors"] == [{"row": 2, "error": "Invalid record"}]
+    titles = {task["title"] for task in (await client.get("/api/tasks/", headers=auth_headers)).json()}
+    assert "Resumed" in titles and "Skipped" not in titles
+
+    response = await client.post(
+        "/api/tasks/import", content=b"title\n", headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_keeps_batch_assignees_after_cache_overflow(
+    auth_headers, client: AsyncClient, monkeypatch
+):
+    """Тест импорта: после переполнения кэша исполнителей пакет разрешается целиком"""
+
+    monkeypatch.setattr(task_import, "ASSIGNEE_CACHE_SIZE", 1)
+    await client.post("/api/teams/", json={"name": "OverflowTeam"}, headers=auth_headers)
+    user_id = jwt.decode(
+        auth_headers["Authorization"].replace("Bearer ", ""),
+        options={"verify_signature": False},
+    )["user_id"]
+
+    # Второй пакет: уже известный email и новый id — кэш переполняется.
+    csv_body = (
+        "title,assignee\n"
+        "First,test@example.com\n"
+        "Second,test@example.com\n"
+        "Again,test@example.com\n"
+        f"ById,{user_id}\n"
+    )
+    response = await client.post(
+        "/api/tasks/import?batch_size=2",
+        content=csv_body.encode(),
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+    body = response.json()
+    assert (body["imported"], body["failed"], body["errors"]) == (4, 0, [])
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_ranks_and_paginates(auth_headers, client: AsyncClient):
+    """Тест полнотекстового поиска по задачам и комментариям команды"""
+
+    await client.post("/api/teams/", json={"name": "SearchTeam"}, headers=auth_headers)
+    user_id = jwt.decode(
+        auth_headers["Authorization"].replace("Bearer ", ""),
+        options={"verify_signature": False},
+    )["user_id"]
+
+    ids = {}
+    for title, description in [
+        ("Квартальный отчёт", "Собрать цифры продаж"),
+        ("Созвон с клиентом", "Обсудить отчёт"),
+        ("Починить сборку", None),
+    ]:
+        response = await client.post(
+            "/api/tasks/",
+            json={"title": title, "description": description, "assignee_id": user_id},
+            headers=auth_headers,
+        )
+        ids[title] = response.json()["id"]
+    await client.post(
+        f"/api/tasks/{ids['Починить сборку']}/comments",
+        json={"content": "Падает после отчёта линтера"},
+        headers=auth_headers,
+    )
+
+    response = await client.get("/api/tasks/search?q=ОТЧЁТ&limit=1", headers=auth_headers)
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()] == [ids["Квартальный отчёт"]]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(
+        f"/api/tasks/search?q=ОТЧЁТ&limit=5&cursor={cursor}&fields=title",
+        headers=auth_headers,
+    )
+    assert response.json() == [
+        {"id": ids["Созвон с клиентом"], "title": "Созвон с клиентом"},
+        {"id": ids["Починить сборку"], "title": "Починить сборку"},
+    ]
+    assert "X-Next-Cursor" not in response.headers
+
+    await client.put(
+        f"/api/tasks/{ids['Квартальный отчёт']}",
+        json={"title": "Годовой план"},
+        headers=auth_headers,
+    )
+    response = await client.get("/api/tasks/search?q=годовой пла", headers=auth_headers)
+    assert [task["id"] for task in response.json()] == [ids["Квартальный отчёт"]]
+
+    response = await client.get("/api/tasks/search?q=!!!", headers=auth_headers)
+    assert response.status_code == 400
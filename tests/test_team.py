@@ -1,6 +1,12 @@
+import csv
+import io
+import json
+import jwt
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
+from backend.core.prefix_index import PrefixIndex, index_keys
+from backend.crud.versions import get_versions, members_scope
 
 
 @pytest.mark.asyncio
@@ -25,3 +31,401 @@ async def test_cannot_create_team_twice(auth_headers, client: AsyncClient):
         "/api/teams/", json={"name": "Team2"}, headers=auth_headers
     )
     assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_busy_heatmap_counts_members_per_bucket(auth_headers, client: AsyncClient):
+    """Тест карты занятости: участник учитывается в каждом интервале один раз"""
+
+    team = await client.post(
+        "/api/teams/", json={"name": "HeatmapTeam"}, headers=auth_headers
+    )
+    team_id = team.json()["id"]
+    for start, end, rrule in [
+        ("2037-01-05T09:00:00", "2037-01-05T09:10:00", None),
+        ("2037-01-05T09:20:00", "2037-01-05T10:00:00", None),
+        ("2037-01-05T11:00:00", "2037-01-05T11:30:00", "FREQ=DAILY;COUNT=2"),
+    ]:
+        await client.post(
+            "/api/meetings/",
+            json={
+                "title": "Busy",
+                "start_time": start,
+                "end_time": end,
+                "participant_ids": [],
+                "rrule": rrule,
+            },
+            headers=auth_headers,
+        )
+
+    response = await client.get(
+        f"/api/teams/{team_id}/busy-heatmap"
+        "?start=2037-01-05T09:00:00&end=2037-01-06T12:00:00&bucket=1h",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["member_count"], data["bucket_minutes"]) == (1, 60)
+    assert len(data["counts"]) == 27
+    assert data["counts"][:3] == [1, 0, 1]
+    assert data["counts"][26] == 1
+    assert sum(data["counts"]) == 3
+
+    response = await client.get(
+        f"/api/teams/{team_id}/busy-heatmap"
+        "?start=2037-01-05T09:00:00&end=2037-01-06T12:00:00&bucket=1s",
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_team_export_streams_ndjson_and_csv(auth_headers, client: AsyncClient):
+    """Тест выгрузки данных команды в NDJSON и CSV (в том числе со сжатием gzip)"""
+
+    team = await client.post(
+        "/api/teams/", json={"name": "ExportTeam"}, headers=auth_headers
+    )
+    team_id = team.json()["id"]
+    user_id = jwt.decode(
+        auth_headers["Authorization"].replace("Bearer ", ""),
+        options={"verify_signature": False},
+    )["user_id"]
+    task = await client.post(
+        "/api/tasks/",
+        json={"title": "Audit, \"Q1\"", "assignee_id": user_id},
+        headers=auth_headers,
+    )
+    await client.post(
+        f"/api/tasks/{task.json()['id']}/comments",
+        json={"content": "Проверено"},
+        headers=auth_headers,
+    )
+    meeting = await client.post(
+        "/api/meetings/",
+        json={
+            "title": "Review",
+            "start_time": "2042-02-02T10:00:00",
+            "end_time": "2042-02-02T11:00:00",
+            "participant_ids": [],
+        },
+        headers=auth_headers,
+    )
+
+    response = await client.get(
+        f"/api/teams/{team_id}/export",
+        headers={**auth_headers, "Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    task_record = next(r for r in records if r["type"] == "task")
+    assert task_record["id"] == task.json()["id"]
+    assert (task_record["title"], task_record["status"]) == ('Audit, "Q1"', "open")
+    participant = {"meeting_id": meeting.json()["id"], "user_id": user_id}
+    assert {"type": "meeting_participant", **participant} in records
+    assert [r["content"] for r in records if r["type"] == "comment"] == ["Проверено"]
+
+    response = await client.get(
+        f"/api/teams/{team_id}/export?format=csv", headers=auth_headers
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["type"] for row in rows] == [r["type"] for r in records]
+    assert rows[0]["title"] == 'Audit, "Q1"'
+
+    response = await client.get(f"/api/teams/{team_id + 1}/export", headers=auth_headers)
+    assert response.status_code == 403
+
+
+def test_prefix_index_updates_incrementally():
+    """Тест префиксного индекса: поиск по началу email и слов имени, точечные обновления"""
+
+    index = PrefixIndex.build(
+        [
+            (1, "anna", index_keys("anna.smith@example.com", "Anna Smith")),
+            (2, "boris", index_keys("boris@example.com", None)),
+        ]
+    )
+
+    assert index.search("SM", 10) == ["anna"]
+    assert index.search("example", 10) == ["anna", "boris"]
+    assert index.search("example", 1) == ["anna"]
+
+    index.add(3, "smirnov", index_keys("p.smirnov@example.com", "Пётр Смирнов"))
+    index.remove(1)
+    assert index.search("sm", 10) == ["smirnov"]
+    assert index.search("смир", 10) == ["smirnov"]
+    assert len(index) == 2 and 1 not in index
+
+
+@pytest.mark.asyncio
+async def test_member_search_follows_membership_changes(auth_headers, client: AsyncClient):
+    """Тест подсказок участников: индекс обновляется при изменении состава команды"""
+
+    team = await client.post(
+        "/api/teams/", json={"name": "TypeaheadTeam"}, headers=auth_headers
+    )
+    team_id = team.json()["id"]
+    await client.post(
+        "/api/auth/register",
+        json={"email": "ivan.petrov@example.com", "password": "123", "full_name": "Иван Петров"},
+    )
+    login = await client.post(
+        "/api/auth/login", data={"username": "ivan.petrov@example.com", "password": "123"}
+    )
+    worker_id = jwt.decode(
+        login.json()["access_token"], options={"verify_signature": False}
+    )["user_id"]
+
+    async def search(prefix):
+        response = await client.get(
+            f"/api/teams/me/members/search?prefix={prefix}", headers=auth_headers
+        )
+        assert response.status_code == 200
+        return [member["id"] for member in response.json()]
+
+    assert await search("петр") == []
+    await client.post(
+        f"/api/teams/{team_id}/add-member",
+        json={"user_id": worker_id, "role": "member"},
+        headers=auth_headers,
+    )
+    assert await search("петр") == [worker_id]
+    assert await search("IVAN.P") == [worker_id]
+
+    await client.post(
+        f"/api/teams/{team_id}/set-role",
+        json={"user_id": worker_id, "role": "manager"},
+        headers=auth_headers,
+    )
+    response = await client.get(
+        "/api/teams/me/members/search?prefix=иван", headers=auth_headers
+    )
+    assert response.json() == [
+        {
+            "id": worker_id,
+            "email": "ivan.petrov@example.com",
+            "full_name": "Иван Петров",
+            "role": "manager",
+        }
+    ]
+
+    await client.delete(
+        f"/api/teams/{team_id}/remove-member/{worker_id}", headers=auth_headers
+    )
+    assert await search("петр") == []
+
+
+@pytest.mark.asyncio
+async def test_my_team_summary_and_member_pages(auth_headers, client: AsyncClient):
+    """Тест сводки команды по ролям и постраничного списка участников"""
+
+    team = await client.post(
+        "/api/teams/", json={"name": "PagedTeam"}, headers=auth_headers
+    )
+    team_id = team.json()["id"]
+    worker_ids = []
+    for index in range(3):
+        email = f"paged{index}@example.com"
+        await client.post("/api/auth/register", json={"email": email, "password": "123"})
+        login = await client.post(
+            "/api/auth/login", data={"username": email, "password": "123"}
+        )
+        worker_id = jwt.decode(
+            login.json()["access_token"], options={"verify_signature": False}
+        )["user_id"]
+        await client.post(
+            f"/api/teams/{team_id}/add-member",
+            json={"user_id": worker_id, "role": "member"},
+            headers=auth_headers,
+        )
+        worker_ids.append(worker_id)
+    await client.post(
+        f"/api/teams/{team_id}/set-role",
+        json={"user_id": worker_ids[0], "role": "manager"},
+        headers=auth_headers,
+    )
+
+    response = await client.get("/api/teams/me", headers=auth_headers)
+    body = response.json()
+    assert "members" not in body
+    assert body["member_count"] == 4
+    assert body["role_counts"] == {"member": 2, "manager": 1, "admin": 1}
+
+    response = await client.get(
+        "/api/teams/me/members?role=member&limit=1", headers=auth_headers
+    )
+    assert [member["id"] for member in response.json()] == [worker_ids[1]]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(
+        f"/api/teams/me/members?role=member&limit=1&cursor={cursor}",
+        headers=auth_headers,
+    )
+    assert [member["id"] for member in response.json()] == [worker_ids[2]]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = await client.get("/api/teams/me/members?cursor=bad", headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_members_add_and_set_roles(auth_headers, client: AsyncClient):
+    """Тест пакетного добавления участников и смены их ролей"""
+
+    team = await client.post(
+        "/api/teams/", json={"name": "OnboardingTeam"}, headers=auth_headers
+    )
+    team_id = team.json()["id"]
+    worker_ids = []
+    for index in range(3):
+        email = f"onboard{index}@example.com"
+        await client.post("/api/auth/register", json={"email": email, "password": "123"})
+        login = await client.post(
+            "/api/auth/login", data={"username": email, "password": "123"}
+        )
+        worker_ids.append(
+            jwt.decode(login.json()["access_token"], options={"verify_signature": False})[
+                "user_id"
+            ]
+        )
+    admin_id = jwt.decode(
+        auth_headers["Authorization"].replace("Bearer ", ""),
+        options={"verify_signature": False},
+    )["user_id"]
+
+    response = await client.get(
+        "/api/teams/me/members/search?prefix=onboard", headers=auth_headers
+    )
+    assert response.json() == []
+
+    response = await client.post(
+        f"/api/teams/{team_id}/members/bulk",
+        json={
+            "users": [
+                worker_ids[0],
+                "ONBOARD1@example.com",
+                "missing@example.com",
+                worker_ids[0],
+                admin_id,
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+    assert [item["error"] for item in body["results"]] == [
+        None, None, "User not found", "Duplicate user", "Already in team"
+    ]
+    assert body["results"][1]["id"] == worker_ids[1]
+
+    response = await client.patch(
+        f"/api/teams/{team_id}/members/bulk",
+        json={"users": worker_ids, "role": "manager"},
+        headers=auth_headers,
+    )
+    assert [item["error"] for item in response.json()["results"]] == [
+        None, None, "User not in team"
+    ]
+
+    summary = (await client.get("/api/teams/me", headers=auth_headers)).json()
+    assert summary["role_counts"] == {"member": 0, "manager": 2, "admin": 1}
+    response = await client.get(
+        "/api/teams/me/members/search?prefix=onboard", headers=auth_headers
+    )
+    assert sorted(m["id"] for m in response.json()) == worker_ids[:2]
+    assert {m["role"] for m in response.json()} == {"manager"}
+
+    response = await client.post(
+        f"/api/teams/{team_id}/members/bulk",
+        json={"users": [worker_ids[2]], "role": "admin"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_team_invites_limit_uses_and_revoke(
+    auth_headers, client: AsyncClient, db_session
+):
+    """Тест приглашений: код показывается один раз, лимит использований, отзыв"""
+
+    team = await client.post(
+        "/api/teams/", json={"name": "InviteTeam"}, headers=auth_headers
+    )
+    team_id = team.json()["id"]
+    joiners = []
+    for index in range(3):
+        email = f"invitee{index}@example.com"
+        await client.post("/api/auth/register", json={"email": email, "password": "123"})
+        login = await client.post(
+            "/api/auth/login", data={"username": email, "password": "123"}
+        )
+        joiners.append({"Authorization": f"Bearer {login.json()['access_token']}"})
+
+    response = await client.post(
+        f"/api/teams/{team_id}/invites", json={"max_uses": 1}, headers=joiners[0]
+    )
+    assert response.status_code == 403
+    response = await client.post(
+        f"/api/teams/{team_id}/invites", json={"max_uses": 0}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+    single = await client.post(
+        f"/api/teams/{team_id}/invites", json={"max_uses": 1}, headers=auth_headers
+    )
+    assert single.status_code == 200
+    single = single.json()
+    assert (single["max_uses"], single["uses_left"]) == (1, 1)
+    assert single["expires_at"] is not None
+
+    response = await client.post(
+        "/api/teams/join", json={"code": "wrong"}, headers=joiners[0]
+    )
+    assert response.status_code == 400
+    response = await client.post(
+        "/api/teams/join", json={"code": single["code"]}, headers=joiners[0]
+    )
+    assert response.status_code == 200
+    response = await client.post(
+        "/api/teams/join", json={"code": single["code"]}, headers=joiners[1]
+    )
+    assert response.status_code == 400
+
+    shared = await client.post(
+        f"/api/teams/{team_id}/invites",
+        json={"expires_in_hours": None},
+        headers=auth_headers,
+    )
+    shared = shared.json()
+    assert (shared["expires_at"], shared["uses_left"]) == (None, None)
+    scope = members_scope(team_id)
+    before = (await get_versions(db_session, [scope]))[scope]
+    response = await client.post(
+        "/api/teams/join", json={"code": shared["code"]}, headers=joiners[1]
+    )
+    assert response.status_code == 200
+    # Версия состава команды увеличивается в транзакции присоединения.
+    assert (await get_versions(db_session, [scope]))[scope] > before
+
+    response = await client.delete(
+        f"/api/teams/{team_id}/invites/{shared['id']}", headers=auth_headers
+    )
+    assert response.status_code == 200
+    response = await client.post(
+        "/api/teams/join", json={"code": shared["code"]}, headers=joiners[2]
+    )
+    assert response.status_code == 400
+
+    invites = await client.get(f"/api/teams/{team_id}/invites", headers=auth_headers)
+    assert [(i["id"], i["uses_left"], i["revoked"]) for i in invites.json()] == [
+        (shared["id"], None, True),
+        (single["id"], 0, False),
+    ]
+    assert all("code" not in invite for invite in invites.json())
+
+    summary = (await client.get("/api/teams/me", headers=auth_headers)).json()
+    assert summary["member_count"] == 3